@@ -0,0 +1,46 @@
+"""add trait and servicetype bits to cast_common_prof
+
+Revision ID: 6751811a225d
+Revises: 8944fad44b73
+Create Date: 2026-10-17 11:02:45.127630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6751811a225d'
+down_revision: Union[str, None] = '8944fad44b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cast_common_prof', sa.Column('trait_bits', mysql.BIGINT(unsigned=True), server_default='0', nullable=False))
+    op.add_column('cast_common_prof', sa.Column('servicetype_bits', mysql.BIGINT(unsigned=True), server_default='0', nullable=False))
+
+    # ✅ 既存の特徴・サービスタイプからビット列を作る（ID n → 下から n-1 ビット目、1～64のみ）
+    op.execute("""
+        UPDATE cast_common_prof p
+        SET p.trait_bits = (
+            SELECT COALESCE(BIT_OR(1 << (t.trait_id - 1)), 0)
+            FROM cast_traits t
+            WHERE t.cast_id = p.cast_id AND t.trait_id BETWEEN 1 AND 64
+        ),
+        p.servicetype_bits = (
+            SELECT COALESCE(BIT_OR(1 << (s.servicetype_id - 1)), 0)
+            FROM cast_servicetype s
+            WHERE s.cast_id = p.cast_id AND s.servicetype_id BETWEEN 1 AND 64
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cast_common_prof', 'servicetype_bits')
+    op.drop_column('cast_common_prof', 'trait_bits')
@@ -0,0 +1,47 @@
+"""add composite indexes for hot queries
+
+Revision ID: 8944fad44b73
+Revises: 00a79ef0dfd1
+Create Date: 2026-10-17 10:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8944fad44b73'
+down_revision: Union[str, None] = '00a79ef0dfd1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ✅ 予約一覧（キャスト別・ユーザー別に start_time の降順）
+    op.create_index('idx_resv_cast_start', 'resv_reservation', ['cast_id', 'start_time'], unique=False)
+    op.create_index('idx_resv_user_start', 'resv_reservation', ['user_id', 'start_time'], unique=False)
+    # ✅ 最新メッセージのサブクエリ・fetch_db_messages（予約ごとに created_at 順）
+    op.create_index('idx_resv_chat_reservation_created', 'resv_chat', ['reservation_id', 'created_at'], unique=False)
+    # ✅ get_casts（is_active = 1 ＋ エリア・キャストタイプの絞り込み）
+    op.create_index('idx_cast_active_area_type', 'cast_common_prof', ['is_active', 'support_area', 'cast_type'], unique=False)
+    # ✅ get_transaction_history（ユーザーごとに created_at の範囲・降順）
+    op.create_index('idx_user_created', 'pnt_point_transactions', ['user_id', 'created_at'], unique=False)
+    # ✅ user_id 単独のインデックスは idx_user_created の先頭列で代用できるため削除（外部キーも idx_user_created を使う）
+    op.drop_index('idx_user_id', table_name='pnt_point_transactions')
+    # ✅ キャストの有効なオプション
+    op.create_index('idx_option_map_cast_active', 'pnt_option_map', ['cast_id', 'is_active'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_option_map_cast_active', table_name='pnt_option_map')
+    # 外部キー用のインデックスがなくならないよう、先に idx_user_id を戻す
+    op.create_index('idx_user_id', 'pnt_point_transactions', ['user_id'], unique=False)
+    op.drop_index('idx_user_created', table_name='pnt_point_transactions')
+    op.drop_index('idx_cast_active_area_type', table_name='cast_common_prof')
+    op.drop_index('idx_resv_chat_reservation_created', table_name='resv_chat')
+    op.drop_index('idx_resv_user_start', table_name='resv_reservation')
+    op.drop_index('idx_resv_cast_start', table_name='resv_reservation')
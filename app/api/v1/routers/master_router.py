@@ -1,15 +1,41 @@
 # app/api/v1/routers/master_router.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app.core.security import get_admin_user
+from app.db.session import engine, async_engine, read_engine
+from app.db.pool_metrics import pool_status, ping
 
 # マスタールーターのインスタンス生成
 master_router = APIRouter()
 
-# ヘルスチェック用エンドポイント
+# ヘルスチェック用エンドポイント（公開用のため内部の状態は返さない）
 @master_router.get("/health")
 def health_check():
     return {"status": "ok"}
 
+# 詳細なヘルスチェック（接続プールの状況とDB疎通、管理者のみ）
+@master_router.get("/health/detail")
+def health_check_detail(admin_id = Depends(get_admin_user)):
+    result = {
+        "status": "ok",
+        "db": {
+            "pool": pool_status(engine),
+            "async_pool": pool_status(async_engine),
+        },
+    }
+    if read_engine is not engine:
+        result["db"]["read_pool"] = pool_status(read_engine)
+    try:
+        result["db"].update(ping(engine))
+        if read_engine is not engine:
+            result["db"]["read_ping"] = ping(read_engine)
+    except Exception as e:
+        result["status"] = "error"
+        result["db"]["error"] = str(e)
+        return JSONResponse(status_code=503, content=result)
+    return result
+
 # LINEBOT関連ルーター
 from app.features.linebot.endpoints.linebot_routers import linebot_router
 master_router.include_router(linebot_router, prefix="/linebot", tags=["Linebot"])
@@ -46,6 +72,10 @@ master_router.include_router(identity_router, prefix="/cast/identity-verificatio
 from app.features.admin.test_login.endpoints.test_login_routers import test_login_router
 master_router.include_router(test_login_router, prefix="/admin/test-login", tags=["Admin"])
 
+# ADMIN - DB統計（スロークエリ）
+from app.features.admin.db_stats.endpoints.db_stats_routers import db_stats_router
+master_router.include_router(db_stats_router, prefix="/admin/db", tags=["Admin"])
+
 # POINT - ポイント
 from app.features.points.endpoints.points_routers import points_routers
 master_router.include_router(points_routers, prefix="/points", tags=["Points"])
@@ -12,6 +12,39 @@ else:
 #データベース
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# データベース接続プール（同期・非同期エンジン共通）
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # 常時保持する接続数
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # 混雑時に一時的に追加できる接続数
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # 秒（空き接続を待つ上限）
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # 秒（MySQLのwait_timeoutより短くする）
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 貸し出し前に切断を検知
+
+# リードレプリカ（未設定ならプライマリから読む）
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+DB_READ_AFTER_WRITE_WINDOW = float(os.getenv("DB_READ_AFTER_WRITE_WINDOW", 5))  # 秒（書き込み後にプライマリから読む時間）
+
+# リクエストごとのSQL計測（Server-Timing / X-DB-Queries ヘッダー・N+1警告）
+DB_QUERY_STATS_ENABLED = os.getenv("DB_QUERY_STATS_ENABLED", "true").lower() == "true"
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 10))  # 同じ形のSQLがこの回数を超えたら警告
+
+# スロークエリログ（しきい値を超えたSQLを記録し、SELECTはEXPLAINも取得）
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))  # ミリ秒（負の値で無効）
+DB_SLOW_QUERY_BUFFER = int(os.getenv("DB_SLOW_QUERY_BUFFER", 100))  # 保持するサンプル数
+DB_SLOW_QUERY_EXPLAIN = os.getenv("DB_SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+# キャスト検索（公開中のキャストをワーカーごとのメモリ上インデックスで検索）
+CAST_SEARCH_INDEX_ENABLED = os.getenv("CAST_SEARCH_INDEX_ENABLED", "true").lower() == "true"
+CAST_SEARCH_INDEX_REFRESH_INTERVAL = float(os.getenv("CAST_SEARCH_INDEX_REFRESH_INTERVAL", 5))  # 秒（updated_at による差分更新の間隔）
+CAST_SEARCH_INDEX_FULL_REFRESH_INTERVAL = float(os.getenv("CAST_SEARCH_INDEX_FULL_REFRESH_INTERVAL", 600))  # 秒（削除を反映する全件再構築の間隔）
+
+# キャスト検索結果のキャッシュ（同じ条件の検索をまとめる。キャスト・プロフィール画像の更新で破棄）
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", 30))  # 秒
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 1000))
+
+# 管理用API（DB統計など）を使えるユーザーID（カンマ区切り）
+ADMIN_USER_IDS = {int(user_id) for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
 # `REDIRECT_URI` の値を出力
 REDIRECT_URI = os.getenv("REDIRECT_URI")
 print(f"DEBUG: REDIRECT_URI (os.getenv) = {REDIRECT_URI}")
@@ -19,6 +52,12 @@ print(f"DEBUG: REDIRECT_URI (os.getenv) = {REDIRECT_URI}")
 # `os.environ.get` を使っても確認
 print(f"DEBUG: REDIRECT_URI (os.environ) = {os.environ.get('REDIRECT_URI')}")
 
+# ログ（LOG_LEVELS はモジュール別のレベル: "app.features.customer=DEBUG,sqlalchemy.engine=WARNING"）
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text / json
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))  # DEBUGログを出力する割合（0〜1）
+
 # LINE API関連
 LINE_LOGIN_CHANNEL_ID = os.getenv("LINE_LOGIN_CHANNEL_ID")
 LINE_LOGIN_CHANNEL_SECRET = os.getenv("LINE_LOGIN_CHANNEL_SECRET")
@@ -44,7 +83,56 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS",60))
 # OpenAI API関連
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", 4))  # OpenAI APIの同時呼び出し数上限
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 20))  # 秒（1回の呼び出しあたり）
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 3))  # 429/5xx/タイムアウト時の再試行回数
+OPENAI_BREAKER_FAILURES = int(os.getenv("OPENAI_BREAKER_FAILURES", 5))  # 連続失敗でサーキットを開く回数
+OPENAI_BREAKER_RESET = float(os.getenv("OPENAI_BREAKER_RESET", 30))  # 秒（サーキットを開いておく時間）
 
 # microCMS
 MICROCMS_API_URL= os.getenv("MICROCMS_API_URL")
 MICROCMS_API_KEY= os.getenv("MICROCMS_API_KEY")
+
+# LINE BOT FAQキャッシュ（クエリEmbedding・回答）
+FAQ_CACHE_PATH = os.getenv("FAQ_CACHE_PATH", "app/data/faq_cache.sqlite3")
+FAQ_EMBEDDING_CACHE_SIZE = int(os.getenv("FAQ_EMBEDDING_CACHE_SIZE", 10000))
+FAQ_EMBEDDING_CACHE_TTL = int(os.getenv("FAQ_EMBEDDING_CACHE_TTL", 60 * 60 * 24 * 30))  # 秒
+FAQ_ANSWER_CACHE_ENABLED = os.getenv("FAQ_ANSWER_CACHE_ENABLED", "false").lower() == "true"  # 会話の最初の質問の回答を (質問, FAQ, 性別) ごとに共有
+FAQ_ANSWER_CACHE_SIZE = int(os.getenv("FAQ_ANSWER_CACHE_SIZE", 2000))
+FAQ_ANSWER_CACHE_TTL = int(os.getenv("FAQ_ANSWER_CACHE_TTL", 60 * 60 * 24))  # 秒
+
+# LINE BOT Webhook処理（バックグラウンドワーカー）
+LINEBOT_WORKER_COUNT = int(os.getenv("LINEBOT_WORKER_COUNT", 4))
+LINEBOT_QUEUE_SIZE = int(os.getenv("LINEBOT_QUEUE_SIZE", 1000))  # ワーカー1つあたりの待ち行列の上限
+
+# LINE BOT Webhook再送の重複排除（memory: プロセス内 / sqlite: ファイル共有で全ワーカー共通）
+EVENT_DEDUP_STORE = os.getenv("EVENT_DEDUP_STORE", "memory")
+EVENT_DEDUP_PATH = os.getenv("EVENT_DEDUP_PATH", "app/data/webhook_events.sqlite3")
+EVENT_DEDUP_TTL = int(os.getenv("EVENT_DEDUP_TTL", 60 * 60))  # 秒（処理済みイベントIDを覚えておく時間）
+EVENT_DEDUP_MAX_ENTRIES = int(os.getenv("EVENT_DEDUP_MAX_ENTRIES", 100000))
+
+# LINE BOT 会話履歴ストア（memory: プロセス内 / sqlite: ファイル共有で全ワーカー共通）
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "memory")
+CONVERSATION_STORE_PATH = os.getenv("CONVERSATION_STORE_PATH", "app/data/conversations.sqlite3")
+CONVERSATION_MAX_USERS = int(os.getenv("CONVERSATION_MAX_USERS", 5000))
+CONVERSATION_MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", 10))
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", 60 * 60 * 6))  # 秒（最後の発言からの保持時間）
+
+# LINE BOT FAQ検索（語彙検索 + ベクトル検索）
+FAQ_SIMILARITY_THRESHOLD = float(os.getenv("FAQ_SIMILARITY_THRESHOLD", 0.85))
+FAQ_LEXICAL_CONFIDENCE = float(os.getenv("FAQ_LEXICAL_CONFIDENCE", 0.9))  # これ以上ならEmbeddingを呼ばずに回答
+FAQ_LEXICAL_THRESHOLD = float(os.getenv("FAQ_LEXICAL_THRESHOLD", 0.5))  # これ以上なら類似度が低くても候補に含める
+FAQ_LEXICAL_WEIGHT = float(os.getenv("FAQ_LEXICAL_WEIGHT", 0.3))  # 順位付けでの語彙スコアの重み
+
+# LINE BOT プロンプトのトークン上限
+FAQ_PROMPT_MAX_PASSAGES = int(os.getenv("FAQ_PROMPT_MAX_PASSAGES", 3))  # プロンプトに含めるFAQの最大件数
+FAQ_PROMPT_PASSAGE_BUDGET = int(os.getenv("FAQ_PROMPT_PASSAGE_BUDGET", 1500))  # FAQ本文のトークン上限
+FAQ_PROMPT_HISTORY_BUDGET = int(os.getenv("FAQ_PROMPT_HISTORY_BUDGET", 600))  # 会話履歴（要約込み）のトークン上限
+CONVERSATION_RECENT_TURNS = int(os.getenv("CONVERSATION_RECENT_TURNS", 4))  # 要約せずに残す直近の発言数（履歴が CONVERSATION_MAX_TURNS に達したら残りを要約）
+
+# LINE BOT 返信期限（これを超えたら「確認中」を返信し、回答はプッシュで送る）
+# プッシュは月間のメッセージ通数（無料枠・従量課金）に数えられ、reply_token での返信は数えられないため、
+# reply_token の有効期間（受信から約1分）に近い値にして、ほとんどの回答を返信で送る
+LINEBOT_REPLY_DEADLINE = float(os.getenv("LINEBOT_REPLY_DEADLINE", 50))  # 秒（受信からの経過時間、0以下で無効）
+LINEBOT_INTERIM_MESSAGE = os.getenv("LINEBOT_INTERIM_MESSAGE", "確認しています。少々お待ちください🔍")
+LINEBOT_FAILURE_MESSAGE = os.getenv("LINEBOT_FAILURE_MESSAGE", "申し訳ありません、回答できませんでした。時間をおいてもう一度お試しください🙏")  # 「確認中」のあと回答できなかった場合
@@ -0,0 +1,128 @@
+import json
+import logging
+import random
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# 実行中リクエストのID（ログの突き合わせ用）
+_request_id: ContextVar = ContextVar("request_id", default=None)
+
+# LogRecord が標準で持つ属性（これ以外は extra で渡されたフィールドとしてJSONに出す）
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sample_rate"}
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    ログに実行中リクエストのIDを付ける
+    """
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    DEBUGログを間引く（LOG_DEBUG_SAMPLE_RATE の割合だけ出力）
+
+    件数の多いログは extra={"sample_rate": 0.01} のように個別に割合を指定できる
+    フォーマット前に判定するため、捨てたログの文字列化コストはかからない
+    """
+
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            rate = self.rate if record.levelno <= logging.DEBUG else 1.0
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    1行1JSONのログ（extra で渡したフィールドもそのまま出力）
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        record.request_id_suffix = f" [{record.request_id}]" if getattr(record, "request_id", None) else ""
+        return super().format(record)
+
+
+def parse_levels(spec: str) -> dict:
+    """
+    "app.features.customer=DEBUG,sqlalchemy.engine=WARNING" → {ロガー名: レベル}
+    """
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """
+    ルートロガーの設定（レベル・モジュール別レベル・出力形式・リクエストID・DEBUGの間引き）
+    """
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter())
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter("%(asctime)s - %(levelname)s - %(name)s%(request_id_suffix)s - %(message)s"))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL.upper())
+
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+
+class RequestIdMiddleware(BaseHTTPMiddleware):
+    """
+    リクエストIDを発行（X-Request-ID があれば引き継ぐ）し、ログとレスポンスヘッダーに付ける
+    """
+
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_id.reset(token)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
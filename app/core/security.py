@@ -3,7 +3,7 @@ from jose import jwt, JWTError
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
-from app.core.config import SECRET_KEY, REFRESH_SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from app.core.config import SECRET_KEY, REFRESH_SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, ADMIN_USER_IDS
 
 # ✅ Bearerトークンのスキーム
 security = HTTPBearer()
@@ -60,3 +60,13 @@ def get_current_user(
     token = credentials.credentials
     token_data = verify_access_token(token)
     return token_data["user_id"]
+
+def get_admin_user(user_id = Depends(get_current_user)):
+    """✅ 管理者（ADMIN_USER_IDS に含まれるユーザー）のIDを取得"""
+    try:
+        is_admin = user_id is not None and int(user_id) in ADMIN_USER_IDS
+    except (TypeError, ValueError):
+        is_admin = False
+    if not is_admin:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return user_id
@@ -0,0 +1,37 @@
+# IDの集合を整数のビット列で表す（ID n → 下から n-1 ビット目、BIGINT UNSIGNED に収まる64個まで）
+# 65以上のIDはビット列に入れず、検索時は結合テーブルで判定する（split_bitset）
+BITSET_SIZE = 64
+
+
+def bit_for(item_id: int) -> int:
+    """
+    IDに対応するビット（範囲外なら ValueError）
+    """
+    if not 1 <= item_id <= BITSET_SIZE:
+        raise ValueError(f"ビット列で表せるIDは1～{BITSET_SIZE}です: {item_id}")
+    return 1 << (item_id - 1)
+
+
+def to_bitset(item_ids) -> int:
+    bits = 0
+    for item_id in item_ids:
+        bits |= bit_for(item_id)
+    return bits
+
+
+def split_bitset(item_ids) -> tuple:
+    """
+    (1～BITSET_SIZE のIDのビット列, それより大きいIDの昇順リスト) に分ける（1未満は ValueError）
+    """
+    bits = 0
+    overflow = set()
+    for item_id in item_ids:
+        if item_id > BITSET_SIZE:
+            overflow.add(item_id)
+        else:
+            bits |= bit_for(item_id)
+    return bits, sorted(overflow)
+
+
+def bitset_ids(bits: int) -> list:
+    return [i + 1 for i in range(BITSET_SIZE) if bits >> i & 1]
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Float, Index, BigInteger
+from sqlalchemy.dialects import mysql
 from sqlalchemy.sql import func
 from app.db.session import Base
 from datetime import datetime, timedelta, timezone
@@ -34,7 +35,15 @@ class CastCommonProf(Base):
     support_area = Column(String(255), nullable=True)
     is_active = Column(Integer, default=0, nullable=True)
     available_at = Column(DateTime(timezone=True), nullable=True)
+    # ✅ 特徴・サービスタイプのIDをビット列で保持（検索で結合せずに絞り込むため。app/db/bitset.py）
+    trait_bits = Column(BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql"), nullable=False, default=0, server_default="0")
+    servicetype_bits = Column(BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql"), nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
     
     option_map = relationship("PointOptionMap", back_populates="cast")
+
+    # ✅ キャスト検索（公開中・エリア・タイプ）用インデックス
+    __table_args__ = (
+        Index("idx_cast_active_area_type", "is_active", "support_area", "cast_type"),
+    )
@@ -38,8 +38,8 @@ class PointTransaction(Base):
 
     # ✅ 高速検索用インデックス
     __table_args__ = (
-        Index("idx_user_id", "user_id"),  # ✅ ユーザーごとの検索用
-        Index("idx_related_id", "related_table", "related_id")  # ✅ 関連取引検索用
+        Index("idx_related_id", "related_table", "related_id"),  # ✅ 関連取引検索用
+        Index("idx_user_created", "user_id", "created_at"),  # ✅ ユーザーごとの検索・履歴（日時順）用（user_id 単独の検索もこれを使う）
     )
 
 
@@ -1,5 +1,5 @@
 # app/db/models/point_details.py
-from sqlalchemy import Column, Integer, ForeignKey, String, Enum, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, ForeignKey, String, Enum, DateTime, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from sqlalchemy.sql import func
@@ -18,6 +18,11 @@ class PointOptionMap(Base):
     cast = relationship("CastCommonProf", back_populates="option_map",
     primaryjoin="PointOptionMap.cast_id == CastCommonProf.cast_id")
 
+    # ✅ キャストの有効なオプション取得用インデックス
+    __table_args__ = (
+        Index("idx_option_map_cast_active", "cast_id", "is_active"),
+    )
+
 # ✅ コースのオプション
 class PointDetailsOption(Base):
     __tablename__ = "pnt_details_option"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, TIMESTAMP, func
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, TIMESTAMP, Index, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base  # ✅ 既存のBaseクラスを継承
 
@@ -14,3 +14,8 @@ class ResvChat(Base):
 
     # ✅ 予約データとのリレーション
     reservation = relationship("ResvReservation", back_populates="chat_messages")
+
+    # ✅ 予約ごとのメッセージ取得・最新メッセージ集計用インデックス
+    __table_args__ = (
+        Index("idx_resv_chat_reservation_created", "reservation_id", "created_at"),
+    )
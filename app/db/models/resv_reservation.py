@@ -1,6 +1,6 @@
 # 📂 app/db/models/resv_reservation.py
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, DECIMAL, Index
 from sqlalchemy.sql import func
 from app.db.session import Base
 from sqlalchemy.orm import relationship
@@ -56,3 +56,9 @@ class ResvReservation(Base):
     
     # ✅ 予約に紐づくオプション情報を取得可能にする
     reservation_options = relationship("ResvReservationOption", back_populates="reservation", cascade="all, delete-orphan")
+
+    # ✅ 予約一覧（キャスト別・ユーザー別に開始日時の降順）用インデックス
+    __table_args__ = (
+        Index("idx_resv_cast_start", "cast_id", "start_time"),
+        Index("idx_resv_user_start", "user_id", "start_time"),
+    )
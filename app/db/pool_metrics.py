@@ -0,0 +1,97 @@
+import threading
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolWaitStats:
+    """
+    接続プールからの取得待ち時間の集計
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = (self.checkouts + self.timeouts) or 1
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class WaitTimedPoolMixin:
+    """
+    プールからの接続取得（空き待ちを含む）にかかった時間を記録する
+    """
+
+    @property
+    def wait_stats(self) -> PoolWaitStats:
+        return self.__dict__.setdefault("_wait_stats", PoolWaitStats())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(WaitTimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(WaitTimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine) -> dict:
+    """
+    接続プールの使用状況（AsyncEngine も可）
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": getattr(pool, "_max_overflow", None),
+    }
+    if isinstance(pool, WaitTimedPoolMixin):
+        status.update(pool.wait_stats.snapshot())
+    return status
+
+
+def ping(engine) -> dict:
+    """
+    接続の取得時間と SELECT 1 の往復時間（ミリ秒）を計測
+    """
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connected = time.perf_counter()
+        connection.execute(text("SELECT 1"))
+        finished = time.perf_counter()
+    return {
+        "connect_ms": round((connected - started) * 1000, 3),
+        "ping_ms": round((finished - connected) * 1000, 3),
+    }
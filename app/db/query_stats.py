@@ -0,0 +1,116 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import DB_QUERY_STATS_ENABLED, DB_N_PLUS_ONE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# IN句などで展開されたプレースホルダーの並び（件数違いを同じ形にまとめる）
+_PLACEHOLDER_LIST = re.compile(r"(%s|\?|%\(\w+\)s)(\s*,\s*(%s|\?|%\(\w+\)s))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    パラメータを除いたSQLの形（同じ形が繰り返されていればN+1の疑い）
+    """
+    shape = _PLACEHOLDER_LIST.sub("...", statement)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestQueryStats:
+    """
+    1リクエスト内で実行したSQLの件数・合計時間・形ごとの回数
+    """
+
+    def __init__(self, endpoint: str = None):
+        self.endpoint = endpoint
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """
+        threshold回を超えて繰り返された (SQLの形, 回数)
+        """
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+# リクエストごとの集計（ワーカースレッドにもコピーされるため、同じオブジェクトに書き込む）
+_current_stats: ContextVar = ContextVar("db_query_stats", default=None)
+
+
+def current_query_stats():
+    return _current_stats.get()
+
+
+def current_endpoint():
+    """
+    実行中のリクエスト（"METHOD /path"）、リクエスト外ならNone
+    """
+    stats = _current_stats.get()
+    return stats.endpoint if stats is not None else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if DB_QUERY_STATS_ENABLED and _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # 失敗したSQLは after_cursor_execute が呼ばれないため開始時刻を捨てる
+    conn = exception_context.connection
+    started = conn.info.get("query_started_at") if conn is not None else None
+    if started:
+        started.pop()
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    リクエストごとのSQL件数・DB時間を Server-Timing / X-DB-Queries ヘッダーとログに出す
+    同じ形のSQLが DB_N_PLUS_ONE_THRESHOLD 回を超えたら警告（N+1の検出）
+    （計測を無効にしても、スロークエリログ用に実行中のエンドポイントは記録する）
+    """
+
+    async def dispatch(self, request, call_next):
+        stats = RequestQueryStats(endpoint=f"{request.method} {request.url.path}")
+        token = _current_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+
+        if not DB_QUERY_STATS_ENABLED:
+            return response
+
+        db_ms = round(stats.total_time * 1000, 2)
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers.append("Server-Timing", f'db;dur={db_ms};desc="{stats.count} queries"')
+
+        fields = {"path": request.url.path, "db_queries": stats.count, "db_time_ms": db_ms}
+        for shape, n in stats.repeated(DB_N_PLUS_ONE_THRESHOLD):
+            logger.warning("⚠️ N+1の疑い: 同じSQLが%s回実行されました %s %s: %s", n, request.method, request.url.path, shape[:300],
+                           extra={**fields, "repeated_statement": shape, "repeat_count": n})
+        logger.debug("%s %s - SQL %s件 / %sms", request.method, request.url.path, stats.count, db_ms, extra=fields)
+        return response
@@ -0,0 +1,74 @@
+import time
+from contextvars import ContextVar
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import DB_READ_AFTER_WRITE_WINDOW
+
+# リードレプリカを使わずプライマリから読む指定
+# 書き込んだリクエストのレスポンスに X-Read-Primary-Until（期限のUNIX時刻）を付けるので、
+# クライアントは期限までそのままリクエストヘッダーに付けて送る（サポートする方法はヘッダーのみ）
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PRIMARY_UNTIL_HEADER = "X-Read-Primary-Until"
+# Cookieは同じサイトのブラウザ向けの補助（SameSite=None はサードパーティCookieの制限で送られないことがある）
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# リクエストごとの状態（ワーカースレッドにもコピーされるため、dictを共有して書き込みを伝える）
+_request_state: ContextVar = ContextVar("db_request_state", default=None)
+
+
+def mark_primary_write(*_):
+    """
+    プライマリでcommitしたことを記録（PrimarySession の after_commit から呼ばれる。同期・非同期どちらのセッションも）
+    """
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+def should_read_primary(request) -> bool:
+    """
+    書き込み直後など、このリクエストの読み込みをプライマリに向けるべきか
+
+    ・ヘッダー X-Read-Primary: 1 の明示指定
+    ・直近に書き込んだクライアント（レスポンスで受け取った X-Read-Primary-Until、または Cookie read_primary_until が期限内）
+    """
+    if request is None:
+        return False
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return True
+    now = time.time()
+    for until in (request.headers.get(READ_PRIMARY_UNTIL_HEADER), request.cookies.get(READ_PRIMARY_COOKIE)):
+        try:
+            if until and float(until) > now:
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    プライマリに書き込んだリクエストのレスポンスに期限（ヘッダーとCookie）を付け、
+    一定時間（DB_READ_AFTER_WRITE_WINDOW）そのクライアントの読み込みをプライマリに向ける
+    （レプリカの反映遅延で書き込んだ内容が見えなくなるのを防ぐ）
+    """
+
+    async def dispatch(self, request, call_next):
+        state = {"wrote": False}
+        token = _request_state.set(state)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_state.reset(token)
+
+        if state["wrote"] and DB_READ_AFTER_WRITE_WINDOW > 0:
+            until = str(time.time() + DB_READ_AFTER_WRITE_WINDOW)
+            response.headers[READ_PRIMARY_UNTIL_HEADER] = until
+            response.set_cookie(
+                key=READ_PRIMARY_COOKIE,
+                value=until,
+                max_age=int(DB_READ_AFTER_WRITE_WINDOW) + 1,
+                httponly=True,
+                secure=True,
+                samesite="None",
+            )
+        return response
@@ -1,7 +1,21 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
+from app.core.config import (
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DATABASE_READ_URL,
+)
+from app.db.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from app.db.read_routing import mark_primary_write, should_read_primary
+import app.db.slow_query  # noqa: F401  ✅ スロークエリログ（全エンジン共通のイベントを登録）
 
 # .envファイルが存在する場合のみ読み込み
 load_dotenv()
@@ -13,19 +27,72 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL環境変数が設定されていません。")
 
+# ✅ 接続プールの設定（環境変数で調整）
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
 # ✅ データベースエンジンの作成（JSTに設定）
 engine = create_engine(
     DATABASE_URL,
+    poolclass=TimedQueuePool,
     connect_args={
         "init_command": "SET time_zone = 'Asia/Tokyo'"  # ✅ タイムゾーン設定
-    }
+    },
+    **POOL_OPTIONS,
+)
+
+# ✅ リードレプリカのエンジン（DATABASE_READ_URL 未設定ならプライマリを共用）
+read_engine = create_engine(
+    DATABASE_READ_URL,
+    poolclass=TimedQueuePool,
+    connect_args={
+        "init_command": "SET time_zone = 'Asia/Tokyo'"  # ✅ タイムゾーン設定
+    },
+    **POOL_OPTIONS,
+) if DATABASE_READ_URL else engine
+
+# ✅ 非同期エンジンの作成（DATABASE_URLのドライバをaiomysqlに置き換え）
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "mysql":
+        parsed = parsed.set(drivername="mysql+aiomysql")
+    return parsed.render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    connect_args={
+        "init_command": "SET time_zone = 'Asia/Tokyo'"  # ✅ タイムゾーン設定
+    },
+    **POOL_OPTIONS,
 )
 
 # ORMの基盤クラス
 Base = declarative_base()
 
+# プライマリに書き込むセッション（AsyncSessionLocal の内部セッションにも使う）
+class PrimarySession(Session):
+    pass
+
+# ✅ プライマリでcommitしたリクエストは、しばらく読み込みもプライマリに向ける（同期・非同期どちらのcommitも）
+event.listen(PrimarySession, "after_commit", mark_primary_write)
+
 # セッションの作成
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=PrimarySession, autocommit=False, autoflush=False, bind=engine)
+
+# 読み込み専用セッションの作成（リードレプリカ）
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"read_only": True})
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def reject_read_session_writes(session, flush_context, instances):
+    raise RuntimeError("読み込み専用セッションでは書き込みできません（get_db を使用してください）")
 
 # データベースセッションを取得
 def get_db():
@@ -34,3 +101,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 読み込み専用のデータベースセッションを取得（SELECTのみのエンドポイント用）
+# 書き込み直後のクライアント（X-Read-Primary-Until が期限内）や X-Read-Primary 指定時はプライマリから読む
+def get_read_db(request: Request = None):
+    db = SessionLocal() if should_read_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 非同期セッションの作成（commit後も属性を参照できるよう expire_on_commit=False）
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, sync_session_class=PrimarySession, autoflush=False, expire_on_commit=False
+)
+
+# 非同期エンドポイント用のデータベースセッションを取得
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
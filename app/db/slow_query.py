@@ -0,0 +1,139 @@
+import datetime
+import decimal
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import DB_SLOW_QUERY_MS, DB_SLOW_QUERY_BUFFER, DB_SLOW_QUERY_EXPLAIN
+from app.db.query_stats import current_endpoint
+
+logger = logging.getLogger(__name__)
+
+# 値をそのまま残すパラメータの型（文字列などは個人情報を含みうるため長さだけ残す）
+_PLAIN_TYPES = (int, float, bool, type(None))
+_TEXT_TYPES = (decimal.Decimal, datetime.date, datetime.time)  # datetime も date に含まれる
+
+# EXPLAIN を取るのはSELECTのみ（更新系を再実行しないため）
+_SELECT = re.compile(r"^\s*(\(\s*)*SELECT\b", re.IGNORECASE)
+
+# スロークエリ判定・EXPLAIN取得の対象外にする実行オプション
+SKIP_OPTION = "skip_slow_query_log"
+
+
+def redact_value(value):
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, _TEXT_TYPES):
+        return str(value)
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    if isinstance(value, (list, tuple)):
+        return [redact_value(v) for v in value]
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters):
+    """
+    バインドパラメータを伏せ字にする（数値・日時はそのまま、文字列は長さのみ）
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(p) if isinstance(p, (dict, list, tuple)) else redact_value(p) for p in parameters]
+    return redact_value(parameters)
+
+
+class SlowQueryLog:
+    """
+    しきい値を超えたSQLのサンプル（件数上限つきのリングバッファ）
+
+    SELECTはプライマリ処理を止めないよう、別スレッド・別接続でEXPLAINを取得して追記する
+    """
+
+    def __init__(self, threshold_ms: float = DB_SLOW_QUERY_MS, size: int = DB_SLOW_QUERY_BUFFER, explain: bool = DB_SLOW_QUERY_EXPLAIN):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.samples = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    def record(self, conn, statement: str, parameters, elapsed: float, executemany: bool):
+        sample = {
+            "id": next(self._ids),
+            "at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "duration_ms": round(elapsed * 1000, 2),
+            "endpoint": current_endpoint(),
+            "statement": statement,
+            "parameters": redact_parameters(parameters),
+            "explain": None,
+        }
+        with self._lock:
+            self.samples.append(sample)
+        logger.warning(
+            "🐢 スロークエリ %sms (%s): %s params=%s",
+            sample["duration_ms"], sample["endpoint"] or "リクエスト外", statement[:500], sample["parameters"],
+            extra={"db_duration_ms": sample["duration_ms"], "endpoint": sample["endpoint"]},
+        )
+
+        # 非同期ドライバの接続はイベントループ外で使えないためEXPLAINは取らない
+        if self.explain and not executemany and not conn.dialect.is_async and _SELECT.match(statement):
+            self._explainer.submit(self._capture_explain, conn.engine, sample, statement, parameters)
+
+    def _capture_explain(self, engine, sample: dict, statement: str, parameters):
+        try:
+            with engine.connect().execution_options(**{SKIP_OPTION: True}) as side:
+                result = side.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plan = [dict(row) for row in result.mappings()]
+        except Exception as e:
+            plan = {"error": str(e)}
+        with self._lock:
+            sample["explain"] = plan
+        logger.warning("🐢 スロークエリ #%s のEXPLAIN: %s", sample['id'], plan)
+
+    def snapshot(self, limit: int = None) -> list:
+        """
+        新しい順のサンプル
+        """
+        with self._lock:
+            samples = list(reversed(self.samples))
+        return samples[:limit] if limit else samples
+
+    def clear(self):
+        with self._lock:
+            self.samples.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("slow_query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if slow_query_log.threshold < 0 or elapsed < slow_query_log.threshold:
+        return
+    if context is not None and context.execution_options.get(SKIP_OPTION):
+        return
+    slow_query_log.record(conn, statement, parameters, elapsed, executemany)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # 失敗したSQLは after_cursor_execute が呼ばれないため開始時刻を捨てる
+    conn = exception_context.connection
+    started = conn.info.get("slow_query_started_at") if conn is not None else None
+    if started:
+        started.pop()
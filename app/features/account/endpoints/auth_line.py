@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from urllib.parse import quote
-from app.db.session import get_db
-from app.features.account.repositories.account_repository import AccountRepository
+from app.db.session import get_async_db
+from app.features.account.repositories.async_account_repository import AsyncAccountRepository
 from app.core.security import create_access_token, create_refresh_token  # ✅ `create_refresh_token` を追加
 from app.core.config import (
     FRONTEND_URL, 
@@ -35,7 +36,7 @@ async def line_login(tracking_id: str = None):
 
 # ✅ 2. LINEコールバック処理
 @router.get("/callback")
-async def line_callback(request: Request, db: Session = Depends(get_db)):
+async def line_callback(request: Request, db: AsyncSession = Depends(get_async_db)):
     code = request.query_params.get("code")
     state = request.query_params.get("state")
 
@@ -50,7 +51,8 @@ async def line_callback(request: Request, db: Session = Depends(get_db)):
         "client_id": LINE_LOGIN_CHANNEL_ID,
         "client_secret": LINE_LOGIN_CHANNEL_SECRET
     }
-    response = requests.post("https://api.line.me/oauth2/v2.1/token", data=token_data)
+    # ✅ requests はブロッキングのためスレッドプールで実行（イベントループを止めない）
+    response = await run_in_threadpool(requests.post, "https://api.line.me/oauth2/v2.1/token", data=token_data)
     if response.status_code != 200:
         raise HTTPException(status_code=400, detail="Failed to retrieve access token")
 
@@ -58,7 +60,7 @@ async def line_callback(request: Request, db: Session = Depends(get_db)):
 
     # 🔑 LINE APIからユーザープロフィール取得
     headers = {"Authorization": f"Bearer {access_token}"}
-    profile_response = requests.get("https://api.line.me/v2/profile", headers=headers)
+    profile_response = await run_in_threadpool(requests.get, "https://api.line.me/v2/profile", headers=headers)
     if profile_response.status_code != 200:
         raise HTTPException(status_code=400, detail="Failed to retrieve user profile")
 
@@ -74,8 +76,8 @@ async def line_callback(request: Request, db: Session = Depends(get_db)):
         tracking_id = state_params.get('tracking_id')
 
     # 🔑 ユーザー確認・登録
-    account_repo = AccountRepository(db)
-    user = account_repo.get_user_by_line_id(line_id)
+    account_repo = AsyncAccountRepository(db)
+    user = await account_repo.get_user_by_line_id(line_id)
     
     # ✅ JSTの現在時刻を取得
     jst = pytz.timezone('Asia/Tokyo')
@@ -83,7 +85,7 @@ async def line_callback(request: Request, db: Session = Depends(get_db)):
     
     if not user:
         # 新規ユーザー登録
-        user = account_repo.create_user(
+        user = await account_repo.create_user(
             line_id=line_id,
             nick_name=display_name,
             picture_url=picture_url,
@@ -92,7 +94,7 @@ async def line_callback(request: Request, db: Session = Depends(get_db)):
         )
     else:
         # 再ログイン → last_login更新
-        user = account_repo.update_last_login(line_id)
+        user = await account_repo.update_last_login(line_id)
 
     # 📌 JWTトークン生成
     jwt_token = create_access_token(
@@ -0,0 +1,65 @@
+from datetime import datetime
+import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from app.db.models.user import User
+from typing import Optional
+
+class AsyncAccountRepository:
+    """
+    AccountRepository の非同期版（async def のエンドポイント用）
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """
+        ユーザーIDでユーザーを取得
+        """
+        result = await self.db.execute(select(User).where(User.id == user_id).limit(1))
+        return result.scalars().first()
+
+    async def get_user_by_line_id(self, line_id: str) -> Optional[User]:
+        """
+        LINE IDでユーザーを取得
+        """
+        result = await self.db.execute(select(User).where(User.line_id == line_id).limit(1))
+        return result.scalars().first()
+
+    async def create_user(self, **kwargs) -> User:
+        """
+        新しいユーザーを作成
+        """
+        try:
+            new_user = User(**kwargs)
+            self.db.add(new_user)
+            await self.db.commit()
+            await self.db.refresh(new_user)
+            return new_user
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def update_last_login(self, line_id: str) -> Optional[User]:
+        """
+        ✅ LINE IDを使用して最終ログイン日時を更新（日本時間）
+        """
+        user = await self.get_user_by_line_id(line_id)
+        if not user:
+            return None
+        try:
+            # ✅ JSTの現在時刻を取得
+            jst = pytz.timezone('Asia/Tokyo')
+            now_jst = datetime.now(jst)
+
+            # ✅ last_login を JSTで更新
+            user.last_login = now_jst.strftime("%Y/%m/%d %H:%M:%S")
+
+            await self.db.commit()
+            await self.db.refresh(user)
+            return user
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from app.core.security import get_admin_user
+from app.db.slow_query import slow_query_log
+
+router = APIRouter(tags=["Admin - DB Stats"])
+
+@router.get("/slow-queries")
+def get_slow_queries(limit: int = 50, admin_id = Depends(get_admin_user)):
+    """
+    ✅ スロークエリのサンプル（新しい順）
+    ✅ パラメータは伏せ字、SELECTは別接続で取得したEXPLAINつき
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold * 1000,
+        "capacity": slow_query_log.samples.maxlen,
+        "samples": slow_query_log.snapshot(limit),
+    }
+
+@router.delete("/slow-queries")
+def clear_slow_queries(admin_id = Depends(get_admin_user)):
+    """
+    ✅ スロークエリのサンプルを消去
+    """
+    slow_query_log.clear()
+    return {"message": "cleared"}
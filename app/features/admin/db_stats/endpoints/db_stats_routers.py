@@ -0,0 +1,7 @@
+# app/features/admin/db_stats/endpoints/db_stats_routers.py
+from fastapi import APIRouter
+
+db_stats_router = APIRouter()
+
+from app.features.admin.db_stats.endpoints.db_stats import router as db_stats_endpoints
+db_stats_router.include_router(db_stats_endpoints, prefix="", tags=["Admin - DB統計"])
@@ -14,6 +14,9 @@ from app.features.cast.identity_verification.services.identity_service import (
     review_verification,
     get_verification_documents
 )
+import logging
+
+logger = logging.getLogger(__name__)
 
 # 認証が必要なルーター
 identity_router = APIRouter(
@@ -34,11 +37,11 @@ def submit_verification(
     - 申請ステータスを「審査中」に更新
     """
     # デバッグ情報を出力
-    print(f"リクエスト受信: user_id={user_id}, request={request}")
+    logger.debug("リクエスト受信: user_id=%s, request=%s", user_id, request)
     
     # キャストIDを使用
     cast_id = request.cast_id if request.cast_id is not None else user_id
-    print(f"使用するcast_id: {cast_id}")
+    logger.debug("使用するcast_id: %s", cast_id)
     
     # サービスタイプと必要な書類
     if request.service_type == "B" and not request.juminhyo_media_id:
@@ -63,10 +66,10 @@ def submit_verification(
             request.juminhyo_media_id, 
             db
         )
-        print(f"申請作成結果: {result}")
+        logger.debug("申請作成結果: %s", result)
         return result
     except Exception as e:
-        print(f"エラー発生: {str(e)}")
+        logger.error("エラー発生: %s", str(e))
         raise
 
 # 本人確認ステータス確認エンドポイント（GET/POSTの両方をサポート）
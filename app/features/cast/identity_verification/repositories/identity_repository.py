@@ -4,6 +4,9 @@ from app.db.models.cast_identity_verification import CastIdentityVerification
 from app.db.models.media_files import MediaFile
 from fastapi import HTTPException
 from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 class IdentityVerificationRepository:
     def __init__(self, db: Session):
@@ -21,25 +24,25 @@ class IdentityVerificationRepository:
         """
         u672cu4ebau78bau8a8du7533u8acbu3092u4f5cu6210
         """
-        print(f"u30eau30ddu30b8u30c8u30ea: create_verification_requestu958bu59cb - cast_id={cast_id}, service_type={service_type}, id_photo_media_id={id_photo_media_id}, juminhyo_media_id={juminhyo_media_id}")
+        logger.debug("u30eau30ddu30b8u30c8u30ea: create_verification_requestu958bu59cb - cast_id=%s, service_type=%s, id_photo_media_id=%s, juminhyo_media_id=%s", cast_id, service_type, id_photo_media_id, juminhyo_media_id)
         
         # u65e2u5b58u306eu7533u8acbu304cu3042u308bu304bu78bau8a8d
         existing = self.get_verification_status(cast_id)
-        print(f"u65e2u5b58u30ecu30b3u30fcu30c9u78bau8a8du7d50u679c: {existing}")
+        logger.debug("u65e2u5b58u30ecu30b3u30fcu30c9u78bau8a8du7d50u679c: %s", existing)
         
         if existing:
             # u65e2u306bu627fu8a8du6e08u307fu306eu5834u5408u306fu30a8u30e9u30fc
             if existing.status == 'approved':
-                print(f"u30a8u30e9u30fc: u65e2u306bu627fu8a8du6e08u307f")
+                logger.debug("u30a8u30e9u30fc: u65e2u306bu627fu8a8du6e08u307f")
                 raise HTTPException(status_code=400, detail="u65e2u306bu672cu4ebau78bau8a8du304cu5b8cu4e86u3057u3066u3044u307eu3059")
             
             # u5be9u67fbu4e2du306eu5834u5408u306fu30a8u30e9u30fc
             if existing.status == 'pending':
-                print(f"u30a8u30e9u30fc: u5be9u67fbu4e2d")
+                logger.debug("u30a8u30e9u30fc: u5be9u67fbu4e2d")
                 raise HTTPException(status_code=400, detail="u5be9u67fbu4e2du3067u3059u3002u3057u3070u3089u304fu304au5f85u3061u304fu3060u3055u3044")
             
             # u5374u4e0bu307eu305fu306fu672au63d0u51fau306eu5834u5408u306fu66f4u65b0
-            print(f"u65e2u5b58u30ecu30b3u30fcu30c9u3092u66f4u65b0u3057u307eu3059: status={existing.status} -> pending")
+            logger.debug("u65e2u5b58u30ecu30b3u30fcu30c9u3092u66f4u65b0u3057u307eu3059: status=%s -> pending", existing.status)
             existing.status = 'pending'
             existing.submitted_at = func.now()
             existing.reviewed_at = None
@@ -50,15 +53,15 @@ class IdentityVerificationRepository:
             
             try:
                 self.db.commit()
-                print(f"u66f4u65b0u6210u529f: {existing}")
+                logger.debug("u66f4u65b0u6210u529f: %s", existing)
                 return existing
             except Exception as e:
                 self.db.rollback()
-                print(f"u66f4u65b0u5931u6557: {str(e)}")
+                logger.error("u66f4u65b0u5931u6557: %s", str(e))
                 raise HTTPException(status_code=500, detail=f"u30c7u30fcu30bfu30d9u30fcu30b9u66f4u65b0u30a8u30e9u30fc: {str(e)}")
         
         # u65b0u898fu4f5cu6210
-        print("u65b0u898fu30ecu30b3u30fcu30c9u3092u4f5cu6210u3057u307eu3059")
+        logger.debug("u65b0u898fu30ecu30b3u30fcu30c9u3092u4f5cu6210u3057u307eu3059")
         try:
             new_verification = CastIdentityVerification(
                 cast_id=cast_id,
@@ -71,11 +74,11 @@ class IdentityVerificationRepository:
             self.db.add(new_verification)
             self.db.commit()
             self.db.refresh(new_verification)
-            print(f"u65b0u898fu4f5cu6210u6210u529f: {new_verification}")
+            logger.debug("u65b0u898fu4f5cu6210u6210u529f: %s", new_verification)
             return new_verification
         except Exception as e:
             self.db.rollback()
-            print(f"u65b0u898fu4f5cu6210u5931u6557: {str(e)}")
+            logger.error("u65b0u898fu4f5cu6210u5931u6557: %s", str(e))
             raise HTTPException(status_code=500, detail=f"u30c7u30fcu30bfu30d9u30fcu30b9u4f5cu6210u30a8u30e9u30fc: {str(e)}")
 
     def update_verification_status(self, cast_id: int, status: str, reviewer_id: int, rejection_reason: Optional[str] = None) -> CastIdentityVerification:
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import asc
 from app.db.models.cast_servicetype import CastServiceType, CastServiceTypeList  
+from app.db.models.cast_common_prof import CastCommonProf
+from app.db.bitset import split_bitset
 import logging
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.DEBUG)
 
 
 class ServiceTypeRepository:
@@ -15,7 +16,7 @@ class ServiceTypeRepository:
         """
         ✅ `cast_servicetype_list`（サービスタイプリスト）の全データを取得（weight順）
         """
-        logger.info("【service type list】サービスタイプリストのデータ取得開始")
+        logger.debug("【service type list】サービスタイプリストのデータ取得開始")
 
         service_types = (
             self.db.query(CastServiceTypeList)
@@ -23,7 +24,7 @@ class ServiceTypeRepository:
             .all()
         )
 
-        logger.info(f"【service type list】取得データ: {service_types}")
+        logger.debug("【service type list】取得データ: %s", service_types)
 
         return service_types
 
@@ -43,16 +44,17 @@ class ServiceTypeRepository:
         """
         ✅ キャストのサービスタイプをまとめて登録
         """
-        logger.info(f"【service type register】キャストID: {cast_id} | 登録するサービスタイプID: {servicetype_ids}")
+        logger.debug("【service type register】キャストID: %s | 登録するサービスタイプID: %s", cast_id, servicetype_ids)
 
         new_services = [CastServiceType(cast_id=cast_id, servicetype_id=servicetype_id) for servicetype_id in servicetype_ids]
-        logger.info(f"【service type register】登録データ: {new_services}")
+        logger.debug("【service type register】登録データ: %s", new_services)
 
         self.db.add_all(new_services)
         self.db.flush()  # 追加
+        self.sync_servicetype_bits(cast_id)
         self.db.commit()
 
-        logger.info(f"【service type register】サービスタイプを登録しました: {servicetype_ids}")
+        logger.info("【service type register】サービスタイプを登録しました: %s", servicetype_ids)
 
 
 
@@ -60,11 +62,23 @@ class ServiceTypeRepository:
         """
         ✅ キャストのサービスタイプをまとめて削除
         """
-        logger.info(f"【service type delete】キャストID: {cast_id} | 削除するサービスタイプID: {service_type_ids}")
+        logger.debug("【service type delete】キャストID: %s | 削除するサービスタイプID: %s", cast_id, service_type_ids)
 
         self.db.query(CastServiceType).filter(
             CastServiceType.cast_id == cast_id, CastServiceType.servicetype_id.in_(service_type_ids)
         ).delete(synchronize_session=False)
+        self.sync_servicetype_bits(cast_id)
         self.db.commit()
 
-        logger.info(f"【service type delete】サービスタイプを削除しました: {service_type_ids}")
+        logger.info("【service type delete】サービスタイプを削除しました: %s", service_type_ids)
+
+    def sync_servicetype_bits(self, cast_id: int):
+        """
+        ✅ 検索用の `cast_common_prof.servicetype_bits` を現在のサービスタイプから作り直す（commitは呼び出し側）
+        ビット列で表せない65以上のIDは入れない（検索時に cast_servicetype で判定する）
+        """
+        servicetype_ids = self.get_selected_service_types(cast_id)
+
+        self.db.query(CastCommonProf).filter(CastCommonProf.cast_id == cast_id).update(
+            {CastCommonProf.servicetype_bits: split_bitset(servicetype_ids)[0]}, synchronize_session=False
+        )
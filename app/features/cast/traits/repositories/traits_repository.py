@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import asc
 from app.db.models.cast_traits import CastTrait, CastTraitList  
+from app.db.models.cast_common_prof import CastCommonProf
+from app.db.bitset import split_bitset
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,7 @@ class TraitsRepository:
         """
         ✅ `cast_traits_list`（特徴リスト）の全データを取得（weight順）
         """
-        logger.info("【traits list】特徴リストのデータ取得開始")
+        logger.debug("【traits list】特徴リストのデータ取得開始")
 
         traits = (
             self.db.query(CastTraitList)
@@ -22,7 +24,7 @@ class TraitsRepository:
             .all()
         )
 
-        logger.info(f"【traits list】取得データ: {traits}")
+        logger.debug("【traits list】取得データ: %s", traits)
 
         return traits
 
@@ -42,23 +44,37 @@ class TraitsRepository:
         """
         ✅ キャストの特徴をまとめて登録
         """
-        logger.info(f"【traits register】キャストID: {cast_id} | 登録する特徴ID: {trait_ids}")
+        logger.debug("【traits register】キャストID: %s | 登録する特徴ID: %s", cast_id, trait_ids)
 
         new_traits = [CastTrait(cast_id=cast_id, trait_id=trait_id) for trait_id in trait_ids]
         self.db.add_all(new_traits)
+        self.db.flush()
+        self.sync_trait_bits(cast_id)
         self.db.commit()
 
-        logger.info(f"【traits register】特徴を登録しました: {trait_ids}")
+        logger.info("【traits register】特徴を登録しました: %s", trait_ids)
 
     def delete_traits(self, cast_id: int, trait_ids: list[int]):
         """
         ✅ キャストの特徴をまとめて削除
         """
-        logger.info(f"【traits delete】キャストID: {cast_id} | 削除する特徴ID: {trait_ids}")
+        logger.debug("【traits delete】キャストID: %s | 削除する特徴ID: %s", cast_id, trait_ids)
 
         self.db.query(CastTrait).filter(
             CastTrait.cast_id == cast_id, CastTrait.trait_id.in_(trait_ids)
         ).delete(synchronize_session=False)
+        self.sync_trait_bits(cast_id)
         self.db.commit()
 
-        logger.info(f"【traits delete】特徴を削除しました: {trait_ids}")
+        logger.info("【traits delete】特徴を削除しました: %s", trait_ids)
+
+    def sync_trait_bits(self, cast_id: int):
+        """
+        ✅ 検索用の `cast_common_prof.trait_bits` を現在の特徴から作り直す（commitは呼び出し側）
+        ビット列で表せない65以上のIDは入れない（検索時に cast_traits で判定する）
+        """
+        trait_ids = self.get_selected_traits(cast_id)
+
+        self.db.query(CastCommonProf).filter(CastCommonProf.cast_id == cast_id).update(
+            {CastCommonProf.trait_bits: split_bitset(trait_ids)[0]}, synchronize_session=False
+        )
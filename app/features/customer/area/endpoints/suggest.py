@@ -7,6 +7,9 @@ from pydantic import BaseModel  # ✅ 追加
 from app.db.session import get_db
 from ..service.station_service import fetch_current_station
 from ..schemas.station_schema import StationResponse
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -18,7 +21,7 @@ class StationSuggestRequest(BaseModel):
 def get_suggested_stations(request: StationSuggestRequest, db: Session = Depends(get_db)):
     """駅名の部分一致検索を行い、固定データを返す（デバッグ用）"""
     
-    print("✅ /station/suggest が呼ばれました:", request.query)  # ログ出力
+    logger.debug("✅ /station/suggest が呼ばれました: %s", request.query)  # ログ出力
 
     return suggest_stations(db, request.query)
 
@@ -5,11 +5,14 @@ from sqlalchemy import func
 from app.db.models.station import Station
 from app.db.models.line import Line
 from typing import List
+import logging
+
+logger = logging.getLogger(__name__)
 
 def suggest_stations(db: Session, query: str, limit: int = 10) -> List[dict]:
     """駅名の部分一致検索"""
 
-    print(f"✅ 受け取ったクエリ: {query}")  # 🚀 どんなクエリが来ているか確認
+    logger.debug("✅ 受け取ったクエリ: %s", query)  # 🚀 どんなクエリが来ているか確認
 
     sql_query = (
         db.query(
@@ -24,14 +27,14 @@ def suggest_stations(db: Session, query: str, limit: int = 10) -> List[dict]:
         .limit(limit)
     )
 
-    print(f"✅ 実行されるSQL: {str(sql_query)}")  # 🚀 実際にSQLAlchemyが生成するクエリを確認
+    logger.debug("✅ 実行されるSQL: %s", str(sql_query))  # 🚀 実際にSQLAlchemyが生成するクエリを確認
 
     stations = sql_query.all()
     
-    print(f"✅ クエリ結果: {stations}")
+    logger.debug("✅ クエリ結果: %s", stations)
 
     if not stations:
-        print("🚨 駅が見つかりません！")
+        logger.warning("🚨 駅が見つかりません！")
         return []
 
     return [
@@ -2,16 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.features.customer.castprof.service.castprof_service import fetch_cast_profile
 from app.features.customer.castprof.schemas.castprof_schema import CastProfileRequest, CastProfileResponse
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/", response_model=CastProfileResponse)
-def get_profile(request: CastProfileRequest, db: Session = Depends(get_db)):
+def get_profile(request: CastProfileRequest, db: Session = Depends(get_read_db)):
     """キャストのプロフィール情報を取得"""
-    print(f"【バックエンド API 受信】 cast_id: {request.cast_id}, user_id: {request.user_id}")
+    logger.debug("【バックエンド API 受信】 cast_id: %s, user_id: %s", request.cast_id, request.user_id)
 
     profile = fetch_cast_profile(request.cast_id, db)
 
@@ -1,23 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.features.customer.search.service.search_service import fetch_cast_list
+from app.db.session import get_read_db
+from app.features.customer.search.service.search_service import fetch_cast_list, fetch_cast_page
 from app.features.customer.search.schemas.search_schema import SearchRequest  # ✅ スキーマをインポート
 from app.features.customer.search.schemas.user_schema import UserPrefectureRequest  # ✅ スキーマをインポート
 from app.features.customer.search.repositories.user_repository import get_user_prefecture, get_prefecture_name
 from app.core.security import get_current_user
 from app.db.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter() 
 
 @router.post("/user/prefecture")
-def get_user_prefecture_endpoint(request: UserPrefectureRequest, db: Session = Depends(get_db)):
+def get_user_prefecture_endpoint(request: UserPrefectureRequest, db: Session = Depends(get_read_db)):
     """ユーザーの都道府県IDと名前を取得"""
     user_id = request.user_id
     prefecture_id = get_user_prefecture(db, user_id)
-    print(f"🔍【API DEBUG】user_id: {user_id}")
-    print(f"🔍【API DEBUG】取得した prefecture_id: {prefecture_id}")
+    logger.debug("🔍【API DEBUG】user_id: %s", user_id)
+    logger.debug("🔍【API DEBUG】取得した prefecture_id: %s", prefecture_id)
 
     if prefecture_id is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -33,10 +36,17 @@ def get_user_prefecture_endpoint(request: UserPrefectureRequest, db: Session = D
 @router.post("/")
 def search_casts(
     request: SearchRequest, 
-    db: Session = Depends(get_db), 
+    db: Session = Depends(get_read_db), 
     current_user_id: int = Depends(get_current_user)  # ✅ ここは `user_id` になっている
 ):
-    print(f"【バックエンド API 受信】 offset: {request.offset}, limit: {request.limit}, sort: {request.sort}, filters: {request.filters}")
+    """
+    キャスト検索
+
+    cursor を送るとカーソルページング（{casts, next_cursor, has_more}）、
+    送らない旧クライアントは offset ページング（キャストの配列）で返す
+    facets=true ならファセットごとの件数を "facets" に入れる（offset ページングでは {casts, facets}）
+    """
+    logger.debug("【バックエンド API 受信】 offset: %s, cursor: %s, limit: %s, sort: %s, filters: %s", request.offset, request.cursor, request.limit, request.sort, request.filters)
 
     filters = request.filters or {}
 
@@ -47,6 +57,8 @@ def search_casts(
     if "prefecture_id" not in filters or not filters["prefecture_id"]:
         if user_prefecture:
             filters["prefecture_id"] = user_prefecture
-            print(f"【適用フィルター】 ユーザーの都道府県を適用: {filters['prefecture_id']}")
+            logger.debug("【適用フィルター】 ユーザーの都道府県を適用: %s", filters['prefecture_id'])
 
-    return fetch_cast_list(request.limit, request.offset, request.sort, filters, db)
+    if request.uses_cursor:
+        return fetch_cast_page(request.limit, request.cursor, request.sort, filters, db, facets=request.facets)
+    return fetch_cast_list(request.limit, request.offset, request.sort, filters, db, facets=request.facets)
@@ -5,15 +5,106 @@ from sqlalchemy.future import select
 from app.db.models.cast_common_prof import CastCommonProf
 from app.db.models.media_files import MediaFile  # ✅ メディアファイルのモデルをインポート
 from app.db.models.prefectures import Prefecture
+from app.db.models.cast_traits import CastTrait
+from app.db.models.cast_servicetype import CastServiceType
+from sqlalchemy import and_, or_, case, func, true, exists
+from fastapi import HTTPException
+from app.db.bitset import split_bitset
+import logging
 
-def get_casts(limit: int, offset: int, sort: str, filters: dict, db: Session):
-    print(f"【リポジトリ】 offset: {offset}, limit: {limit}, sort: {sort}, filters: {filters}")
+logger = logging.getLogger(__name__)
 
+# 並べ替え条件（キー: (並べ替えるカラム, 降順か)）
+# 同じ値の並びを固定するため、どの並べ替えでも最後に cast_id の昇順を付ける
+sort_options = {
+    "age_desc": (CastCommonProf.age, True),
+    "age_asc": (CastCommonProf.age, False),
+    "fee_desc": (CastCommonProf.reservation_fee, True),
+    "fee_asc": (CastCommonProf.reservation_fee, False),
+    "rating_desc": (CastCommonProf.rating, True),
+    "rating_asc": (CastCommonProf.rating, False),
+    "popularity_desc": (CastCommonProf.popularity, True),
+    "popularity_asc": (CastCommonProf.popularity, False),
+    "available_soon": (CastCommonProf.available_at, True),
+}
+
+
+# ファセットの区分（(最小, 最大)、最大が None は上限なし）
+FACET_RANGES = {
+    "age": ((18, 19), (20, 24), (25, 29), (30, 34), (35, 39), (40, None)),
+    "reservation_fee": ((0, 0), (1, 2000), (2001, 5000), (5001, 10000), (10001, None)),
+}
+CAST_TYPES = ("A", "B", "AB")
+
+
+# 特徴・サービスタイプの絞り込み（種類名, IDリストのキー, 一致条件のキー, ビット列のカラム名）
+# 一致条件は "all"（すべて持つ、既定）か "any"（いずれかを持つ）
+BITSET_FILTERS = (
+    ("traits", "trait_ids", "trait_match", "trait_bits"),
+    ("servicetypes", "servicetype_ids", "servicetype_match", "servicetype_bits"),
+)
+
+# ビット列で表せないID（65以上）を判定する結合テーブル（キー: ビット列のカラム名、値: (cast_id, ID) のカラム）
+BITSET_JOIN_COLUMNS = {
+    "trait_bits": (CastTrait.cast_id, CastTrait.trait_id),
+    "servicetype_bits": (CastServiceType.cast_id, CastServiceType.servicetype_id),
+}
+
+
+def bitset_filter(filters: dict, ids_key: str, match_key: str):
+    """
+    (ビットマスク, ビット列で表せないIDのリスト, すべて一致か) を返す（IDの指定がなければNone）
+    """
+    ids = filters.get(ids_key)
+    if not ids:
+        return None
+    match = str(filters.get(match_key) or "all").lower()
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail=f"{match_key} は all か any を指定してください")
+    try:
+        mask, overflow = split_bitset(int(item_id) for item_id in (ids if isinstance(ids, list) else [ids]))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"{ids_key} に検索できないIDが含まれています")
+    return mask, overflow, match == "all"
+
+
+def needs_join_filter(filters: dict) -> bool:
+    """
+    ビット列で表せないIDの絞り込みがあるか（結合テーブルが必要なため、インデックスではなくMySQLで検索する）
+    """
+    for _, ids_key, match_key, _ in BITSET_FILTERS:
+        parsed = bitset_filter(filters, ids_key, match_key)
+        if parsed is not None and parsed[1]:
+            return True
+    return False
+
+
+def keyset_condition(column, descending: bool, value, cast_id: int):
+    """
+    (value, cast_id) の行より後ろに並ぶ行の条件
+
+    MySQLではNULLは昇順で先頭・降順で末尾に並ぶため、それに合わせて比較する
+    """
+    after_in_tie = CastCommonProf.cast_id > cast_id
+    if value is None:
+        tie = and_(column.is_(None), after_in_tie)
+        return tie if descending else or_(tie, column.isnot(None))
+    beyond = column < value if descending else column > value
+    condition = or_(beyond, and_(column == value, after_in_tie))
+    return or_(condition, column.is_(None)) if descending else condition
+
+
+def select_casts(*extra_columns, media=None):
+    """
+    キャスト一覧のSELECT（都道府県名・プロフィール画像を結合済み、絞り込みなし）
+
+    media にはプロフィール画像として結合する MediaFile の別名を渡せる（追加カラムで参照する場合）
+    """
     PrefectureAlias1 = aliased(Prefecture)
     PrefectureAlias2 = aliased(Prefecture)
-    MediaAlias = aliased(MediaFile)
+    MediaAlias = media if media is not None else aliased(MediaFile)
 
-    stmt = (
+    return (
         select(
             CastCommonProf.cast_id,
             CastCommonProf.name,
@@ -34,6 +125,7 @@ def get_casts(limit: int, offset: int, sort: str, filters: dict, db: Session):
             CastCommonProf.popularity,
             CastCommonProf.available_at,
             MediaAlias.file_url.label("profile_image_url"),
+            *extra_columns,
         )
         .outerjoin(PrefectureAlias1, PrefectureAlias1.id == CastCommonProf.birthplace)
         .outerjoin(PrefectureAlias2, PrefectureAlias2.id == CastCommonProf.support_area)
@@ -43,90 +135,207 @@ def get_casts(limit: int, offset: int, sort: str, filters: dict, db: Session):
             (MediaAlias.target_type == "profile_common") &
             (MediaAlias.order_index == 0)
         )
-        .where(CastCommonProf.is_active == 1)
     )
 
+
+def cast_row_to_dict(row) -> dict:
+    """
+    検索結果1行をレスポンス用のdictにする
+    """
+    return {
+        "cast_id": row.cast_id,
+        "name": row.name,
+        "age": row.age if row.age is not None else None,
+        "height": row.height if row.height is not None else None,
+        "bust": row.bust if row.bust is not None else None,
+        "waist": row.waist if row.waist is not None else None,
+        "hip": row.hip if row.hip is not None else None,
+        "cup": row.cup if row.cup is not None else None,
+        "birthplace": row.birthplace_name if row.birthplace_name is not None else None,
+        "support_area": row.support_area_name if row.support_area_name is not None else None,
+        "blood_type": row.blood_type if row.blood_type is not None else None,
+        "hobby": row.hobby if row.hobby is not None else None,
+        "job": row.job if row.job is not None else None,
+        "reservation_fee": row.reservation_fee if row.reservation_fee is not None else 0,
+        "rating": row.rating if row.rating is not None else 0.0,
+        "self_introduction": row.self_introduction if row.self_introduction is not None else "",
+        "popularity": row.popularity if row.popularity is not None else 0,
+        "available_at": row.available_at if row.available_at is not None else None,
+        "profile_image_url": row.profile_image_url if row.profile_image_url else "/default-avatar.png",
+    }
+
+
+def get_cast_index_rows(db: Session, updated_since=None):
+    """
+    検索インデックス用のキャスト行（絞り込み・並べ替えに使う生の値と更新日時つき）
+
+    updated_since を渡すと、その日時以降にプロフィールかプロフィール画像が更新されたキャストを
+    非公開になったものも含めて返す（差分更新用）。省略時は公開中のキャストすべて
+    """
+    media = aliased(MediaFile)
+    stmt = select_casts(
+        CastCommonProf.is_active,
+        CastCommonProf.support_area,
+        CastCommonProf.cast_type,
+        CastCommonProf.trait_bits,
+        CastCommonProf.servicetype_bits,
+        CastCommonProf.updated_at,
+        media.updated_at.label("image_updated_at"),
+        media=media,
+    )
+    if updated_since is None:
+        stmt = stmt.where(CastCommonProf.is_active == 1)
+    else:
+        stmt = stmt.where(or_(
+            CastCommonProf.updated_at >= updated_since,
+            media.updated_at >= updated_since,
+        ))
+    return db.execute(stmt).all()
+
+
+def filter_conditions(filters: dict) -> dict:
+    """
+    フィルターごとの条件（キー: 絞り込みの種類）
+
+    ファセット集計で「自身の絞り込みを除いた件数」を出せるよう、種類ごとに分けて返す
+    """
+    conditions = {}
+
     # ✅ `age` フィルターを適用
     # ✅ `min_age` / `max_age` に対応
     if "min_age" in filters and "max_age" in filters:
         min_age, max_age = filters["min_age"], filters["max_age"]
-        stmt = stmt.where(CastCommonProf.age.between(min_age, max_age))
-        print(f"【適用フィルター】 年齢: {min_age} ～ {max_age}")
+        conditions["age"] = CastCommonProf.age.between(min_age, max_age)
+        logger.debug("【適用フィルター】 年齢: %s ～ %s", min_age, max_age)
             
     # ✅ 身長フィルター（追加）
     if "min_height" in filters and "max_height" in filters:
         min_height, max_height = filters["min_height"], filters["max_height"]
-        stmt = stmt.where(CastCommonProf.height.between(min_height, max_height))
-        print(f"【適用フィルター】 身長: {min_height} ～ {max_height}")
+        conditions["height"] = CastCommonProf.height.between(min_height, max_height)
+        logger.debug("【適用フィルター】 身長: %s ～ %s", min_height, max_height)
 
     # ✅ 指名料フィルター（追加）
     if "min_reservation_fee" in filters and "max_reservation_fee" in filters:
         min_fee, max_fee = filters["min_reservation_fee"], filters["max_reservation_fee"]
-        stmt = stmt.where(CastCommonProf.reservation_fee.between(min_fee, max_fee))
-        print(f"【適用フィルター】 指名料: {min_fee} ～ {max_fee}")
+        conditions["reservation_fee"] = CastCommonProf.reservation_fee.between(min_fee, max_fee)
+        logger.debug("【適用フィルター】 指名料: %s ～ %s", min_fee, max_fee)
         
     # ✅ "今すぐOK" フィルター
     if "available_soon" in filters and filters["available_soon"]:
-        stmt = stmt.where(CastCommonProf.available_at.isnot(None))  # `available_at` が NULL でない
-        print("【適用フィルター】 今すぐOK（available_at IS NOT NULL）")
+        conditions["available_soon"] = CastCommonProf.available_at.isnot(None)  # `available_at` が NULL でない
+        logger.debug("【適用フィルター】 今すぐOK（available_at IS NOT NULL）")
             
     # ✅ 都道府県フィルター（support_area に適用）
     if "prefecture_id" in filters:
-        stmt = stmt.where(CastCommonProf.support_area == filters["prefecture_id"])
-        print(f"【適用フィルター】 エリア（support_area）: {filters['prefecture_id']}")
+        conditions["prefecture"] = CastCommonProf.support_area == filters["prefecture_id"]
+        logger.debug("【適用フィルター】 エリア（support_area）: %s", filters['prefecture_id'])
 
     # ✅ キャストタイプフィルター
     if "cast_type" in filters:
-        stmt = stmt.where(CastCommonProf.cast_type == filters["cast_type"])
-        print(f"【適用フィルター】 キャストタイプ: {filters['cast_type']}")
-
-    # 並べ替え条件
-    sort_options = {
-        "age_desc": CastCommonProf.age.desc(),
-        "age_asc": CastCommonProf.age.asc(),
-        "fee_desc": CastCommonProf.reservation_fee.desc(),
-        "fee_asc": CastCommonProf.reservation_fee.asc(),
-        "rating_desc": CastCommonProf.rating.desc(),
-        "rating_asc": CastCommonProf.rating.asc(),
-        "popularity_desc": CastCommonProf.popularity.desc(),
-        "popularity_asc": CastCommonProf.popularity.asc(),
-        "available_soon": CastCommonProf.available_at.desc(),
-    }
+        conditions["cast_type"] = CastCommonProf.cast_type == filters["cast_type"]
+        logger.debug("【適用フィルター】 キャストタイプ: %s", filters['cast_type'])
+
+    # ✅ 特徴・サービスタイプフィルター（ビット列の論理積で判定し、65以上のIDだけ結合テーブルの EXISTS で判定する）
+    for group, ids_key, match_key, column_name in BITSET_FILTERS:
+        parsed = bitset_filter(filters, ids_key, match_key)
+        if parsed is None:
+            continue
+        mask, overflow, match_all = parsed
+        masked = getattr(CastCommonProf, column_name).op("&")(mask)
+        cast_column, id_column = BITSET_JOIN_COLUMNS[column_name]
+        if match_all:
+            conditions[group] = and_(
+                masked == mask,
+                *(exists().where(cast_column == CastCommonProf.cast_id, id_column == item_id) for item_id in overflow),
+            )
+        elif overflow:
+            conditions[group] = or_(masked != 0, exists().where(cast_column == CastCommonProf.cast_id, id_column.in_(overflow)))
+        else:
+            conditions[group] = masked != 0
+        logger.debug("【適用フィルター】 %s: %s（%s）", ids_key, filters[ids_key], "すべて" if match_all else "いずれか")
+
+    return conditions
+
+
+def get_casts(limit: int, offset: int, sort: str, filters: dict, db: Session, after: tuple = None):
+    """
+    キャスト一覧を取得
+
+    after=(並べ替えキーの値, cast_id) を渡すと、その行より後ろから取得する（カーソルページング）
+    """
+    logger.debug("【リポジトリ】 offset: %s, limit: %s, sort: %s, filters: %s, after: %s", offset, limit, sort, filters, after)
+
+    stmt = (
+        select_casts((sort_options[sort][0] if sort in sort_options else CastCommonProf.cast_id).label("sort_key"))
+        .where(CastCommonProf.is_active == 1)
+    )
+
+    for condition in filter_conditions(filters).values():
+        stmt = stmt.where(condition)
 
+    # 並べ替え（同順位は cast_id で固定）
     if sort in sort_options:
-        stmt = stmt.order_by(sort_options[sort])
+        column, descending = sort_options[sort]
+        stmt = stmt.order_by(column.desc() if descending else column.asc(), CastCommonProf.cast_id)
     else:
+        column, descending = None, False
         stmt = stmt.order_by(CastCommonProf.cast_id)
 
-    stmt = stmt.limit(limit).offset(offset)
+    # ✅ カーソル指定時は前ページの最後の行より後ろから取得（OFFSETで読み飛ばさない）
+    if after is not None:
+        value, cast_id = after
+        if column is None:
+            stmt = stmt.where(CastCommonProf.cast_id > cast_id)
+        else:
+            stmt = stmt.where(keyset_condition(column, descending, value, cast_id))
+
+    stmt = stmt.limit(limit)
+    if offset:
+        stmt = stmt.offset(offset)
     result = db.execute(stmt).all()
 
     # ✅ 返り値のデータを構造化
-    casts = [
-        {
-            "cast_id": row.cast_id,
-            "name": row.name,
-            "age": row.age if row.age is not None else None,
-            "height": row.height if row.height is not None else None,
-            "bust": row.bust if row.bust is not None else None,
-            "waist": row.waist if row.waist is not None else None,
-            "hip": row.hip if row.hip is not None else None,
-            "cup": row.cup if row.cup is not None else None,
-            "birthplace": row.birthplace_name if row.birthplace_name is not None else None,
-            "support_area": row.support_area_name if row.support_area_name is not None else None,
-            "blood_type": row.blood_type if row.blood_type is not None else None,
-            "hobby": row.hobby if row.hobby is not None else None,
-            "job": row.job if row.job is not None else None,
-            "reservation_fee": row.reservation_fee if row.reservation_fee is not None else 0,
-            "rating": row.rating if row.rating is not None else 0.0,
-            "self_introduction": row.self_introduction if row.self_introduction is not None else "",
-            "popularity": row.popularity if row.popularity is not None else 0,
-            "available_at": row.available_at if row.available_at is not None else None,
-            "profile_image_url": row.profile_image_url if row.profile_image_url else "/default-avatar.png",
-        }
-        for row in result
-    ]
-
-    print(f"【リポジトリ戻り値】 {casts}")
+    casts = [{**cast_row_to_dict(row), "sort_key": row.sort_key} for row in result]
+
+    logger.debug("【リポジトリ戻り値】 %s", casts)
 
     return casts
+
+
+def get_cast_facets(filters: dict, db: Session) -> dict:
+    """
+    ファセットごとの件数を1回の集計クエリで取得
+
+    各ファセットは自身の絞り込みを除いた条件で数える（選択中の区分を変えたときの件数がわかる）
+    """
+    conditions = filter_conditions(filters)
+
+    def matching(excluded: str = None, *extra):
+        return and_(true(), *[c for group, c in conditions.items() if group != excluded], *extra)
+
+    def count(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    columns = [count(matching()).label("total")]
+    for name, buckets in FACET_RANGES.items():
+        column = getattr(CastCommonProf, name)
+        for i, (low, high) in enumerate(buckets):
+            bucket = column >= low if high is None else column.between(low, high)
+            columns.append(count(matching(name, bucket)).label(f"{name}_{i}"))
+    for cast_type in CAST_TYPES:
+        columns.append(count(matching("cast_type", CastCommonProf.cast_type == cast_type)).label(f"cast_type_{cast_type}"))
+    columns.append(count(matching("available_soon", CastCommonProf.available_at.isnot(None))).label("available_soon"))
+
+    row = db.execute(select(*columns).where(CastCommonProf.is_active == 1)).one()._mapping
+    return {
+        "total": int(row["total"]),
+        **{
+            name: [
+                {"min": low, "max": high, "count": int(row[f"{name}_{i}"])}
+                for i, (low, high) in enumerate(buckets)
+            ]
+            for name, buckets in FACET_RANGES.items()
+        },
+        "cast_type": {cast_type: int(row[f"cast_type_{cast_type}"]) for cast_type in CAST_TYPES},
+        "available_soon": int(row["available_soon"]),
+    }
@@ -3,6 +3,14 @@ from typing import Optional, Dict, Any
 
 class SearchRequest(BaseModel):
     limit: int
-    offset: int
+    offset: int = 0  # ✅ 旧クライアント用（cursor を送る場合は不要）
     sort: Optional[str] = "age_desc"
     filters: Optional[Dict[str, Any]] = {} 
+    # ✅ カーソルページング（項目を送ると {casts, next_cursor, has_more} で返す。1ページ目は null）
+    cursor: Optional[str] = None
+    # ✅ ファセット（年齢・指名料の区分、キャストタイプ、今すぐOKごとの件数）も返す
+    facets: bool = False
+
+    @property
+    def uses_cursor(self) -> bool:
+        return "cursor" in self.__fields_set__
@@ -0,0 +1,335 @@
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import CAST_SEARCH_INDEX_REFRESH_INTERVAL, CAST_SEARCH_INDEX_FULL_REFRESH_INTERVAL
+from app.features.customer.search.repositories.search_repository import (
+    get_cast_index_rows,
+    cast_row_to_dict,
+    sort_options,
+    FACET_RANGES,
+    CAST_TYPES,
+    BITSET_FILTERS,
+    bitset_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+# 絞り込み・並べ替えに使う数値カラム（NULLはNaN、日時はエポック秒）
+NUMERIC_COLUMNS = ("age", "height", "reservation_fee", "rating", "popularity", "support_area", "available_at")
+
+# 並べ替え条件（キー: (カラム名, 降順か)）
+SORT_COLUMNS = {name: (column.key, descending) for name, (column, descending) in sort_options.items()}
+
+# 範囲フィルター（filters のキー → カラム名。絞り込みの種類名もカラム名と同じ）
+RANGE_FILTERS = (
+    ("min_age", "max_age", "age"),
+    ("min_height", "max_height", "height"),
+    ("min_reservation_fee", "max_reservation_fee", "reservation_fee"),
+)
+
+# 差分更新で読み直す重なり（長いトランザクションやレプリカ遅延で updated_at が前後しても取りこぼさない）
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+# インデックスの版（作り直すたびに増える。検索結果キャッシュのキーに使う）
+_versions = itertools.count(1)
+
+
+def to_number(value) -> float:
+    """
+    カラムの値を比較用の数値にする（NULL・数値にできない値はNaN）
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CastSearchIndex:
+    """
+    公開中のキャストを列ごとのNumPy配列で保持する検索インデックス
+
+    絞り込みはベクトル化したマスク、並べ替えは lexsort で行い、MySQLには問い合わせない
+    更新時は作り直して参照を差し替える（インスタンス自体は変更しない）
+    """
+
+    def __init__(self, records: dict, watermark: datetime = None):
+        # cast_id → {"cast": レスポンス用dict, "raw": 絞り込み・並べ替え用の生の値}
+        self.records = records
+        self.watermark = watermark
+        self.version = next(_versions)
+
+        ordered = [records[cast_id] for cast_id in sorted(records)]
+        self.casts = [record["cast"] for record in ordered]
+        self.raws = [record["raw"] for record in ordered]
+        self.cast_id = np.array([cast["cast_id"] for cast in self.casts], dtype=np.int64)
+        self.columns = {
+            name: np.array([to_number(raw[name]) for raw in self.raws], dtype=np.float64)
+            for name in NUMERIC_COLUMNS
+        }
+        self.cast_type = np.array([raw["cast_type"] or "" for raw in self.raws], dtype="<U2")
+        # 特徴・サービスタイプのビット列（app/db/bitset.py）
+        self.bitsets = {
+            column_name: np.array([raw[column_name] or 0 for raw in self.raws], dtype=np.uint64)
+            for _, _, _, column_name in BITSET_FILTERS
+        }
+
+    @staticmethod
+    def record_for(row) -> dict:
+        return {
+            "cast": cast_row_to_dict(row),
+            "raw": {
+                "age": row.age,
+                "height": row.height,
+                "reservation_fee": row.reservation_fee,
+                "rating": row.rating,
+                "popularity": row.popularity,
+                "support_area": row.support_area,
+                "cast_type": row.cast_type,
+                "available_at": row.available_at,
+                "trait_bits": row.trait_bits,
+                "servicetype_bits": row.servicetype_bits,
+            },
+        }
+
+    @classmethod
+    def build(cls, rows: list) -> "CastSearchIndex":
+        """
+        公開中のキャスト全件から構築
+        """
+        records = {row.cast_id: cls.record_for(row) for row in rows}
+        return cls(records, watermark=_latest_update(rows))
+
+    def updated(self, rows: list) -> "CastSearchIndex":
+        """
+        更新されたキャストの行を反映したインデックス（変化がなければ自身を返す）
+        """
+        records = dict(self.records)
+        changed = False
+        for row in rows:
+            if row.is_active == 1:
+                record = self.record_for(row)
+                if records.get(row.cast_id) != record:
+                    records[row.cast_id] = record
+                    changed = True
+            elif records.pop(row.cast_id, None) is not None:
+                changed = True
+
+        if not changed:
+            return self
+        return CastSearchIndex(records, watermark=max(filter(None, (self.watermark, _latest_update(rows)))))
+
+    def __len__(self) -> int:
+        return len(self.casts)
+
+    def filter_masks(self, filters: dict) -> dict:
+        """
+        get_casts と同じ条件の絞り込み（search_repository.filter_conditions と同じく種類ごとのマスク）
+        NaNとの比較は常にFalseなので、範囲指定でNULLは除外される
+        """
+        masks = {}
+
+        for min_key, max_key, name in RANGE_FILTERS:
+            if min_key in filters and max_key in filters:
+                values = self.columns[name]
+                masks[name] = (values >= to_number(filters[min_key])) & (values <= to_number(filters[max_key]))
+
+        if filters.get("available_soon"):
+            masks["available_soon"] = ~np.isnan(self.columns["available_at"])
+
+        if "prefecture_id" in filters:
+            masks["prefecture"] = self._equals(self.columns["support_area"], filters["prefecture_id"])
+
+        if "cast_type" in filters:
+            value = filters["cast_type"]
+            masks["cast_type"] = self.cast_type == ("" if value is None else str(value))
+
+        for group, ids_key, match_key, column_name in BITSET_FILTERS:
+            parsed = bitset_filter(filters, ids_key, match_key)
+            if parsed is None:
+                continue
+            mask, overflow, match_all = parsed
+            if overflow:
+                # 65以上のIDは結合テーブルにしかない（search_service は needs_join_filter で get_casts を使う）
+                raise ValueError(f"{ids_key} のビット列で表せないIDはインデックスで絞り込めません: {overflow}")
+            masked = self.bitsets[column_name] & np.uint64(mask)
+            masks[group] = masked == np.uint64(mask) if match_all else masked != 0
+
+        return masks
+
+    def combined_mask(self, masks: dict, excluded: str = None) -> np.ndarray:
+        mask = np.ones(len(self.casts), dtype=bool)
+        for group, group_mask in masks.items():
+            if group != excluded:
+                mask &= group_mask
+        return mask
+
+    def filter_mask(self, filters: dict) -> np.ndarray:
+        return self.combined_mask(self.filter_masks(filters))
+
+    def facets(self, filters: dict) -> dict:
+        """
+        ファセットごとの件数（search_repository.get_cast_facets と同じ形。各ファセットは自身の絞り込みを除いて数える）
+        """
+        masks = self.filter_masks(filters)
+        result = {"total": int(self.combined_mask(masks).sum())}
+
+        for name, buckets in FACET_RANGES.items():
+            values = self.columns[name][self.combined_mask(masks, name)]
+            result[name] = [
+                {"min": low, "max": high, "count": int(np.count_nonzero((values >= low) & (values <= (np.inf if high is None else high))))}
+                for low, high in buckets
+            ]
+
+        cast_types = self.cast_type[self.combined_mask(masks, "cast_type")]
+        result["cast_type"] = {cast_type: int(np.count_nonzero(cast_types == cast_type)) for cast_type in CAST_TYPES}
+        available = self.columns["available_at"][self.combined_mask(masks, "available_soon")]
+        result["available_soon"] = int(np.count_nonzero(~np.isnan(available)))
+        return result
+
+    @staticmethod
+    def _equals(values: np.ndarray, value) -> np.ndarray:
+        if value is None:
+            return np.isnan(values)
+        return values == to_number(value)
+
+    def after_mask(self, sort: str, after: tuple) -> np.ndarray:
+        """
+        (並べ替えキーの値, cast_id) の行より後ろに並ぶ行（search_repository.keyset_condition と同じ条件）
+        """
+        value, cast_id = after
+        after_in_tie = self.cast_id > cast_id
+        if sort not in SORT_COLUMNS:
+            return after_in_tie
+
+        name, descending = SORT_COLUMNS[sort]
+        values = self.columns[name]
+        nulls = np.isnan(values)
+        value = to_number(value)
+        if np.isnan(value):
+            tie = nulls & after_in_tie
+            return tie if descending else tie | ~nulls
+        beyond = values < value if descending else values > value
+        condition = beyond | ((values == value) & after_in_tie)
+        return condition | nulls if descending else condition
+
+    def sort_order(self, sort: str, candidates: np.ndarray) -> np.ndarray:
+        """
+        候補行の並び順（MySQLと同じく、NULLは昇順で先頭・降順で末尾、同順位は cast_id の昇順）
+        """
+        ids = self.cast_id[candidates]
+        if sort not in SORT_COLUMNS:
+            return candidates[np.argsort(ids, kind="stable")]
+
+        name, descending = SORT_COLUMNS[sort]
+        values = self.columns[name][candidates]
+        nulls = np.isnan(values)
+        values = np.where(nulls, 0.0, values)
+        if descending:
+            keys = (ids, -values, nulls)
+        else:
+            keys = (ids, values, ~nulls)
+        return candidates[np.lexsort(keys)]
+
+    def sort_value(self, sort: str, i: int):
+        """
+        カーソルに入れる並べ替えキーの値（get_casts の sort_key と同じ生の値）
+        """
+        if sort not in SORT_COLUMNS:
+            return self.casts[i]["cast_id"]
+        return self.raws[i][SORT_COLUMNS[sort][0]]
+
+    def search(self, limit: int, offset: int, sort: str, filters: dict, after: tuple = None) -> list:
+        """
+        get_casts と同じ結果（sort_key つきのdictのリスト）を返す
+        """
+        mask = self.filter_mask(filters)
+        if after is not None:
+            mask &= self.after_mask(sort, after)
+
+        order = self.sort_order(sort, np.flatnonzero(mask))
+        page = order[offset:offset + limit]
+        return [{**self.casts[i], "sort_key": self.sort_value(sort, i)} for i in page]
+
+
+def _latest_update(rows: list):
+    """
+    行のプロフィール・プロフィール画像の更新日時のうち最新のもの
+    """
+    return max(
+        (value for row in rows for value in (row.updated_at, row.image_updated_at) if value is not None),
+        default=None,
+    )
+
+
+# プロセス全体で共有するインデックス（差し替えは参照の置き換えのみ）
+_cast_index = None
+_cast_index_lock = threading.Lock()
+_checked_at = 0.0
+_built_at = 0.0
+
+
+def refresh_cast_index(db: Session, full: bool = False) -> CastSearchIndex:
+    """
+    インデックスを更新する（通常は updated_at による差分、full=True で全件再構築）
+
+    差分では削除されたプロフィール画像を検出できないため、定期的に全件再構築する
+    """
+    global _cast_index, _checked_at, _built_at
+    index = _cast_index
+    started = time.perf_counter()
+
+    if full or index is None or index.watermark is None:
+        index = CastSearchIndex.build(get_cast_index_rows(db))
+        _built_at = time.monotonic()
+        logger.info("キャスト検索インデックスを構築しました: %s件 (%.1fms)", len(index), (time.perf_counter() - started) * 1000)
+    else:
+        rows = get_cast_index_rows(db, updated_since=index.watermark - REFRESH_OVERLAP)
+        updated = index.updated(rows)
+        if updated is not index:
+            logger.info("キャスト検索インデックスを差分更新しました: %s件 → %s件", len(index), len(updated))
+        index = updated
+
+    _cast_index = index
+    _checked_at = time.monotonic()
+    return index
+
+
+def get_cast_index(db: Session) -> CastSearchIndex:
+    """
+    キャスト検索インデックスを取得（初回は構築、一定間隔で差分更新）
+
+    更新中は他のリクエストを待たせず、更新前のインデックスで検索する
+    """
+    index = _cast_index
+    if index is None:
+        with _cast_index_lock:
+            if _cast_index is None:
+                refresh_cast_index(db, full=True)
+            return _cast_index
+
+    now = time.monotonic()
+    if now - _checked_at >= CAST_SEARCH_INDEX_REFRESH_INTERVAL and _cast_index_lock.acquire(blocking=False):
+        try:
+            refresh_cast_index(db, full=now - _built_at >= CAST_SEARCH_INDEX_FULL_REFRESH_INTERVAL)
+        except Exception:
+            logger.exception("キャスト検索インデックスの更新に失敗しました（更新前のインデックスで検索します）")
+        finally:
+            _cast_index_lock.release()
+        index = _cast_index
+    return index
+
+
+def request_cast_index_refresh():
+    """
+    次の検索で差分更新する（このワーカーでキャストを更新したとき、更新間隔を待たずに反映する）
+    """
+    global _checked_at
+    _checked_at = 0.0
@@ -0,0 +1,211 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import SEARCH_CACHE_TTL, SEARCH_CACHE_MAX_ENTRIES
+from app.db.models.cast_common_prof import CastCommonProf
+from app.db.models.media_files import MediaFile
+from app.features.customer.search.repositories.search_repository import sort_options, BITSET_FILTERS
+from app.features.customer.search.service.cast_index import request_cast_index_refresh
+
+logger = logging.getLogger(__name__)
+
+# get_casts で両方そろったときだけ使われる範囲フィルター
+RANGE_FILTER_KEYS = (
+    ("min_age", "max_age"),
+    ("min_height", "max_height"),
+    ("min_reservation_fee", "max_reservation_fee"),
+)
+
+
+def _canonical_value(value):
+    # "13" と 13、20.0 と 20 は同じ条件（MySQLでは数値として比較される）
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_filters(filters: dict) -> dict:
+    """
+    検索結果が同じになるフィルターを同じ形にそろえる
+    （片方だけの範囲指定・False の available_soon は絞り込みに使われないため除く）
+    """
+    canonical = {key: _canonical_value(value) for key, value in filters.items()}
+    # 特徴・サービスタイプは順序・重複を問わない（指定がなければ一致条件も使われない）
+    for _, ids_key, match_key, _ in BITSET_FILTERS:
+        ids = canonical.get(ids_key)
+        if ids:
+            canonical[ids_key] = sorted({_canonical_value(i) for i in (ids if isinstance(ids, list) else [ids])}, key=str)
+            canonical[match_key] = str(canonical.get(match_key) or "all").lower()
+        else:
+            canonical.pop(ids_key, None)
+            canonical.pop(match_key, None)
+    for min_key, max_key in RANGE_FILTER_KEYS:
+        if min_key not in canonical or max_key not in canonical:
+            canonical.pop(min_key, None)
+            canonical.pop(max_key, None)
+    if not canonical.get("available_soon"):
+        canonical.pop("available_soon", None)
+    return canonical
+
+
+def search_cache_key(limit: int, sort: str, filters: dict, offset: int = None, cursor: str = None, version=None, facets: bool = False) -> str:
+    """
+    キャッシュキー（フィルター・並べ替え・ページ位置・件数・ファセットの有無。version は検索インデックスの版）
+    """
+    return json.dumps(
+        {
+            "filters": canonical_filters(filters),
+            "sort": sort if sort in sort_options else None,  # 未知の並べ替えはどれも cast_id 順
+            "page": ["cursor", cursor] if offset is None else ["offset", offset],
+            "limit": limit,
+            "version": version,
+            "facets": facets,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+class _Flight:
+    """
+    実行中の検索（同じキーの検索はこの結果を待つ）
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SearchResultCache:
+    """
+    検索結果のTTL・件数上限つきキャッシュ
+
+    同じキーの検索が同時に来た場合は1回だけ実行して結果を共有する（single-flight）
+    invalidate() 中に実行していた検索の結果は、古い可能性があるためキャッシュしない
+    """
+
+    def __init__(self, ttl: float = SEARCH_CACHE_TTL, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key → (期限, 結果)
+        self._flights = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key: str, compute):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if flight.error is None and generation == self._generation:
+                    self._store(key, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key: str, value):
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        # 期限切れ・上限超過を古い順に削除
+        while self._entries:
+            _, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+            }
+
+
+search_cache = SearchResultCache()
+
+# キャッシュ破棄の対象かを記録する Session.info のキー
+_DIRTY_KEY = "search_cache_dirty"
+
+
+def _affects_search(obj) -> bool:
+    if isinstance(obj, CastCommonProf):
+        return True
+    return isinstance(obj, MediaFile) and obj.target_type == "profile_common"
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    if any(_affects_search(obj) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    # query(...).update() / delete() などの一括更新（MediaFile は用途を判定できないため常に対象）
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in (CastCommonProf, MediaFile):
+            orm_execute_state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        search_cache.invalidate()
+        request_cast_index_refresh()
+        logger.debug("キャストの更新を検知したため検索結果キャッシュを破棄しました")
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -1,35 +1,150 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app.features.customer.search.repositories.search_repository import get_casts
-
-def fetch_cast_list(limit: int, offset: int, sort: str, filters: dict, db: Session):
-    print(f"【バックエンド API 受信】 offset: {offset}, limit: {limit}, sort: {sort}, filters: {filters}")  # ✅ 確認用ログ
-
-    # ✅ `filters` を `get_casts()` に渡す
-    casts = get_casts(limit, offset, sort, filters, db)
-
-    print(f"【取得データ】 {casts}")  # ✅ データ構造を確認
-
-    return [
-        {
-            "cast_id": cast["cast_id"] if isinstance(cast, dict) else cast[0],  
-            "name": cast["name"] if isinstance(cast, dict) else cast[1],
-            "age": cast["age"] if isinstance(cast, dict) else cast[2],
-            "profile_image_url": cast["profile_image_url"] if isinstance(cast, dict) else cast[3] if cast[3] else None,
-            "height": cast["height"] if isinstance(cast, dict) else cast[4] if len(cast) > 4 else None,
-            "bust": cast["bust"] if isinstance(cast, dict) else cast[5] if len(cast) > 5 else None,
-            "waist": cast["waist"] if isinstance(cast, dict) else cast[6] if len(cast) > 6 else None,
-            "hip": cast["hip"] if isinstance(cast, dict) else cast[7] if len(cast) > 7 else None,
-            "cup": cast["cup"] if isinstance(cast, dict) else cast[8] if len(cast) > 8 else None,
-            "birthplace": cast["birthplace"] if isinstance(cast, dict) else cast[9] if len(cast) > 9 else None,
-            "support_area": cast["support_area"] if isinstance(cast, dict) else cast[10] if len(cast) > 10 else None,
-            "blood_type": cast["blood_type"] if isinstance(cast, dict) else cast[11] if len(cast) > 11 else None,
-            "hobby": cast["hobby"] if isinstance(cast, dict) else cast[12] if len(cast) > 12 else None,
-            "job": cast["job"] if isinstance(cast, dict) else cast[13] if len(cast) > 13 else None,
-            "reservation_fee": cast["reservation_fee"] if isinstance(cast, dict) else cast[14] if len(cast) > 14 else None,
-            "rating": cast["rating"] if isinstance(cast, dict) else cast[15] if len(cast) > 15 else None,
-            "self_introduction": cast["self_introduction"] if isinstance(cast, dict) else cast[18] if len(cast) > 18 else None,
-            "popularity": cast["popularity"] if isinstance(cast, dict) else cast[16] if len(cast) > 16 else None,
-            "available_at": cast["available_at"] if isinstance(cast, dict) else cast[17] if len(cast) > 17 else None,
-        }
-        for cast in casts
-    ]
+from app.core.config import CAST_SEARCH_INDEX_ENABLED, SEARCH_CACHE_ENABLED
+from app.features.customer.search.repositories.search_repository import get_casts, get_cast_facets, sort_options, needs_join_filter
+from app.features.customer.search.service.cast_index import get_cast_index
+from app.features.customer.search.service.search_cache import search_cache, search_cache_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def use_cast_index(filters: dict) -> bool:
+    """
+    メモリ上のインデックスで検索できるか（ビット列で表せないIDの絞り込みは結合テーブルが必要なためMySQLで検索する）
+    """
+    return CAST_SEARCH_INDEX_ENABLED and not needs_join_filter(filters)
+
+
+def search_casts(limit: int, offset: int, sort: str, filters: dict, db: Session, after: tuple = None) -> list:
+    """
+    キャストを検索（メモリ上のインデックスが有効ならMySQLに問い合わせない）
+    """
+    if use_cast_index(filters):
+        return get_cast_index(db).search(limit, offset, sort, filters, after=after)
+    return get_casts(limit, offset, sort, filters, db, after=after)
+
+
+def search_facets(filters: dict, db: Session) -> dict:
+    """
+    ファセットごとの件数（インデックスなら1回の走査、なければ1回の集計クエリ）
+    """
+    if use_cast_index(filters):
+        return get_cast_index(db).facets(filters)
+    return get_cast_facets(filters, db)
+
+
+def cached(db: Session, compute, limit: int, sort: str, filters: dict, offset: int = None, cursor: str = None, facets: bool = False):
+    """
+    同じ条件の検索結果をキャッシュから返す（同時に来た同じ検索は1回だけ実行する）
+    """
+    if not SEARCH_CACHE_ENABLED:
+        return compute()
+    # ✅ インデックスが更新されたら別のキーになる（他ワーカーでの更新もインデックス経由で反映）
+    version = get_cast_index(db).version if CAST_SEARCH_INDEX_ENABLED else None
+    key = search_cache_key(limit, sort, filters, offset=offset, cursor=cursor, version=version, facets=facets)
+    return search_cache.get_or_compute(key, compute)
+
+
+def encode_cursor(sort: str, value, cast_id: int) -> str:
+    """
+    次ページの開始位置（並べ替えキーの値 + cast_id）を不透明な文字列にする
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort if sort in sort_options else None, "v": value, "id": cast_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """
+    カーソルを (並べ替えキーの値, cast_id) に戻す（並べ替えが変わっていれば400）
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_sort, value, cast_id = payload["s"], payload["v"], int(payload["id"])
+        if cursor_sort == "available_soon" and value is not None:
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="カーソルが不正です")
+
+    if cursor_sort != (sort if sort in sort_options else None):
+        raise HTTPException(status_code=400, detail="カーソルと並べ替え条件が一致しません")
+    return value, cast_id
+
+
+def fetch_cast_page(limit: int, cursor: str, sort: str, filters: dict, db: Session, facets: bool = False) -> dict:
+    """
+    カーソルページングでキャスト一覧を取得
+
+    limit+1件取得して次ページの有無を判定する（COUNTは実行しない）
+    facets=True ならファセットごとの件数も返す
+    """
+    logger.debug("【バックエンド API 受信】 cursor: %s, limit: %s, sort: %s, filters: %s", cursor, limit, sort, filters)
+    return cached(db, lambda: _fetch_cast_page(limit, cursor, sort, filters, db, facets), limit, sort, filters, cursor=cursor, facets=facets)
+
+
+def _fetch_cast_page(limit: int, cursor: str, sort: str, filters: dict, db: Session, facets: bool) -> dict:
+    after = decode_cursor(cursor, sort) if cursor else None
+    casts = search_casts(limit + 1, 0, sort, filters, db, after=after)
+
+    has_more = len(casts) > limit
+    casts = casts[:limit]
+    next_cursor = encode_cursor(sort, casts[-1]["sort_key"], casts[-1]["cast_id"]) if has_more and casts else None
+
+    page = {
+        "casts": [format_cast(cast) for cast in casts],
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+    if facets:
+        page["facets"] = search_facets(filters, db)
+    return page
+
+
+def fetch_cast_list(limit: int, offset: int, sort: str, filters: dict, db: Session, facets: bool = False):
+    """
+    offset ページングでキャスト一覧を取得（facets=True なら {casts, facets} で返す）
+    """
+    logger.debug("【バックエンド API 受信】 offset: %s, limit: %s, sort: %s, filters: %s", offset, limit, sort, filters)  # ✅ 確認用ログ
+    return cached(db, lambda: _fetch_cast_list(limit, offset, sort, filters, db, facets), limit, sort, filters, offset=offset, facets=facets)
+
+
+def _fetch_cast_list(limit: int, offset: int, sort: str, filters: dict, db: Session, facets: bool):
+    # ✅ `filters` を `search_casts()` に渡す
+    casts = search_casts(limit, offset, sort, filters, db)
+
+    logger.debug("【取得データ】 %s", casts)  # ✅ データ構造を確認
+
+    casts = [format_cast(cast) for cast in casts]
+    if facets:
+        return {"casts": casts, "facets": search_facets(filters, db)}
+    return casts
+
+
+def format_cast(cast) -> dict:
+    return {
+        "cast_id": cast["cast_id"] if isinstance(cast, dict) else cast[0],  
+        "name": cast["name"] if isinstance(cast, dict) else cast[1],
+        "age": cast["age"] if isinstance(cast, dict) else cast[2],
+        "profile_image_url": cast["profile_image_url"] if isinstance(cast, dict) else cast[3] if cast[3] else None,
+        "height": cast["height"] if isinstance(cast, dict) else cast[4] if len(cast) > 4 else None,
+        "bust": cast["bust"] if isinstance(cast, dict) else cast[5] if len(cast) > 5 else None,
+        "waist": cast["waist"] if isinstance(cast, dict) else cast[6] if len(cast) > 6 else None,
+        "hip": cast["hip"] if isinstance(cast, dict) else cast[7] if len(cast) > 7 else None,
+        "cup": cast["cup"] if isinstance(cast, dict) else cast[8] if len(cast) > 8 else None,
+        "birthplace": cast["birthplace"] if isinstance(cast, dict) else cast[9] if len(cast) > 9 else None,
+        "support_area": cast["support_area"] if isinstance(cast, dict) else cast[10] if len(cast) > 10 else None,
+        "blood_type": cast["blood_type"] if isinstance(cast, dict) else cast[11] if len(cast) > 11 else None,
+        "hobby": cast["hobby"] if isinstance(cast, dict) else cast[12] if len(cast) > 12 else None,
+        "job": cast["job"] if isinstance(cast, dict) else cast[13] if len(cast) > 13 else None,
+        "reservation_fee": cast["reservation_fee"] if isinstance(cast, dict) else cast[14] if len(cast) > 14 else None,
+        "rating": cast["rating"] if isinstance(cast, dict) else cast[15] if len(cast) > 15 else None,
+        "self_introduction": cast["self_introduction"] if isinstance(cast, dict) else cast[18] if len(cast) > 18 else None,
+        "popularity": cast["popularity"] if isinstance(cast, dict) else cast[16] if len(cast) > 16 else None,
+        "available_at": cast["available_at"] if isinstance(cast, dict) else cast[17] if len(cast) > 17 else None,
+    }
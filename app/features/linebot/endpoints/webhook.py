@@ -1,31 +1,35 @@
 import asyncio
-from fastapi import APIRouter, Request, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.features.linebot.services.user_info import fetch_user_info_by_line_id
-from app.features.linebot.services.faq_search import search_faq
-from app.features.linebot.services.line_client import send_line_reply
-from app.scripts.fetch_microcms_faq import fetch_and_embed_faq
-from fastapi import APIRouter, Query, HTTPException  # ✅ Query を追加
+from fastapi import APIRouter, Request, Query, HTTPException, Depends
 from fastapi.responses import StreamingResponse  # ✅ StreamingResponse を追加
-from app.features.linebot.services.user_info import fetch_user_info_by_line_id  # ✅ `user_info` を取得する関数をインポート
+from app.features.linebot.services.faq_index import reload_faq_index
+from app.features.linebot.services.faq_cache import get_answer_cache
+from app.features.linebot.services.event_worker import LineEventWorkerPool
+from app.features.linebot.services.message_handler import handle_text_message_event
+from app.features.linebot.services.event_dedup import create_event_deduplicator
+from app.features.linebot.services.openai_client import gateway as openai_gateway
+from app.core.security import get_admin_user
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter()
 
-# データベース依存関係を取得
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# 再送されたWebhookイベントの重複排除
+event_deduplicator = create_event_deduplicator()
+
+# Webhookイベントを処理するワーカープール（プロセス内で共有）
+# 処理に失敗したイベントは重複排除の記録を取り消し、再送されたら処理し直す
+event_pool = LineEventWorkerPool(handle_text_message_event, on_failure=event_deduplicator.forget)
 
 
 @router.post("/w")
-async def messaging_webhook(request: Request, db: Session = Depends(get_db)):
+async def messaging_webhook(request: Request):
     """
     LINE Webhook のエンドポイント
+
+    イベントは待ち行列に積むだけで即座に200を返し、FAQ検索・返信はワーカーで処理する
+    待ち行列が満杯で積めなかったイベントがあれば503を返し、LINEに再送させる
     """
     try:
         body_json = await request.json()
@@ -34,26 +38,46 @@ async def messaging_webhook(request: Request, db: Session = Depends(get_db)):
         if not events:
             raise HTTPException(status_code=400, detail="No events found in the request")
 
+        dropped = 0
         for event in events:
-            if event.get("type") == "message" and event["message"]["type"] == "text":
-                line_id = event["source"]["userId"]
-                reply_token = event["replyToken"]
-                user_message = event["message"]["text"]
+            if event.get("type") == "message" and event.get("message", {}).get("type") == "text":
+                line_id = event.get("source", {}).get("userId")
+                if not line_id or not event.get("replyToken"):
+                    logger.warning("⚠️ 不正なLINEイベント: %s", event)
+                    continue
 
-                # ✅ `user_info` を取得
-                user_info = fetch_user_info_by_line_id(db, line_id)
+                # ✅ 再送（処理済み）のイベントは何もしない
+                if not event_deduplicator.first_seen(event):
+                    continue
 
-                # ✅ `search_faq()` 内で `send_line_reply()` を呼ぶため、ここでは `reply` を返すだけ
-                search_faq(user_message, user_info, reply_token)
+                # ✅ ユーザーごとの順序を保ってワーカーへ
+                if not event_pool.submit(line_id, event):
+                    event_deduplicator.forget(event)  # 再送されたら受け付ける
+                    dropped += 1
+
+        if dropped:
+            raise HTTPException(status_code=503, detail="Event queue is full")
 
         return {"message": "Webhook received successfully"}
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        print(f"❌ Webhookエラー: {e}")
+        logger.error("❌ Webhookエラー: %s", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+
+@router.get("/metrics")
+def webhook_metrics(admin_id = Depends(get_admin_user)):
+    """
+    Webhookワーカーの待ち行列・処理時間、OpenAI API呼び出しの統計（管理者のみ）
+    """
+    return {
+        **event_pool.stats(),
+        **event_deduplicator.stats(),
+        "openai": openai_gateway.stats(),
+    }
+
     
 @router.api_route("/update-faq/", methods=["GET", "POST"])
 async def update_faq(pw: str = Query(None, alias="pw")):  # ✅ "pw" に変更
@@ -66,11 +90,30 @@ async def update_faq(pw: str = Query(None, alias="pw")):  # ✅ "pw" に変更
     if pw != AUTH_PASSWORD:  # ✅ "password" → "pw" に変更
         raise HTTPException(status_code=401, detail="Unauthorized: パスワードが違います")
 
+    # ✅ 取り込み処理（bs4を使うHTML除去など）はFAQ更新時にだけ読み込む
+    from app.scripts.fetch_microcms_faq import fetch_and_embed_faq
+
     # ② ストリーミングレスポンスで「更新中...」を表示
     async def event_generator():
         yield "data: FAQ更新を開始しました...\n\n"  # すぐに表示される
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, fetch_and_embed_faq)
+        progress_queue = asyncio.Queue()
+
+        # ✅ ワーカースレッドからの進捗をイベントループのキューへ渡す
+        def report_progress(message: str):
+            loop.call_soon_threadsafe(progress_queue.put_nowait, message)
+
+        task = loop.run_in_executor(None, fetch_and_embed_faq, report_progress)
+        while not (task.done() and progress_queue.empty()):
+            try:
+                message = await asyncio.wait_for(progress_queue.get(), timeout=0.5)
+                yield f"data: {message}\n\n"
+            except asyncio.TimeoutError:
+                continue
+        await task
+
+        await loop.run_in_executor(None, reload_faq_index)  # ✅ 新しいFAQインデックスに差し替え
+        get_answer_cache().clear()  # ✅ 古いFAQから生成した要約を破棄
         yield "data: FAQ更新が完了しました！\n\n"  # 更新終了メッセージ
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
\ No newline at end of file
@@ -0,0 +1,211 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from app.core.config import (
+    CONVERSATION_STORE,
+    CONVERSATION_STORE_PATH,
+    CONVERSATION_MAX_USERS,
+    CONVERSATION_MAX_TURNS,
+    CONVERSATION_TTL,
+)
+
+
+class ConversationStore(ABC):
+    """
+    ユーザーごとの会話履歴ストアのインターフェース
+
+    履歴は {"user": ...} / {"bot": ...} のリスト（古い順）
+    summary は履歴から外した古い発言の要約
+    """
+
+    @abstractmethod
+    def get(self, user_id) -> list:
+        ...
+
+    @abstractmethod
+    def append(self, user_id, turn: dict):
+        ...
+
+    @abstractmethod
+    def get_summary(self, user_id) -> str:
+        ...
+
+    @abstractmethod
+    def compact(self, user_id, summary: str, keep_last: int):
+        """
+        要約を保存し、履歴は直近keep_last件だけ残す
+        """
+
+    @abstractmethod
+    def clear(self, user_id):
+        ...
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    プロセス内の会話履歴（ユーザー数はLRU、会話はTTL、発言数は上限で制限）
+    """
+
+    def __init__(self, max_users: int = CONVERSATION_MAX_USERS, max_turns: int = CONVERSATION_MAX_TURNS, ttl: int = CONVERSATION_TTL):
+        self.max_users = max_users
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self._conversations = OrderedDict()  # user_id → (更新時刻, 履歴, 要約)
+        self._lock = threading.Lock()
+
+    def _entry(self, user_id, now: float):
+        entry = self._conversations.get(user_id)
+        if entry is None:
+            return None
+        if now - entry[0] > self.ttl:
+            del self._conversations[user_id]
+            return None
+        return entry
+
+    def _put(self, user_id, now: float, turns: list, summary: str):
+        self._conversations[user_id] = (now, turns, summary)
+        self._conversations.move_to_end(user_id)
+        while len(self._conversations) > self.max_users:
+            self._conversations.popitem(last=False)
+
+    def get(self, user_id) -> list:
+        with self._lock:
+            entry = self._entry(user_id, time.time())
+            return list(entry[1]) if entry else []
+
+    def append(self, user_id, turn: dict):
+        now = time.time()
+        with self._lock:
+            entry = self._entry(user_id, now)
+            turns, summary = (entry[1], entry[2]) if entry else ([], "")
+            turns.append(turn)
+            del turns[:-self.max_turns]
+            self._put(user_id, now, turns, summary)
+
+    def get_summary(self, user_id) -> str:
+        with self._lock:
+            entry = self._entry(user_id, time.time())
+            return entry[2] if entry else ""
+
+    def compact(self, user_id, summary: str, keep_last: int):
+        now = time.time()
+        with self._lock:
+            entry = self._entry(user_id, now)
+            turns = entry[1][-keep_last:] if entry and keep_last > 0 else []
+            self._put(user_id, now, turns, summary)
+
+    def clear(self, user_id):
+        with self._lock:
+            self._conversations.pop(user_id, None)
+
+
+class SqliteConversationStore(ConversationStore):
+    """
+    SQLiteファイルに保存する会話履歴（同一ホストの全ワーカーで共有・再起動後も保持）
+    """
+
+    def __init__(self, path: str = CONVERSATION_STORE_PATH, max_users: int = CONVERSATION_MAX_USERS, max_turns: int = CONVERSATION_MAX_TURNS, ttl: int = CONVERSATION_TTL):
+        self.max_users = max_users
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS conversations ("
+            " user_id TEXT PRIMARY KEY, turns TEXT NOT NULL, summary TEXT NOT NULL DEFAULT '', updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS conversations_updated_at ON conversations (updated_at)")
+
+        # 要約列がない既存ファイルには列を追加
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(conversations)")]
+        if "summary" not in columns:
+            self._conn.execute("ALTER TABLE conversations ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+
+    def get(self, user_id) -> list:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT turns FROM conversations WHERE user_id = ? AND updated_at > ?",
+                (str(user_id), time.time() - self.ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def append(self, user_id, turn: dict):
+        now = time.time()
+        with self._lock:
+            # ✅ 読み込み〜書き込みを1トランザクションで行い、他ワーカーの追記と競合させない
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT turns, summary FROM conversations WHERE user_id = ? AND updated_at > ?",
+                    (str(user_id), now - self.ttl),
+                ).fetchone()
+                turns, summary = (json.loads(row[0]), row[1]) if row else ([], "")
+                turns.append(turn)
+                del turns[:-self.max_turns]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO conversations (user_id, turns, summary, updated_at) VALUES (?, ?, ?, ?)",
+                    (str(user_id), json.dumps(turns, ensure_ascii=False), summary, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune(now)
+
+    def get_summary(self, user_id) -> str:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM conversations WHERE user_id = ? AND updated_at > ?",
+                (str(user_id), time.time() - self.ttl),
+            ).fetchone()
+        return row[0] if row else ""
+
+    def compact(self, user_id, summary: str, keep_last: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT turns FROM conversations WHERE user_id = ? AND updated_at > ?",
+                    (str(user_id), now - self.ttl),
+                ).fetchone()
+                turns = json.loads(row[0]) if row else []
+                turns = turns[-keep_last:] if keep_last > 0 else []
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO conversations (user_id, turns, summary, updated_at) VALUES (?, ?, ?, ?)",
+                    (str(user_id), json.dumps(turns, ensure_ascii=False), summary, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self, user_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM conversations WHERE user_id = ?", (str(user_id),))
+
+    def _prune(self, now: float):
+        self._conn.execute("DELETE FROM conversations WHERE updated_at <= ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM conversations WHERE user_id IN ("
+            " SELECT user_id FROM conversations ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_users,),
+        )
+
+
+def create_conversation_store() -> ConversationStore:
+    """
+    設定（CONVERSATION_STORE）に応じた会話履歴ストアを作成
+    """
+    if CONVERSATION_STORE == "sqlite":
+        return SqliteConversationStore()
+    return InMemoryConversationStore()
@@ -0,0 +1,74 @@
+import threading
+import time
+from app.core.config import LINEBOT_REPLY_DEADLINE, LINEBOT_INTERIM_MESSAGE, LINEBOT_FAILURE_MESSAGE
+from app.features.linebot.services.line_client import send_line_reply
+from app.features.notifications.line import send_line_message
+
+
+class DeadlineReplier:
+    """
+    返信期限つきの送信窓口
+
+    期限までに回答が用意できなければ reply_token で「確認中」を先に返信し、
+    回答はあとからプッシュAPIで送る（reply_token の失効で回答が失われないようにする）
+    プッシュはメッセージ通数に数えられるため、期限は reply_token の有効期間に近い値にする
+    """
+
+    def __init__(self, line_id: str, reply_token: str, received_at: float = None,
+                 deadline: float = LINEBOT_REPLY_DEADLINE, interim_message: str = LINEBOT_INTERIM_MESSAGE,
+                 failure_message: str = LINEBOT_FAILURE_MESSAGE):
+        self.line_id = line_id
+        self.reply_token = reply_token
+        self.interim_message = interim_message
+        self.failure_message = failure_message
+        self.interim_sent = False
+        self.sent = False
+        self.done = False
+        self._lock = threading.Lock()
+        self._timer = None
+
+        if deadline > 0:
+            # 受信時刻（time.monotonic）からの残り時間で期限を設定
+            elapsed = time.monotonic() - received_at if received_at is not None else 0
+            self._timer = threading.Timer(max(deadline - elapsed, 0), self._on_deadline)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_deadline(self):
+        # ✅ ロックを持ったまま送信し、「確認中」→回答 の順序を保証する
+        with self._lock:
+            if self.done:
+                return
+            send_line_reply(self.reply_token, self.interim_message)
+            self.interim_sent = True
+
+    def send(self, message: str, quick_reply: bool = False):
+        """
+        回答を送信（期限内なら返信、期限後ならプッシュ）
+        """
+        if self._timer:
+            self._timer.cancel()
+        with self._lock:
+            if self.done:
+                return
+            self.done = True
+            self.sent = True
+            if self.interim_sent:
+                send_line_message(self.line_id, message)
+            else:
+                send_line_reply(self.reply_token, message, quick_reply=quick_reply)
+
+    def close(self):
+        """
+        タイマーを止めて終了する
+
+        「確認中」だけを送って回答を送らなかった場合は、失敗した旨をプッシュで送る
+        """
+        if self._timer:
+            self._timer.cancel()
+        with self._lock:
+            if self.done:
+                return
+            self.done = True
+            if self.interim_sent:
+                send_line_message(self.line_id, self.failure_message)
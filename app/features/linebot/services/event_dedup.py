@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from app.core.config import (
+    EVENT_DEDUP_STORE,
+    EVENT_DEDUP_PATH,
+    EVENT_DEDUP_TTL,
+    EVENT_DEDUP_MAX_ENTRIES,
+)
+
+
+def event_key(event: dict):
+    """
+    Webhookイベントの識別キー（webhookEventId、なければメッセージID）
+    """
+    if event.get("webhookEventId"):
+        return f"event:{event['webhookEventId']}"
+    message_id = event.get("message", {}).get("id")
+    if message_id:
+        return f"message:{message_id}"
+    return None
+
+
+class EventDeduplicator(ABC):
+    """
+    処理済みWebhookイベントの集合（TTL・件数上限つき）
+    """
+
+    def __init__(self):
+        self.duplicates = 0
+
+    def first_seen(self, event: dict) -> bool:
+        """
+        初めて受信したイベントならTrue（同時に処理済みとして記録）
+        """
+        key = event_key(event)
+        if key is None:
+            return True
+        if self._add(key):
+            return True
+        self.duplicates += 1
+        return False
+
+    def forget(self, event: dict):
+        """
+        記録を取り消す（処理できずに破棄したイベントを、再送時に受け付けるため）
+        """
+        key = event_key(event)
+        if key is not None:
+            self._remove(key)
+
+    @abstractmethod
+    def _add(self, key: str) -> bool:
+        """
+        keyを記録する（有効な記録が既にあればFalse）
+        """
+
+    @abstractmethod
+    def _remove(self, key: str):
+        ...
+
+    def stats(self) -> dict:
+        return {"duplicates": self.duplicates}
+
+
+class InMemoryEventDeduplicator(EventDeduplicator):
+    """
+    プロセス内で保持する処理済みイベント
+    """
+
+    def __init__(self, ttl: int = EVENT_DEDUP_TTL, max_entries: int = EVENT_DEDUP_MAX_ENTRIES):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._seen = OrderedDict()  # key → 期限
+        self._lock = threading.Lock()
+
+    def _add(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            # 期限切れを古い順に削除
+            while self._seen:
+                _, expires_at = next(iter(self._seen.items()))
+                if expires_at > now and len(self._seen) < self.max_entries:
+                    break
+                self._seen.popitem(last=False)
+
+            if key in self._seen:
+                return False
+            self._seen[key] = now + self.ttl
+            return True
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._seen.pop(key, None)
+
+
+class SqliteEventDeduplicator(EventDeduplicator):
+    """
+    SQLiteファイルで共有する処理済みイベント（同一ホストの全ワーカー共通）
+    """
+
+    def __init__(self, path: str = EVENT_DEDUP_PATH, ttl: int = EVENT_DEDUP_TTL, max_entries: int = EVENT_DEDUP_MAX_ENTRIES):
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS webhook_events (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS webhook_events_expires_at ON webhook_events (expires_at)")
+
+    def _add(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            # ✅ 期限切れの行は上書きし、有効な行があれば挿入しない（1文で判定）
+            cursor = self._conn.execute(
+                "INSERT INTO webhook_events (key, expires_at) VALUES (?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at"
+                " WHERE webhook_events.expires_at <= ?",
+                (key, now + self.ttl, now),
+            )
+            added = cursor.rowcount == 1
+
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._conn.execute("DELETE FROM webhook_events WHERE expires_at <= ?", (now,))
+                self._conn.execute(
+                    "DELETE FROM webhook_events WHERE key IN ("
+                    " SELECT key FROM webhook_events ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            return added
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM webhook_events WHERE key = ?", (key,))
+
+
+def create_event_deduplicator() -> EventDeduplicator:
+    """
+    設定（EVENT_DEDUP_STORE）に応じた重複排除を作成
+    """
+    if EVENT_DEDUP_STORE == "sqlite":
+        return SqliteEventDeduplicator()
+    return InMemoryEventDeduplicator()
@@ -0,0 +1,131 @@
+import logging
+import queue
+import threading
+import time
+import zlib
+from app.core.config import LINEBOT_WORKER_COUNT, LINEBOT_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerMetrics:
+    """
+    キュー滞留・処理時間の集計
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.process_total = 0.0
+        self.process_max = 0.0
+
+    def record_enqueue(self, accepted: bool):
+        with self._lock:
+            if accepted:
+                self.enqueued += 1
+            else:
+                self.dropped += 1
+
+    def record_done(self, wait: float, elapsed: float, ok: bool):
+        with self._lock:
+            self.processed += 1
+            if not ok:
+                self.failed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.process_total += elapsed
+            self.process_max = max(self.process_max, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            processed = self.processed or 1
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "processed": self.processed,
+                "failed": self.failed,
+                "queue_wait_avg_ms": round(self.wait_total / processed * 1000, 2),
+                "queue_wait_max_ms": round(self.wait_max * 1000, 2),
+                "process_avg_ms": round(self.process_total / processed * 1000, 2),
+                "process_max_ms": round(self.process_max * 1000, 2),
+            }
+
+
+class LineEventWorkerPool:
+    """
+    LINE Webhookイベントを固定数のワーカースレッドで処理するプール
+
+    ユーザーIDでワーカーを振り分けるため、同じユーザーのイベントは受信順に処理される
+    handler は (event, 受信時刻[time.monotonic]) で呼ばれる
+    on_failure は handler が例外を送出したイベントで呼ばれる（重複排除の記録を取り消して再送を受け付けるため）
+    """
+
+    def __init__(self, handler, worker_count: int = LINEBOT_WORKER_COUNT, queue_size: int = LINEBOT_QUEUE_SIZE, on_failure=None):
+        self.handler = handler
+        self.on_failure = on_failure
+        self.worker_count = worker_count
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(worker_count)]
+        self.metrics = WorkerMetrics()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            for i, q in enumerate(self.queues):
+                thread = threading.Thread(target=self._run, args=(q,), name=f"linebot-worker-{i}", daemon=True)
+                thread.start()
+            self._started = True
+
+    def _shard(self, user_id: str) -> int:
+        return zlib.crc32((user_id or "").encode("utf-8")) % self.worker_count
+
+    def submit(self, user_id: str, event: dict) -> bool:
+        """
+        イベントを待ち行列に積む（満杯の場合はFalse）
+        """
+        self.start()
+        try:
+            self.queues[self._shard(user_id)].put_nowait((time.monotonic(), event))
+            accepted = True
+        except queue.Full:
+            logger.warning("LINEイベントの待ち行列が満杯のため破棄しました: user_id=%s", user_id)
+            accepted = False
+        self.metrics.record_enqueue(accepted)
+        return accepted
+
+    def _run(self, q: queue.Queue):
+        while True:
+            enqueued_at, event = q.get()
+            started_at = time.monotonic()
+            ok = True
+            try:
+                self.handler(event, enqueued_at)
+            except Exception as e:
+                ok = False
+                logger.exception("LINEイベント処理中にエラー: %s", e)
+                self._notify_failure(event)
+            finally:
+                self.metrics.record_done(started_at - enqueued_at, time.monotonic() - started_at, ok)
+                q.task_done()
+
+    def _notify_failure(self, event: dict):
+        if self.on_failure is None:
+            return
+        try:
+            self.on_failure(event)
+        except Exception as e:
+            logger.exception("LINEイベントの失敗処理中にエラー: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.worker_count,
+            "queue_depth": [q.qsize() for q in self.queues],
+            **self.metrics.snapshot(),
+        }
@@ -0,0 +1,182 @@
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+from app.core.config import (
+    FAQ_CACHE_PATH,
+    FAQ_EMBEDDING_CACHE_SIZE,
+    FAQ_EMBEDDING_CACHE_TTL,
+    FAQ_ANSWER_CACHE_ENABLED,
+    FAQ_ANSWER_CACHE_SIZE,
+    FAQ_ANSWER_CACHE_TTL,
+)
+
+
+def normalize_message(text: str) -> str:
+    """
+    キャッシュキー用にメッセージを正規化（全角/半角・大文字小文字・空白の揺れを吸収）
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.lower().split())
+
+
+class SqliteTtlCache:
+    """
+    メモリ上のLRU + SQLiteファイルによるTTL付きキャッシュ
+
+    再起動後もSQLiteから復元でき、件数はmax_entriesで上限を設ける
+    """
+
+    def __init__(self, path: str, table: str, max_entries: int, ttl: int):
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._remember(key, value, expires_at)
+            return value
+
+    def set(self, key: str, value):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._remember(key, value, expires_at)
+
+            # ✅ 一定回数ごとに期限切れ・上限超過分をSQLiteから削除
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune(now)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def _remember(self, key: str, value, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self, now: float):
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f" SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+
+class QueryEmbeddingCache:
+    """
+    正規化したメッセージ → Embedding のキャッシュ
+    """
+
+    def __init__(self, store: SqliteTtlCache):
+        self.store = store
+
+    def get(self, message: str):
+        value = self.store.get(normalize_message(message))
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=np.float32)
+
+    def set(self, message: str, embedding):
+        self.store.set(normalize_message(message), np.asarray(embedding, dtype=np.float32).tobytes())
+
+
+class FaqAnswerCache:
+    """
+    (正規化した質問, 上位FAQの記事ID, 性別) → 生成済み回答 のキャッシュ
+
+    保存するのは利用者に依存しないプロンプト（質問とFAQ本文のみ）から生成した回答だけ
+    同じFAQに当たっても質問が違えば別の回答になる
+    """
+
+    def __init__(self, store: SqliteTtlCache, enabled: bool):
+        self.store = store
+        self.enabled = enabled
+
+    @staticmethod
+    def _key(message: str, article_ids: list, sex: str) -> str:
+        ids = ','.join(sorted(str(article_id) for article_id in article_ids))
+        return f"{sex}|{ids}|{normalize_message(message)}"
+
+    def get(self, message: str, article_ids: list, sex: str):
+        if not self.enabled or not article_ids:
+            return None
+        return self.store.get(self._key(message, article_ids, sex))
+
+    def set(self, message: str, article_ids: list, sex: str, answer: str):
+        if not self.enabled or not article_ids:
+            return
+        self.store.set(self._key(message, article_ids, sex), answer)
+
+    def clear(self):
+        self.store.clear()
+
+
+_embedding_cache = None
+_answer_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> QueryEmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = QueryEmbeddingCache(
+                    SqliteTtlCache(FAQ_CACHE_PATH, "query_embeddings", FAQ_EMBEDDING_CACHE_SIZE, FAQ_EMBEDDING_CACHE_TTL)
+                )
+    return _embedding_cache
+
+
+def get_answer_cache() -> FaqAnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        with _cache_lock:
+            if _answer_cache is None:
+                _answer_cache = FaqAnswerCache(
+                    SqliteTtlCache(FAQ_CACHE_PATH, "faq_answers", FAQ_ANSWER_CACHE_SIZE, FAQ_ANSWER_CACHE_TTL),
+                    enabled=FAQ_ANSWER_CACHE_ENABLED,
+                )
+    return _answer_cache
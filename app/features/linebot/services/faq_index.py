@@ -0,0 +1,154 @@
+import logging
+import threading
+import numpy as np
+from app.features.linebot.services.faq_store import load_faq_store, normalize_rows, faq_store_version, FAQ_VECTORS_PATH, FAQ_META_PATH
+from app.features.linebot.services.faq_lexical import LexicalIndex
+
+logger = logging.getLogger(__name__)
+
+# 性別指定なし（全員向け）のFAQ
+SEX_ALL = 'NULL'
+
+
+class FaqIndex:
+    """
+    FAQ埋め込みをL2正規化済みのfloat32行列として保持する検索インデックス
+    """
+
+    def __init__(self, faqs: list, embeddings: np.ndarray, normalized: bool = False):
+        self.faqs = faqs
+        # ✅ 保存済みの正規化ベクトル（memmap）はコピーせずそのまま使う
+        self.matrix = embeddings if normalized else normalize_rows(embeddings)
+
+        # ✅ 性別ごとの行マスクを事前計算（本人の性別 or 'NULL'）
+        sexes = np.array([faq.get('sex', SEX_ALL) for faq in faqs], dtype=object)
+        common_mask = sexes == SEX_ALL
+        self.sex_masks = {SEX_ALL: common_mask}
+        for sex in set(sexes.tolist()):
+            self.sex_masks[sex] = (sexes == sex) | common_mask
+
+        # ✅ 質問文の語彙インデックス（Embeddingを呼ばずに済む場合の一次検索用）
+        self.lexical = LexicalIndex([faq.get('question', '') for faq in faqs])
+
+    @classmethod
+    def load(cls, vectors_path: str = FAQ_VECTORS_PATH, meta_path: str = FAQ_META_PATH) -> "FaqIndex":
+        faqs, vectors = load_faq_store(vectors_path, meta_path)
+        return cls(faqs, vectors, normalized=True)
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def mask_for(self, sex: str) -> np.ndarray:
+        return self.sex_masks.get(sex, self.sex_masks[SEX_ALL])
+
+    def _top(self, scores: np.ndarray, candidates: np.ndarray, top_k: int) -> list:
+        """
+        候補の中からスコア上位top_k件を (faq, score) のリストで返す（スコアの高い順）
+        """
+        if candidates.size == 0:
+            return []
+        if candidates.size > top_k:
+            top = np.argpartition(scores[candidates], -top_k)[-top_k:]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(scores[candidates])[::-1]]
+        return [(self.faqs[i], float(scores[i])) for i in candidates]
+
+    def lexical_scores(self, message: str) -> np.ndarray:
+        return self.lexical.scores(message)
+
+    def lexical_search(self, message: str, sex: str, threshold: float, top_k: int = 5, lexical_scores: np.ndarray = None) -> list:
+        """
+        語彙スコアがthreshold以上のFAQを返す（FAQタイトルとほぼ同じ質問の検出用）
+        """
+        if len(self.faqs) == 0:
+            return []
+        scores = self.lexical_scores(message) if lexical_scores is None else lexical_scores
+        candidates = np.flatnonzero(self.mask_for(sex) & (scores >= threshold))
+        return self._top(scores, candidates, top_k)
+
+    def search(self, query_embedding, sex: str, threshold: float = 0.85, top_k: int = 5,
+               lexical_scores: np.ndarray = None, lexical_threshold: float = 1.0, lexical_weight: float = 0.0) -> list:
+        """
+        クエリ埋め込みとのコサイン類似度で上位top_k件のFAQを返す
+
+        lexical_scores を渡した場合は、コサイン類似度がthreshold超 または 語彙スコアが
+        lexical_threshold以上のFAQを候補とし、両スコアの加重和で順位付けする
+        戻り値は (faq, score) のリスト（スコアの高い順）
+        """
+        if len(self.faqs) == 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        # ✅ 行列×ベクトル1回で全FAQの類似度を計算
+        scores = self.matrix @ (query / norm)
+        hits = scores > threshold
+        if lexical_scores is not None:
+            hits |= lexical_scores >= lexical_threshold
+            scores = (1 - lexical_weight) * scores + lexical_weight * lexical_scores
+
+        candidates = np.flatnonzero(self.mask_for(sex) & hits)
+        return self._top(scores, candidates, top_k)
+
+
+# プロセス全体で共有するインデックス（差し替えは参照の置き換えのみ）
+_faq_index = None
+_faq_index_version = None  # 読み込んだときのFAQストアの版
+_faq_index_lock = threading.Lock()
+
+
+def _load_faq_index():
+    """
+    FAQストアを読み込んで差し替える（_faq_index_lock を持って呼ぶ）
+    """
+    global _faq_index, _faq_index_version
+    # ✅ 版は読み込みの前に取る（読み込み中に保存されても次回また読み直す）
+    version = faq_store_version()
+    index = FaqIndex.load()
+    _faq_index, _faq_index_version = index, version
+    return index
+
+
+def get_faq_index() -> FaqIndex:
+    """
+    FAQインデックスを取得（初回はファイルから読み込み、FAQストアの版が変わったら読み直す）
+
+    /update-faq/ を処理していない他のワーカーも、版ファイルの変化で新しいFAQに切り替わる
+    読み直し中は他のリクエストを待たせず、読み直す前のインデックスで検索する
+    """
+    global _faq_index_version
+    index = _faq_index
+    if index is None:
+        with _faq_index_lock:
+            if _faq_index is None:
+                _load_faq_index()
+                logger.info("FAQインデックスを読み込みました: %s件", len(_faq_index))
+            return _faq_index
+
+    version = faq_store_version()
+    if version != _faq_index_version and _faq_index_lock.acquire(blocking=False):
+        try:
+            if version != _faq_index_version:
+                index = _load_faq_index()
+                logger.info("FAQストアの更新を検知したためFAQインデックスを読み直しました: %s件", len(index))
+        except Exception:
+            # 同じ版で読み直しを繰り返さない（次に保存されたときに再度読み直す）
+            _faq_index_version = version
+            logger.exception("FAQインデックスの読み直しに失敗しました（読み直す前のインデックスで検索します）")
+        finally:
+            _faq_index_lock.release()
+        index = _faq_index
+    return index
+
+
+def reload_faq_index() -> FaqIndex:
+    """
+    FAQインデックスを再構築して差し替える（/update-faq/ 完了時に呼ぶ）
+    """
+    with _faq_index_lock:
+        index = _load_faq_index()
+    logger.info("FAQインデックスを更新しました: %s件", len(index))
+    return index
@@ -0,0 +1,87 @@
+import math
+import unicodedata
+from collections import Counter, defaultdict
+import numpy as np
+
+# BM25のパラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def char_ngrams(text: str, n: int = 2) -> list:
+    """
+    文字n-gramに分割（NFKC正規化・小文字化し、記号と空白は除去）
+
+    日本語は単語区切りがないため、形態素解析の代わりに文字bi-gramを使う
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    chars = "".join(c for c in text if unicodedata.category(c)[0] in ("L", "N"))
+    if len(chars) <= n:
+        return [chars] if chars else []
+    return [chars[i:i + n] for i in range(len(chars) - n + 1)]
+
+
+class LexicalIndex:
+    """
+    FAQ質問文の文字bi-gram転置インデックス（BM25）
+
+    スコアはBM25を「FAQの質問文自身をクエリにしたときのスコア」と「クエリ自身を文書とみなしたときのスコア」の
+    大きい方で割った0〜1の値で返す。FAQタイトルを含むだけの長い質問や、タイトルの一部だけの質問は1より小さくなり、
+    FAQタイトルとほぼ同じ質問だけが1に近くなる
+    """
+
+    def __init__(self, texts: list):
+        self.size = len(texts)
+        docs = [Counter(char_ngrams(text)) for text in texts]
+        lengths = np.array([sum(doc.values()) for doc in docs], dtype=np.float32)
+        avg_length = float(lengths.mean()) if self.size and lengths.mean() > 0 else 1.0
+        self.avg_length = avg_length
+
+        postings = defaultdict(list)
+        for doc_id, doc in enumerate(docs):
+            for term, tf in doc.items():
+                postings[term].append((doc_id, tf))
+
+        # ✅ 語ごとに (文書ID配列, BM25重み配列) を事前計算
+        self.postings = {}
+        self.idf = {}
+        for term, entries in postings.items():
+            doc_ids = np.array([doc_id for doc_id, _ in entries], dtype=np.int32)
+            tfs = np.array([tf for _, tf in entries], dtype=np.float32)
+            df = len(entries)
+            idf = self.idf[term] = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_ids] / avg_length)
+            self.postings[term] = (doc_ids, idf * tfs * (BM25_K1 + 1) / (tfs + norm))
+        # どのFAQにも出てこない語のidf
+        self.unseen_idf = math.log(1 + (self.size + 0.5) / 0.5)
+
+        # 各FAQの最大スコア（自分自身の質問文をクエリにした場合）
+        self.self_scores = np.zeros(self.size, dtype=np.float32)
+        for term, (doc_ids, weights) in self.postings.items():
+            self.self_scores[doc_ids] += weights
+        self.self_scores[self.self_scores == 0] = 1.0
+
+    def query_self_score(self, terms: Counter) -> float:
+        """
+        クエリ自身を文書とみなし、自分自身をクエリにしたときのスコア（FAQの self_scores と同じ計算）
+        """
+        length = sum(terms.values())
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length)
+        return sum(
+            self.idf.get(term, self.unseen_idf) * tf * (BM25_K1 + 1) / (tf + norm)
+            for term, tf in terms.items()
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        クエリに対する全FAQの正規化スコア（0〜1）
+        """
+        terms = Counter(char_ngrams(query))
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                doc_ids, weights = posting
+                scores[doc_ids] += weights
+        # ✅ クエリ・FAQの両方の長さで割る（片方がもう片方を含むだけでは1にならない）
+        return np.minimum(scores / np.maximum(self.self_scores, self.query_self_score(terms)), 1.0)
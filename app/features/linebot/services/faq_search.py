@@ -1,46 +1,96 @@
-import json
-import numpy as np
-from bs4 import BeautifulSoup
-from app.features.linebot.services.openai_client import get_openai_reply, client
+from app.features.linebot.services.openai_client import get_openai_reply, get_embedding, OPENAI_ERROR_REPLY
 from app.features.linebot.services.line_client import send_line_reply
+from app.features.linebot.services.faq_index import get_faq_index
+from app.features.linebot.services.faq_cache import get_embedding_cache, get_answer_cache
+from app.features.linebot.services.conversation_store import create_conversation_store
+from app.features.linebot.services.prompt_builder import (
+    build_history,
+    select_passages,
+    update_running_summary,
+    build_shared_faq_prompt,
+    personalize_answer,
+)
+from app.core.config import (
+    FAQ_SIMILARITY_THRESHOLD,
+    FAQ_LEXICAL_CONFIDENCE,
+    FAQ_LEXICAL_THRESHOLD,
+    FAQ_LEXICAL_WEIGHT,
+)
 import logging # 標準のloggingをimport
 
 # ロガーを取得
 logger = logging.getLogger(__name__)
 
-# ユーザーごとの会話履歴
-USER_CONVERSATIONS = {}
+# ユーザーごとの会話履歴（件数・期間に上限のあるストア）
+conversation_store = create_conversation_store()
 
-def get_embedding(text: str) -> list:
+def get_query_embedding(text: str) -> list:
     """
-    OpenAI APIでテキストをEmbeddingに変換する
+    ユーザーの質問をEmbeddingに変換する（同じ質問はキャッシュから返す）
     """
-    response = client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text
-    )
-    return response.data[0].embedding
-
-def cosine_similarity(vec1, vec2):
-    """
-    コサイン類似度を計算
+    cache = get_embedding_cache()
+    embedding = cache.get(text)
+    if embedding is None:
+        embedding = get_embedding(text)
+        cache.set(text, embedding)
+    return embedding
+
+def retrieve_faqs(user_message: str, user_sex: str, faq_index=None, embed=None,
+                  similarity_threshold: float = FAQ_SIMILARITY_THRESHOLD,
+                  lexical_confidence: float = FAQ_LEXICAL_CONFIDENCE,
+                  lexical_threshold: float = FAQ_LEXICAL_THRESHOLD,
+                  lexical_weight: float = FAQ_LEXICAL_WEIGHT,
+                  top_k: int = 5) -> list:
     """
-    return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+    ユーザーの質問に関連するFAQを (faq, score) のリストで返す（スコアの高い順）
 
-def clean_html(raw_html: str) -> str:
+    faq_index / embed / 閾値はベンチマーク用に差し替え可能
     """
-    HTMLタグを除去してテキストのみを返す
-    """
-    soup = BeautifulSoup(raw_html, "html.parser")
-    return soup.get_text(separator=' ', strip=True)
+    if faq_index is None:
+        faq_index = get_faq_index()
+    if embed is None:
+        embed = get_query_embedding
+    lexical_scores = faq_index.lexical_scores(user_message)
+
+    # ① FAQタイトルとほぼ同じ質問なら Embedding を呼ばずに回答
+    relevant_faqs = faq_index.lexical_search(
+        user_message, user_sex, threshold=lexical_confidence, top_k=top_k, lexical_scores=lexical_scores
+    )
+    if relevant_faqs:
+        return relevant_faqs
+
+    # ② それ以外は類似度（0.85以上）と語彙スコアを組み合わせて検索
+    try:
+        query_embedding = embed(user_message)
+    except Exception as e:
+        # Embeddingが取れない（OpenAI停止中など）場合は語彙検索の結果だけで続行
+        logger.warning("Embedding取得に失敗したため語彙検索のみで検索します: %s", e)
+        return faq_index.lexical_search(
+            user_message, user_sex, threshold=lexical_threshold, top_k=top_k, lexical_scores=lexical_scores
+        )
+
+    return faq_index.search(
+        query_embedding,
+        user_sex,
+        threshold=similarity_threshold,
+        top_k=top_k,
+        lexical_scores=lexical_scores,
+        lexical_threshold=lexical_threshold,
+        lexical_weight=lexical_weight,
+    )
 
-def search_faq(user_message: str, user_info: dict, reply_token: str) -> str:
+def search_faq(user_message: str, user_info: dict, reply_token: str, send_reply=None) -> str:
     """
     FAQデータを検索し、ユーザーの履歴を考慮して回答を生成
+
+    send_reply: 回答の送信関数（省略時は reply_token で返信）
     """
+    if send_reply is None:
+        send_reply = lambda message: send_line_reply(reply_token, message)
+
     try:
         # 環境情報のログを削除
-        logger.info(f"search_faq関数が呼び出されました: user_message={user_message}, reply_token={reply_token}") # シンプルなログに変更
+        logger.debug("search_faq関数が呼び出されました: user_message=%s, reply_token=%s", user_message, reply_token) # シンプルなログに変更
         user_id = user_info.get('id')
 
         if not user_id:
@@ -51,73 +101,59 @@ def search_faq(user_message: str, user_info: dict, reply_token: str) -> str:
 
         # `YES` の場合、履歴を削除し、削除後の履歴をログに出力
         if user_message.upper() == "リセット":
-            if user_id in USER_CONVERSATIONS:
-                USER_CONVERSATIONS[user_id].clear()  # キーを保持しつつ内容をクリア
-                del USER_CONVERSATIONS[user_id]  # キーごと完全削除
+            conversation_store.clear(user_id)
 
-            print(f" {user_id} の履歴を削除しました")
-            send_line_reply(reply_token, "ありがとうございました。またお気軽に質問してくださいね😊")
+            logger.debug("%s の履歴を削除しました", user_id)
+            send_reply("ありがとうございました。またお気軽に質問してくださいね😊")
             return  
 
+        # 履歴を保存（上限を超えた古い発言はストア側で削除）
+        conversation_store.append(user_id, {"user": user_message})
+        conversation = conversation_store.get(user_id)
+
         # 履歴をログに出力（デバッグ用）
-        print(f" {user_id} の現在の履歴: {USER_CONVERSATIONS.get(user_id, '履歴なし')}")
-
-        # 履歴を保存（存在しない場合は作成）
-        if user_id not in USER_CONVERSATIONS:
-            USER_CONVERSATIONS[user_id] = []
-
-        # 5往復（10発言）以上なら古いものから削除
-        while len(USER_CONVERSATIONS[user_id]) >= 10:
-            USER_CONVERSATIONS[user_id].pop(0)
-
-        USER_CONVERSATIONS[user_id].append({"user": user_message})
-
-        # `microcms_faq_embeddings.json` からFAQデータを読み込む
-        with open('app/data/microcms_faq_embeddings.json', 'r') as f:
-            faqs = json.load(f)
-
-        # 性別でFAQをフィルタリング
-        matched_faqs = [
-            faq for faq in faqs 
-            if faq['sex'] == user_sex or faq['sex'] == 'NULL'
-        ]
-
-        # ユーザーの質問に最も近いFAQを **複数** 取得（スコア0.85以上）
-        user_embedding = get_embedding(user_message)
-        relevant_faqs = []
-        for faq in matched_faqs:
-            faq_embedding = faq['embedding']
-            similarity = cosine_similarity(user_embedding, faq_embedding)
-            if similarity > 0.85:  # 類似度が0.85以上のものを収集
-                relevant_faqs.append((faq, similarity))
-
-        # 類似度の高い順にソート（最も関連性の高いFAQから順に処理）
-        relevant_faqs.sort(key=lambda x: x[1], reverse=True)
-
-        # 過去の会話履歴を取得（最新5~10ターン分）
-        conversation_history = "\n".join(
-            [f"ユーザー: {conv['user']}" if 'user' in conv else f"ボット: {conv['bot']}" 
-            for conv in USER_CONVERSATIONS[user_id][-10:]]
-        ) if USER_CONVERSATIONS[user_id] else "履歴なし"
+        logger.debug("%s の現在の履歴: %s", user_id, conversation or '履歴なし')
+
+        # ✅ プロセス共通のFAQインデックスから検索（性別フィルタ込み・上位のみ）
+        relevant_faqs = retrieve_faqs(user_message, user_sex)
+
+        # 過去の会話履歴を取得（要約 + 直近の発言をトークン上限内で）
+        summary = conversation_store.get_summary(user_id)
+        conversation_history = build_history(summary, conversation)
 
         # FAQが1つ以上見つかった場合、それらを **要約・統合**
         if relevant_faqs:
+            # ✅ スコア上位のFAQだけをトークン上限内で使う（回答は取り込み時にHTML除去済み）
+            passages = select_passages(relevant_faqs)
             cleaned_faq_answers = "\n".join(
-                [clean_html(faq['answer']) for faq, _ in relevant_faqs]
-            )
-
-            system_prompt = (
-                f"以下はユーザー {user_nickname} との最近の会話履歴です。\n"
-                f"---\n"
-                f"{conversation_history}\n"
-                f"---\n"
-                f"ユーザーの最新の質問: {user_message}\n"
-                f"以下のFAQの情報を **簡潔かつ手短に要約** して、分かりやすい回答を作成してください。\n"
-                f"FAQの内容:\n"
-                f"{cleaned_faq_answers}"
+                [answer for _, answer in passages]
             )
 
-            reply = get_openai_reply(user_message, system_prompt)
+            answer_cache = get_answer_cache()
+            # ✅ 会話の続き（履歴・要約あり）は回答が履歴に依存するため、キャッシュは会話の最初の質問にだけ使う
+            if answer_cache.enabled and len(conversation) <= 1 and not summary:
+                # ✅ 同じ質問・FAQの組み合わせ・性別の回答を全員で共有する
+                # （ニックネーム・会話履歴を含まないプロンプトで生成し、宛名はあとから付ける）
+                article_ids = [faq.get('article_id') for faq, _ in passages]
+                reply = answer_cache.get(user_message, article_ids, user_sex)
+                if reply is None:
+                    reply = get_openai_reply(user_message, build_shared_faq_prompt(cleaned_faq_answers))
+                    if reply != OPENAI_ERROR_REPLY:
+                        answer_cache.set(user_message, article_ids, user_sex, reply)
+                if reply != OPENAI_ERROR_REPLY:
+                    reply = personalize_answer(reply, user_info.get('nickname'))
+            else:
+                system_prompt = (
+                    f"以下はユーザー {user_nickname} との最近の会話履歴です。\n"
+                    f"---\n"
+                    f"{conversation_history}\n"
+                    f"---\n"
+                    f"ユーザーの最新の質問: {user_message}\n"
+                    f"以下のFAQの情報を **簡潔かつ手短に要約** して、分かりやすい回答を作成してください。\n"
+                    f"FAQの内容:\n"
+                    f"{cleaned_faq_answers}"
+                )
+                reply = get_openai_reply(user_message, system_prompt)
 
         # FAQで見つからなかった場合は、履歴を考慮して OpenAI に質問
         else:
@@ -138,13 +174,16 @@ def search_faq(user_message: str, user_info: dict, reply_token: str) -> str:
             reply = get_openai_reply(user_message, system_prompt)
 
         # 履歴に Bot の回答も追加
-        USER_CONVERSATIONS[user_id].append({"bot": reply})
+        conversation_store.append(user_id, {"bot": reply})
 
         # LINEへメッセージ送信
-        send_line_reply(reply_token, reply)
+        send_reply(reply)
+
+        # ✅ 返信後に古い発言を要約へ畳み込む（次回以降のプロンプトを一定サイズに保つ）
+        update_running_summary(conversation_store, user_id)
 
         return reply
 
     except Exception as e:
-        print(f" FAQ検索中にエラー: {e}")
+        logger.error("FAQ検索中にエラー: %s", e)
         return "FAQ検索中にエラーが発生しました。"
@@ -0,0 +1,83 @@
+import json
+import os
+import time
+import numpy as np
+
+# FAQ埋め込みの保存先（ベクトルは.npy、メタデータはJSONのサイドカー）
+FAQ_VECTORS_PATH = 'app/data/microcms_faq_embeddings.npy'
+FAQ_META_PATH = 'app/data/microcms_faq_meta.json'
+# 保存のたびに最後に置き換える版ファイル（各ワーカーはこれの変化で読み直す）
+FAQ_VERSION_PATH = 'app/data/microcms_faq_version'
+
+# メタデータとして保存する項目
+FAQ_META_FIELDS = ("question", "answer", "sex", "category", "article_id", "content_hash", "updated_at", "answer_tokens")
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """
+    各行をL2正規化したfloat32行列を返す
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.shape[0] == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _atomic_write(path: str, write):
+    """
+    一時ファイルに書き出してから置き換える（読み込み中のワーカーは旧ファイルを参照し続ける）
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def save_faq_store(faqs: list, embeddings, vectors_path: str = FAQ_VECTORS_PATH, meta_path: str = FAQ_META_PATH,
+                   version_path: str = FAQ_VERSION_PATH):
+    """
+    FAQメタデータと埋め込みベクトルを保存
+
+    ベクトルは正規化済みfloat32として保存するため、読み込み側でコピーが発生しない
+    """
+    if len(faqs) != len(embeddings):
+        raise ValueError(f"FAQ件数({len(faqs)})と埋め込み件数({len(embeddings)})が一致しません。")
+
+    vectors = normalize_rows(embeddings) if len(faqs) else np.zeros((0, 0), dtype=np.float32)
+    meta = [{field: faq.get(field) for field in FAQ_META_FIELDS} for faq in faqs]
+
+    # ✅ ベクトル → メタデータ → 版ファイルの順に置き換え（読み込み側で件数を検証）
+    _atomic_write(vectors_path, lambda f: np.save(f, vectors))
+    _atomic_write(meta_path, lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+    _atomic_write(version_path, lambda f: f.write(str(time.time_ns()).encode('utf-8')))
+
+
+def faq_store_version(version_path: str = FAQ_VERSION_PATH):
+    """
+    保存済みFAQストアの版（版ファイルの inode と更新時刻。版ファイルがなければNone）
+
+    置き換えのたびに別ファイルになるため、stat だけで更新を検出できる
+    """
+    try:
+        stat = os.stat(version_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def load_faq_store(vectors_path: str = FAQ_VECTORS_PATH, meta_path: str = FAQ_META_PATH):
+    """
+    FAQメタデータと埋め込みベクトル（メモリマップ）を読み込む
+
+    戻り値は (faqs, vectors)。vectorsは読み取り専用のmemmapで、全ワーカーでページキャッシュを共有する
+    """
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        faqs = json.load(f)
+    vectors = np.load(vectors_path, mmap_mode="r")
+
+    if vectors.shape[0] != len(faqs):
+        raise ValueError(f"FAQメタデータ({len(faqs)}件)とベクトル({vectors.shape[0]}件)の件数が一致しません。")
+
+    return faqs, vectors
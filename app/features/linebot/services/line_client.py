@@ -1,6 +1,9 @@
 import requests
 from fastapi import HTTPException
 from app.core.config import LINE_CHANNEL_ACCESS_TOKEN
+import logging
+
+logger = logging.getLogger(__name__)
 
 LINE_REPLY_URL = "https://api.line.me/v2/bot/message/reply"
 
@@ -9,7 +12,7 @@ def send_line_reply(reply_token: str, message: str, quick_reply: bool = False):
     LINEユーザーへ返信（Quick Reply もまとめて送るオプションあり）
     """
     if not reply_token:
-        print("❌ 無効な reply_token が渡されました")
+        logger.error("❌ 無効な reply_token が渡されました")
         return
 
     headers = {
@@ -53,16 +56,15 @@ def send_line_reply(reply_token: str, message: str, quick_reply: bool = False):
 
     response = requests.post(LINE_REPLY_URL, headers=headers, json=data)
     if response.status_code != 200:
-        print(f"❌ LINEメッセージ送信失敗: {response.status_code}, {response.text}")
+        logger.error("❌ LINEメッセージ送信失敗: %s, %s", response.status_code, response.text)
 
-def handle_yes_no_response(user_id: str, user_message: str, reply_token: str, user_conversations: dict):
+def handle_yes_no_response(user_id: str, user_message: str, reply_token: str, conversation_store):
     """
     YES/NO の応答を処理する
     """
     if user_message.upper() == "YES":
         # ✅ 履歴を削除
-        if user_id in user_conversations:
-            del user_conversations[user_id]
+        conversation_store.clear(user_id)
         send_line_reply(reply_token, "ありがとうございます！また質問があれば聞いてください😊")
 
     elif user_message.upper() == "NO":
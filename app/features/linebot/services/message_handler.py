@@ -0,0 +1,33 @@
+from app.db.session import SessionLocal
+from app.features.linebot.services.user_info import fetch_user_info_by_line_id
+from app.features.linebot.services.faq_search import search_faq
+from app.features.linebot.services.deferred_reply import DeadlineReplier
+
+
+def handle_text_message_event(event: dict, received_at: float = None):
+    """
+    テキストメッセージイベントを処理（ワーカースレッドから呼ばれる）
+    """
+    line_id = event["source"]["userId"]
+    reply_token = event["replyToken"]
+    user_message = event["message"]["text"]
+
+    # ✅ 受信から期限を過ぎたら「確認中」を返信し、回答はプッシュで送る
+    replier = DeadlineReplier(line_id, reply_token, received_at)
+
+    try:
+        # ✅ ワーカーごとにセッションを作成して使い終わったら閉じる
+        db = SessionLocal()
+        try:
+            user_info = fetch_user_info_by_line_id(db, line_id)
+        finally:
+            db.close()
+
+        # ✅ `search_faq()` 内で `replier.send()` を呼ぶ
+        reply = search_faq(user_message, user_info, reply_token, send_reply=replier.send)
+
+        # ✅ 未登録・エラー時の文言は search_faq が送らずに返すため、ここで送る
+        if reply and not replier.sent:
+            replier.send(reply)
+    finally:
+        replier.close()
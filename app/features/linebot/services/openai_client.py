@@ -1,22 +1,270 @@
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY
+import asyncio
+import logging
+import random
+import threading
+import time
+import openai
+from openai import AsyncOpenAI
+from app.core.config import (
+    OPENAI_API_KEY,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_TIMEOUT,
+    OPENAI_MAX_RETRIES,
+    OPENAI_BREAKER_FAILURES,
+    OPENAI_BREAKER_RESET,
+)
+
+logger = logging.getLogger(__name__)
+
+CHAT_MODEL = "gpt-4o-mini"
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# API失敗時の返答
+OPENAI_ERROR_REPLY = "申し訳ありません、エラーが発生しました。"
+
+# 再試行の待ち時間（秒）：base * 2^n を上限まで、フルジッター
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+
+class CircuitOpenError(Exception):
+    """
+    サーキットが開いているため呼び出しを行わなかった
+    """
+
+
+class CircuitBreaker:
+    """
+    連続失敗がしきい値を超えたら一定時間呼び出しを止める（その後1回だけ試行して復帰判定）
+    """
+
+    def __init__(self, failure_threshold: int = OPENAI_BREAKER_FAILURES, reset_timeout: float = OPENAI_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning("OpenAI APIのサーキットを開きます（連続失敗 %s回）", self.failures)
+                self.opened_at = time.monotonic()
+
+
+class OpenAIMetrics:
+    """
+    呼び出し種別ごとの件数・エラー・レイテンシ
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops = {}
+
+    def _op(self, op: str) -> dict:
+        return self._ops.setdefault(op, {
+            "calls": 0, "errors": 0, "timeouts": 0, "retries": 0, "short_circuited": 0,
+            "latency_total": 0.0, "latency_max": 0.0,
+        })
+
+    def record(self, op: str, key: str):
+        with self._lock:
+            self._op(op)[key] += 1
+
+    def record_latency(self, op: str, elapsed: float):
+        with self._lock:
+            stats = self._op(op)
+            stats["calls"] += 1
+            stats["latency_total"] += elapsed
+            stats["latency_max"] = max(stats["latency_max"], elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for op, stats in self._ops.items():
+                calls = stats["calls"] or 1
+                result[op] = {
+                    **{k: v for k, v in stats.items() if not k.startswith("latency")},
+                    "latency_avg_ms": round(stats["latency_total"] / calls * 1000, 2),
+                    "latency_max_ms": round(stats["latency_max"] * 1000, 2),
+                }
+            return result
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+class OpenAIGateway:
+    """
+    AsyncOpenAI を専用スレッドのイベントループで動かす共通クライアント
+
+    ・呼び出しごとのタイムアウト
+    ・セマフォによる同時実行数の上限
+    ・429/5xx/タイムアウト時のジッター付き再試行
+    ・連続失敗時のサーキットブレーカー（即座に失敗を返す）
+    同期コード（ワーカースレッド・スクリプト）からは chat / embed を、
+    非同期コードからは achat / aembed を使う
+    ループ・クライアントは最初の呼び出しで作成する（APIキーなしでも import できる）
+    """
+
+    def __init__(self, api_key: str = OPENAI_API_KEY, max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+                 timeout: float = OPENAI_TIMEOUT, max_retries: int = OPENAI_MAX_RETRIES):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker()
+        self.metrics = OpenAIMetrics()
+        self._loop = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="openai-gateway", daemon=True)
+            thread.start()
+
+            # ✅ クライアントとセマフォはゲートウェイのループ上で作成する
+            async def init():
+                self._client = AsyncOpenAI(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            try:
+                asyncio.run_coroutine_threadsafe(init(), loop).result()
+            except Exception:
+                loop.call_soon_threadsafe(loop.stop)
+                raise
+            self._thread = thread
+            self._loop = loop
+
+    def _submit(self, coro):
+        if self._loop is None:
+            try:
+                self._start()
+            except Exception:
+                coro.close()
+                raise
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _call(self, op: str, request):
+        if not self.breaker.allow():
+            self.metrics.record(op, "short_circuited")
+            raise CircuitOpenError(f"OpenAI API ({op}) は一時停止中です")
+
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            try:
+                async with self._semaphore:
+                    result = await asyncio.wait_for(request(), timeout=self.timeout)
+                self.metrics.record_latency(op, time.monotonic() - started)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                self.metrics.record_latency(op, time.monotonic() - started)
+                self.metrics.record(op, "errors")
+                if isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError)):
+                    self.metrics.record(op, "timeouts")
+
+                if not _is_retryable(e):
+                    # リクエスト内容の誤りなどはAPI自体は応答しているため失敗に数えない
+                    self.breaker.record_success()
+                    raise
+                if attempt >= self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+
+                self.metrics.record(op, "retries")
+                await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def _chat(self, messages: list, model: str) -> str:
+        response = await self._call("chat", lambda: self._client.chat.completions.create(model=model, messages=messages))
+        return response.choices[0].message.content
+
+    async def _embed(self, texts: list, model: str) -> list:
+        response = await self._call("embeddings", lambda: self._client.embeddings.create(model=model, input=texts))
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    # 非同期コード用（呼び出し元のイベントループで待機できる）
+    async def achat(self, messages: list, model: str = CHAT_MODEL) -> str:
+        return await asyncio.wrap_future(self._submit(self._chat(messages, model)))
+
+    async def aembed(self, texts: list, model: str = EMBEDDING_MODEL) -> list:
+        return await asyncio.wrap_future(self._submit(self._embed(texts, model)))
+
+    # 同期コード用
+    def chat(self, messages: list, model: str = CHAT_MODEL) -> str:
+        return self._submit(self._chat(messages, model)).result()
+
+    def embed(self, texts: list, model: str = EMBEDDING_MODEL) -> list:
+        return self._submit(self._embed(texts, model)).result()
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            **self.metrics.snapshot(),
+        }
+
+
+# OpenAIクライアント初期化（ボット・スクリプト共通）
+gateway = OpenAIGateway()
 
-# OpenAIクライアント初期化
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 def get_openai_reply(user_message: str, system_prompt: str = "あなたは親切なアシスタントです。") -> str:
     """
     OpenAI APIを使用して動的な返答を生成
     """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-        )
-        return response.choices[0].message.content
+        return gateway.chat([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ])
     except Exception as e:
-        print(f"OpenAI API error: {e}")
-        return "申し訳ありません、エラーが発生しました。"
+        logger.error("OpenAI API error: %s", e)
+        return OPENAI_ERROR_REPLY
+
+
+def get_embeddings(texts: list) -> list:
+    """
+    OpenAI APIで複数テキストをまとめてEmbeddingに変換する（入力順で返す）
+    """
+    return gateway.embed(texts)
+
+
+def get_embedding(text: str) -> list:
+    """
+    OpenAI APIでテキストをEmbeddingに変換する
+    """
+    return get_embeddings([text])[0]
@@ -0,0 +1,126 @@
+from app.core.config import (
+    FAQ_PROMPT_MAX_PASSAGES,
+    FAQ_PROMPT_PASSAGE_BUDGET,
+    FAQ_PROMPT_HISTORY_BUDGET,
+    CONVERSATION_RECENT_TURNS,
+    CONVERSATION_MAX_TURNS,
+)
+from app.features.linebot.services.openai_client import get_openai_reply, OPENAI_ERROR_REPLY
+from app.features.linebot.services.text_utils import estimate_tokens
+
+# 要約の長さの目安（文字数）
+SUMMARY_MAX_CHARS = 300
+
+
+def format_turn(turn: dict) -> str:
+    return f"ユーザー: {turn['user']}" if 'user' in turn else f"ボット: {turn['bot']}"
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    トークン数の概算がbudgetに収まるよう末尾を切り詰める
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + "…"
+
+
+def build_history(summary: str, turns: list, budget: int = FAQ_PROMPT_HISTORY_BUDGET) -> str:
+    """
+    要約 + 直近の発言を、新しいものから優先してトークン上限内で組み立てる
+    """
+    lines = []
+    used = 0
+    for turn in reversed(turns):
+        line = format_turn(turn)
+        tokens = estimate_tokens(line)
+        if used + tokens > budget:
+            break
+        lines.append(line)
+        used += tokens
+    lines.reverse()
+
+    if summary:
+        lines.insert(0, f"（これまでの要約）{truncate_to_tokens(summary, max(budget - used, 0))}")
+
+    return "\n".join(lines) if lines else "履歴なし"
+
+
+def select_passages(relevant_faqs: list, budget: int = FAQ_PROMPT_PASSAGE_BUDGET, max_passages: int = FAQ_PROMPT_MAX_PASSAGES) -> list:
+    """
+    スコア上位のFAQ回答をトークン上限内で選ぶ（relevant_faqs はスコアの高い順）
+
+    戻り値は (faq, 回答テキスト) のリスト
+    """
+    passages = []
+    remaining = budget
+    for faq, _ in relevant_faqs[:max_passages]:
+        tokens = faq.get('answer_tokens') or estimate_tokens(faq['answer'])
+        if tokens <= remaining:
+            passages.append((faq, faq['answer']))
+            remaining -= tokens
+        elif not passages:
+            # 最上位のFAQだけは切り詰めてでも含める
+            passages.append((faq, truncate_to_tokens(faq['answer'], remaining)))
+            break
+        else:
+            break
+    return passages
+
+
+def build_shared_faq_prompt(faq_answers: str) -> str:
+    """
+    回答キャッシュ用のシステムプロンプト（ニックネーム・会話履歴など利用者に依存する情報を含めない）
+
+    ユーザーメッセージには質問文だけを渡すため、生成した回答は同じ質問・FAQ・性別の全員で共有できる
+    """
+    return (
+        f"以下のFAQの情報を **簡潔かつ手短に要約** して、ユーザーの質問に分かりやすく回答してください。"
+        f"宛名や相手の名前は書かないでください。\n"
+        f"FAQの内容:\n"
+        f"{faq_answers}"
+    )
+
+
+def personalize_answer(answer: str, nickname: str = None) -> str:
+    """
+    共有の要約に宛名を付ける（キャッシュには宛名なしの要約だけを保存する）
+    """
+    return f"{nickname}さん、{answer}" if nickname else answer
+
+
+def update_running_summary(conversation_store, user_id, keep_last: int = CONVERSATION_RECENT_TURNS,
+                           compact_at: int = CONVERSATION_MAX_TURNS):
+    """
+    履歴がcompact_at件に達したら、直近keep_last件より古い発言をまとめて要約に畳み込み、履歴から外す
+
+    要約の生成（OpenAI呼び出し）は数回の発言に1回にとどめ、返信後に呼ぶことで応答待ちの時間にも含めない
+    """
+    turns = conversation_store.get(user_id)
+    if len(turns) < max(compact_at, keep_last + 1):
+        return
+
+    older = turns[:-keep_last] if keep_last > 0 else turns
+    summary = conversation_store.get_summary(user_id)
+    conversation = "\n".join(format_turn(turn) for turn in older)
+
+    system_prompt = (
+        f"あなたは会話ログの要約係です。"
+        f"これまでの要約と新しい会話をまとめ、{SUMMARY_MAX_CHARS}文字以内の日本語で要約してください。"
+        f"ユーザーの質問内容・前提・未解決の事項を優先して残してください。"
+    )
+    new_summary = get_openai_reply(
+        f"これまでの要約:\n{summary or 'なし'}\n---\n新しい会話:\n{conversation}",
+        system_prompt,
+    )
+    if new_summary == OPENAI_ERROR_REPLY:
+        return  # 失敗した場合は履歴をそのまま残す（件数は上限で制限される）
+
+    conversation_store.compact(user_id, new_summary[:SUMMARY_MAX_CHARS * 2], keep_last)
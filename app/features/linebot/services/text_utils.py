@@ -0,0 +1,21 @@
+import math
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    連続する空白・改行を1つの空白にまとめる
+    """
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークン数の概算（日本語などの非ASCII文字は1文字≒1トークン、ASCIIは4文字≒1トークン）
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (len(text) - ascii_chars) + math.ceil(ascii_chars / 4)
@@ -8,6 +8,9 @@ from app.features.media.schemas.media_schema import MediaUploadRequest, GetMedia
 from app.db.models.media_files import MediaFile
 from app.features.media.services.media_delete import delete_s3_file
 from app.features.media.repositories.media_repository import delete_media_records
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter()
@@ -19,7 +22,7 @@ def create_presigned_url(
     current_user: int = Depends(get_current_user)
 ):
     try:
-        print(f"[INFO] 🔐 ユーザー認証成功: user_id={current_user}")  # ✅ 認証が成功しているか確認
+        logger.debug("🔐 ユーザー認証成功: user_id=%s", current_user)  # ✅ 認証が成功しているか確認
 
         presigned_url = get_presigned_url(
             request.file_name,
@@ -28,10 +31,10 @@ def create_presigned_url(
             request.target_id,
             request.order_index
         )
-        print(f"[DEBUG] 生成された presigned_url: {presigned_url}")
+        logger.debug("生成された presigned_url: %s", presigned_url)
         return {"presigned_url": presigned_url}
     except Exception as e:
-        print(f"[ERROR] S3 URLの生成に失敗: {str(e)}")
+        logger.error("S3 URLの生成に失敗: %s", str(e))
         raise HTTPException(status_code=500, detail=f"S3 URLの生成に失敗しました: {str(e)}")
 
 @router.post("/get-by-index")
@@ -86,12 +89,12 @@ def register_media(
         db.commit()
         db.refresh(new_media)
 
-        print(f"[INFO] ✅ 新しいメディア登録成功: {new_media.file_url}, ID: {new_media.id}")
+        logger.info("✅ 新しいメディア登録成功: %s, ID: %s", new_media.file_url, new_media.id)
         return {"status": "success", "file_url": new_media.file_url, "id": new_media.id}
 
     except Exception as e:
         db.rollback()
-        print(f"[ERROR] DB登録エラー: {str(e)}")
+        logger.error("DB登録エラー: %s", str(e))
         raise HTTPException(status_code=500, detail="DB登録に失敗しました")
 
 #削除   
@@ -104,7 +107,7 @@ def delete_media(
     """
     `target_type`, `target_id`, `order_index` に紐づくメディアを削除
     """
-    print(f"[INFO] 🔥 /delete リクエスト受信: {request.model_dump()}")
+    logger.debug("🔥 /delete リクエスト受信: %s", request)
 
     # ✅ 1. DB からメディア情報を取得
     media_files = db.query(MediaFile).filter(
@@ -114,19 +117,19 @@ def delete_media(
     ).all()
 
     if not media_files:
-        print("[INFO] ℹ️ 削除対象のメディアなし")
+        logger.debug("ℹ️ 削除対象のメディアなし")
         return {"status": "success", "message": "削除対象なし"}
 
     # ✅ 2. S3 から削除
     for media in media_files:
-        print(f"[INFO] 🗑️ S3 から削除するファイル: {media.file_url}")
+        logger.debug("🗑️ S3 から削除するファイル: %s", media.file_url)
         if not delete_s3_file(media.file_url):
             raise HTTPException(status_code=500, detail="S3 の削除に失敗しました")
 
     # ✅ 3. DB から削除
-    print("[INFO] 🗑️ DB から削除を開始")
+    logger.debug("🗑️ DB から削除を開始")
     if not delete_media_records(db, request.target_type, request.target_id, request.order_index):
         raise HTTPException(status_code=500, detail="DB の削除に失敗しました")
 
-    print("[INFO] ✅ 画像削除成功")
+    logger.info("✅ 画像削除成功")
     return {"status": "success", "message": "S3とDBのメディアが削除されました。"}
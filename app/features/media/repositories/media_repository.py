@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from app.db.models.media_files import MediaFile
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ メディアファイルの登録
 def save_media_info(file_url: str, file_type: str, target_type: str, target_id: int, order_index: int, db: Session):
@@ -26,15 +29,15 @@ def delete_media_records(db: Session, target_type: str, target_id: int, order_in
     ).all()
 
     if not media_files:
-        print("[INFO] ℹ️ 削除対象のメディアなし")
+        logger.debug("ℹ️ 削除対象のメディアなし")
         return False
 
-    print(f"[INFO] 🗑️ DB から削除対象のメディア {len(media_files)} 件")
+    logger.debug("🗑️ DB から削除対象のメディア %s 件", len(media_files))
 
     for media in media_files:
-        print(f"[INFO] 🗑️ DB から削除: {media.file_url}")
+        logger.debug("🗑️ DB から削除: %s", media.file_url)
         db.delete(media)
     
     db.commit()
-    print("[INFO] ✅ DB からメディア削除成功")
+    logger.info("✅ DB からメディア削除成功")
     return True
\ No newline at end of file
@@ -1,6 +1,9 @@
 import boto3
 import os
 from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ 環境変数の読み込み
 load_dotenv()
@@ -22,11 +25,11 @@ def delete_s3_file(file_url: str) -> bool:
     """S3 から指定のファイルを削除"""
     try:
         file_key = file_url.split(f"https://{AWS_S3_BUCKET_NAME}.s3.amazonaws.com/")[-1]
-        print(f"[INFO] 🗑️ S3 から削除対象のファイル: {file_key}")
+        logger.debug("🗑️ S3 から削除対象のファイル: %s", file_key)
 
         s3_client.delete_object(Bucket=AWS_S3_BUCKET_NAME, Key=file_key)
-        print(f"[INFO] ✅ S3 ファイル削除成功: {file_key}")
+        logger.info("✅ S3 ファイル削除成功: %s", file_key)
         return True
     except Exception as e:
-        print(f"[ERROR] ❌ S3 ファイル削除失敗: {str(e)}")
+        logger.error("❌ S3 ファイル削除失敗: %s", str(e))
         return False
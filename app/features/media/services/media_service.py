@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from app.features.media.repositories.media_repository import save_media_info
 from app.features.media.services.s3_service import generate_presigned_url
 from app.db.models.media_files import MediaFile
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ 署名付きURLを取得
 def get_presigned_url(file_name: str, file_type: str, target_type: str, target_id: int, order_index: int):
@@ -14,9 +17,9 @@ def save_uploaded_file_info(file_url: str, file_type: str, target_type: str, tar
     """
     try:
         save_media_info(file_url, file_type, target_type, target_id, order_index, db)
-        print(f"[INFO] ✅ ファイル情報を DB に保存: {file_url}")
+        logger.debug("✅ ファイル情報を DB に保存: %s", file_url)
         return True
     except Exception as e:
-        print(f"[ERROR] DB への保存に失敗: {str(e)}")
+        logger.error("DB への保存に失敗: %s", str(e))
         return False
     
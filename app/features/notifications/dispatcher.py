@@ -3,6 +3,9 @@
 import importlib
 import pkgutil
 from app.features.notifications import handlers
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ handlers/ フォルダ内の全ファイルを自動でインポート
 NOTIFICATION_HANDLERS = {}
@@ -21,4 +24,4 @@ def send(notification_type, **kwargs):
     if handler:
         handler(**kwargs)
     else:
-        print(f"❌ 未知の通知タイプ: {notification_type}")
+        logger.error("❌ 未知の通知タイプ: %s", notification_type)
@@ -5,6 +5,9 @@ from app.features.notifications.templates import get_template
 from app.features.notifications.variables import get_reservation_variables
 from app.features.notifications.line import send_line_message
 from app.features.notifications.repository.getlineID_repository import get_user_line_id  
+import logging
+
+logger = logging.getLogger(__name__)
 
 def send_reservation_created(db: Session, reservation_id: int, user_id: int):
     """
@@ -22,4 +25,4 @@ def send_reservation_created(db: Session, reservation_id: int, user_id: int):
     if line_id:
         send_line_message(line_id, message)
     else:
-        print(f"❌ ユーザー {user_id} のLINE IDが見つかりません")
+        logger.warning("❌ ユーザー %s のLINE IDが見つかりません", user_id)
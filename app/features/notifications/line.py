@@ -2,6 +2,9 @@
 
 import requests
 from app.core.config import LINE_CHANNEL_ACCESS_TOKEN
+import logging
+
+logger = logging.getLogger(__name__)
 
 LINE_PUSH_URL = "https://api.line.me/v2/bot/message/push"
 
@@ -10,7 +13,7 @@ def send_line_message(user_line_id: str, message: str):
     指定したLINEユーザーにメッセージを送信
     """
     if not user_line_id:
-        print("❌ 無効なLINEユーザーID")
+        logger.error("❌ 無効なLINEユーザーID")
         return
 
     headers = {
@@ -26,6 +29,6 @@ def send_line_message(user_line_id: str, message: str):
     response = requests.post(LINE_PUSH_URL, headers=headers, json=payload)
 
     if response.status_code != 200:
-        print(f"❌ LINEメッセージ送信失敗: {response.status_code}, {response.text}")
+        logger.error("❌ LINEメッセージ送信失敗: %s, %s", response.status_code, response.text)
     else:
-        print(f"✅ LINEメッセージ送信成功: {user_line_id}")
+        logger.debug("✅ LINEメッセージ送信成功: %s", user_line_id)
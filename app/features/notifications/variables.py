@@ -2,6 +2,9 @@
 
 from sqlalchemy.orm import Session
 from app.db.models.resv_reservation import ResvReservation
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_reservation_variables(db: Session, reservation_id: int) -> dict:
     """
@@ -10,7 +13,7 @@ def get_reservation_variables(db: Session, reservation_id: int) -> dict:
     reservation = db.query(ResvReservation).filter(ResvReservation.id == reservation_id).first()
 
     if not reservation:
-        print(f"❌ 予約ID {reservation_id} のデータが見つかりません")
+        logger.warning("❌ 予約ID %s のデータが見つかりません", reservation_id)
         return {"location": "不明", "date": "不明", "time": "不明"}
 
     return {
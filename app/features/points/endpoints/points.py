@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.features.points.schemas.points_schema import PointBalanceRequest, PointBalanceResponse, PointHistoryRequest, PointHistoryResponse, ApplyPointRuleRequest, ApplyPointRuleResponse
 from app.features.points.services.points_service import fetch_point_balance, fetch_point_balance, fetch_point_history
 from app.features.points.services.apply_point_rule_service import apply_point_rule
@@ -12,7 +12,7 @@ def get_point_balance(data: PointBalanceRequest, db: Session = Depends(get_db)):
     return fetch_point_balance(db, data.user_id)
 
 @router.post("/history", response_model=PointHistoryResponse)
-def get_point_history(data: PointHistoryRequest, db: Session = Depends(get_db)):
+def get_point_history(data: PointHistoryRequest, db: Session = Depends(get_read_db)):
     return fetch_point_history(db, data.user_id, data.limit, data.offset)
 
 @router.post("/apply", response_model=ApplyPointRuleResponse)
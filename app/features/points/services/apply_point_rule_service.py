@@ -4,18 +4,20 @@ from datetime import datetime, timezone, timedelta
 import json
 import logging
 
+logger = logging.getLogger(__name__)
+
 def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict = None):
     """ ルールを適用してポイントを更新する """
     # <<< ログ追加 >>>
-    logging.info(f"🚀 apply_point_rule 開始: user_id={user_id}, rule_name='{rule_name}', variables={variables}")
+    logger.debug("🚀 apply_point_rule 開始: user_id=%s, rule_name='%s', variables=%s", user_id, rule_name, variables)
 
     # ルール取得
     rule = db.query(PointRule).filter(PointRule.rule_name == rule_name).first()
     if not rule:
-        logging.error(f"🚨 ルール `{rule_name}` が見つかりません")
+        logger.error("🚨 ルール `%s` が見つかりません", rule_name)
         return {"success": False, "message": f"🚨 ルール `{rule_name}` が見つかりません"}
     # <<< ログ追加 >>>
-    logging.info(f"  ✅ ルール取得成功: rule_id={rule.id}, point_value={rule.point_value}, is_addition={rule.is_addition}")
+    logger.debug("  ✅ ルール取得成功: rule_id=%s, point_value=%s, is_addition=%s", rule.id, rule.point_value, rule.is_addition)
 
     # ユーザーのポイント残高取得（なければ新規作成）
     balance = db.query(PointBalance).filter(PointBalance.user_id == user_id).first()
@@ -25,26 +27,26 @@ def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict
         balance = PointBalance(user_id=user_id, regular_point_balance=0, bonus_point_balance=0, total_point_balance=0)
         db.add(balance)
         # <<< ログ追加 >>>
-        logging.info(f"  ⚠️ ユーザー {user_id} のポイント残高レコードを新規作成")
+        logger.debug("  ⚠️ ユーザー %s のポイント残高レコードを新規作成", user_id)
     else:
         # <<< ログ追加 >>>
-        logging.info(f"  ✅ ユーザー {user_id} のポイント残高取得: regular={balance.regular_point_balance}, bonus={balance.bonus_point_balance}, total={balance.total_point_balance}")
+        logger.debug("  ✅ ユーザー %s のポイント残高取得: regular=%s, bonus=%s, total=%s", user_id, balance.regular_point_balance, balance.bonus_point_balance, balance.total_point_balance)
 
     # 変数からポイント値を取得（なければルールのポイント値を使用）
     point_value = rule.point_value
     if variables and "amount" in variables:
         point_value = variables["amount"]
         # <<< ログ追加 >>>
-        logging.info(f"  ➡️ 変数からポイント値を取得: {point_value}")
+        logger.debug("  ➡️ 変数からポイント値を取得: %s", point_value)
 
     # <<< ログ追加 >>>
-    logging.info(f"  ⚙️ ポイント計算開始: 計算に使用する値 = {point_value}")
+    logger.debug("  ⚙️ ポイント計算開始: 計算に使用する値 = %s", point_value)
     
     # ルールがボーナス or レギュラーポイントか確認
     if rule.is_addition:
         # 加算の場合
         # <<< ログ追加 >>>
-        logging.info(f"  ➕ ポイント加算処理開始")
+        logger.debug("  ➕ ポイント加算処理開始")
         if rule.point_type == "regular":
             balance.regular_point_balance += point_value
         else:
@@ -55,16 +57,16 @@ def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict
     else:
         # 減算の場合（ポイント値は絶対値にする）
         # <<< ログ追加 >>>
-        logging.info(f"  ➖ ポイント減算処理開始")
+        logger.debug("  ➖ ポイント減算処理開始")
         actual_value = abs(point_value)  # 絶対値
 
         # ===>>> 仕様変更: reservation_payment の場合は通常ポイントのみから減算 <<<===
         if rule_name == "reservation_payment":
             # <<< ログ追加 >>>
-            logging.info(f"    ⚠️ reservation_paymentルール: 通常ポイントからのみ {actual_value} ポイント減算")
+            logger.debug("    ⚠️ reservation_paymentルール: 通常ポイントからのみ %s ポイント減算", actual_value)
             if balance.regular_point_balance < actual_value:
                 # 通常ポイントが足りない場合のエラーハンドリング（念のため）
-                logging.error(f"🚨 予約支払いエラー: 通常ポイント不足 (必要: {actual_value}, 残高: {balance.regular_point_balance})")
+                logger.warning("🚨 予約支払いエラー: 通常ポイント不足 (必要: %s, 残高: %s)", actual_value, balance.regular_point_balance)
                 return {"success": False, "message": "通常ポイントが不足しています"}
             balance.regular_point_balance -= actual_value
             balance.total_point_balance -= actual_value # 合計も減らす
@@ -75,32 +77,32 @@ def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict
             balance.bonus_point_balance -= bonus_deduction
             remaining = actual_value - bonus_deduction
             # <<< ログ追加 >>>
-            logging.info(f"    ➖ ボーナスから減算: {bonus_deduction} ポイント")
+            logger.debug("    ➖ ボーナスから減算: %s ポイント", bonus_deduction)
             
             # 残りのポイントをレギュラーポイントから減算
             if remaining > 0:
                 balance.regular_point_balance -= remaining
                 # <<< ログ追加 >>>
-                logging.info(f"    ➖ 通常から減算: {remaining} ポイント")
+                logger.debug("    ➖ 通常から減算: %s ポイント", remaining)
             
             # 合計ポイント更新
             balance.total_point_balance -= actual_value
         # ===>>> 仕様変更ここまで <<<===
 
         # <<< ログ追加 >>>
-        logging.info(f"  📊 ポイント減算処理後: regular={balance.regular_point_balance}, bonus={balance.bonus_point_balance}, total={balance.total_point_balance}")
+        logger.debug("  📊 ポイント減算処理後: regular=%s, bonus=%s, total=%s", balance.regular_point_balance, balance.bonus_point_balance, balance.total_point_balance)
     
     balance.last_updated = datetime.now(timezone.utc)
 
     # 取引履歴を追加
     # <<< ログ追加 >>>
-    logging.info(f"  📝 取引履歴作成開始")
+    logger.debug("  📝 取引履歴作成開始")
 
     # ===>>> 仕様変更: reservation_payment の場合は transaction_type を 'deposit' にする <<<===
     current_transaction_type = rule.transaction_type
     if rule_name == "reservation_payment":
         current_transaction_type = "deposit"
-        logging.info(f"    ⚠️ transaction_type を 'deposit' に設定")
+        logger.debug("    ⚠️ transaction_type を 'deposit' に設定")
     # ===>>> 仕様変更ここまで <<<===
     
     transaction = PointTransaction(
@@ -118,31 +120,32 @@ def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict
             transaction.related_id = variables["reservation_id"]
             transaction.related_table = "reservation"
             # <<< ログ追加 >>>
-            logging.info(f"    📝 取引履歴に予約ID {variables['reservation_id']} を関連付け")
+            logger.debug("    📝 取引履歴に予約ID %s を関連付け", variables['reservation_id'])
         
         if "description" in variables:
             transaction.description = variables["description"]
             # <<< ログ追加 >>>
-            logging.info(f"    📝 取引履歴に説明を追加: {variables['description']}")
+            logger.debug("    📝 取引履歴に説明を追加: %s", variables['description'])
     
     db.add(transaction)
 
     # DB保存
     # <<< ログ追加 >>>
-    logging.info(f"  💾 データベースへの保存 (commit) 開始")
+    logger.debug("  💾 データベースへの保存 (commit) 開始")
     try:
         # <<< ログ追加 (Commit前) >>>
         if is_new_balance:
-            logging.info(f"    💾 新規残高情報: {balance.__dict__}")
+            logger.debug("    💾 新規残高情報: %s", balance.__dict__)
         else:
-            logging.info(f"    💾 更新残高情報: {balance.__dict__}")
-        logging.info(f"    💾 新規取引履歴情報: {transaction.__dict__}")
+            logger.debug("    💾 更新残高情報: %s", balance.__dict__)
+        logger.debug("    💾 新規取引履歴情報: %s", transaction.__dict__)
         
         db.commit()
         
         # <<< ログ追加 (Commit後) >>>
-        logging.info(f"  ✅ データベースへの保存成功 (commit 完了)")
-        logging.info(f"🔚 apply_point_rule 正常終了")
+        logger.debug("  ✅ データベースへの保存成功 (commit 完了)")
+        logger.info("✅ apply_point_rule: user_id=%s, rule_name='%s', point_change=%s, balance_after=%s",
+                    user_id, rule_name, point_value, balance.total_point_balance)
         return {
             "success": True, 
             "message": f"✅ `{rule_name}` が適用されました！", 
@@ -153,7 +156,7 @@ def apply_point_rule(db: Session, user_id: int, rule_name: str, variables: dict
     except Exception as e:
         db.rollback()
         # <<< ログ追加 >>>
-        logging.error(f"🚨 データベースへの保存失敗 (rollback 実行): {e}")
-        logging.exception("  詳細なエラー情報:") # スタックトレースも出力
-        logging.info(f"🔚 apply_point_rule 異常終了")
+        logger.error("🚨 データベースへの保存失敗 (rollback 実行): %s", e)
+        logger.exception("  詳細なエラー情報:") # スタックトレースも出力
+        logger.debug("🔚 apply_point_rule 異常終了")
         return {"success": False, "message": f"🚨 ポイント処理が失敗しました: {e}"}
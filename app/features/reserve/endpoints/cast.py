@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.features.reserve.schemas.cast.cast_station_schema import (
     StationSuggestRequest,
     StationSuggestResponse,
@@ -11,12 +11,14 @@ from app.features.reserve.schemas.cast.cast_station_schema import (
 )
 from app.features.reserve.service.cast.cast_station_service import suggest_stations, update_station
 from typing import List
+import logging
 
 from app.features.reserve.schemas.cast.cast_course_schema import CastCourseListResponse
 from app.features.reserve.service.cast.cast_course_service import get_cast_courses, get_all_courses, get_filtered_courses
 
 
 cast_router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @cast_router.post("/station/suggest", response_model=List[StationSuggestResponse])
 def get_suggested_stations(request: StationSuggestRequest, db: Session = Depends(get_db)):
@@ -41,7 +43,7 @@ from app.features.reserve.service.cast.cast_rsvelist_service import get_cast_res
 from app.features.reserve.schemas.cast.cast_rsvelist_schema import CastRsveListResponse
 
 @cast_router.post("/rsvelist", response_model=CastRsveListResponse)
-def cast_reservation_list(request: dict, db: Session = Depends(get_db)):
+def cast_reservation_list(request: dict, db: Session = Depends(get_read_db)):
     cast_id = request.get("cast_id")
     page = request.get("page", 1)
     limit = request.get("limit", 10)
@@ -68,17 +70,13 @@ def fetch_reservation_detail(request: dict, db: Session = Depends(get_db)):
     response = get_reservation_detail(db, reservation_id, cast_id)
     
     # デバッグ用: レスポンスの内容をログに出力
-    print(f"DEBUG - 予約詳細レスポンス: {response.dict()}")
-    print(f"DEBUG - オプション情報: {response.options}")
-    print(f"DEBUG - オプション料金合計: {response.options_fee}")
+    logger.debug("予約詳細レスポンス: %s", response)
     
     # 指名料、オプション料金、交通費、合計金額の詳細をログに出力
-    print(f"DEBUG - 料金詳細:")
-    print(f"  - 指名料: {response.designation_fee}")
-    print(f"  - オプション料金: {response.options_fee}")
-    print(f"  - 交通費: {response.traffic_fee}")
-    print(f"  - 予約基本料金: {response.reservation_fee}")
-    print(f"  - 合計金額: {response.total_points}")
+    logger.debug(
+        "料金詳細: 指名料=%s, オプション料金=%s, 交通費=%s, 予約基本料金=%s, 合計金額=%s",
+        response.designation_fee, response.options_fee, response.traffic_fee, response.reservation_fee, response.total_points,
+    )
     
     return response
 
@@ -113,15 +111,15 @@ def edit_reservation_endpoint(request: CastReservationEditRequest, db: Session =
     更新と同時にステータス履歴を追加し、オプションを入れ替える
     """
     # リクエストデータをデバッグ出力
-    print(f"DEBUG - [編集API] リクエストデータ: {request}")
-    print(f"DEBUG - [編集API] 予約ID: {request.reservation_id}")
-    print(f"DEBUG - [編集API] キャストID: {request.cast_id}")
-    print(f"DEBUG - [編集API] 選択オプション: {request.option_ids}")
-    print(f"DEBUG - [編集API] カスタムオプション: {request.custom_options}")
+    logger.debug("[編集API] リクエストデータ: %s", request)
+    logger.debug("[編集API] 予約ID: %s", request.reservation_id)
+    logger.debug("[編集API] キャストID: %s", request.cast_id)
+    logger.debug("[編集API] 選択オプション: %s", request.option_ids)
+    logger.debug("[編集API] カスタムオプション: %s", request.custom_options)
     
     # カスタムオプションの詳細をログ出力
     for i, opt in enumerate(request.custom_options):
-        print(f"DEBUG - [編集API] カスタムオプション #{i+1}: 名前={opt.name}, 価格={opt.price}")
+        logger.debug("[編集API] カスタムオプション #%s: 名前=%s, 価格=%s", i + 1, opt.name, opt.price)
     
     # 予約編集処理を実行
     response = edit_reservation(db, request)
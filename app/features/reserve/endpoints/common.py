@@ -2,18 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.features.reserve.repositories.common.get_message_repository import fetch_db_messages
 import logging
 
 common_router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @common_router.post("/test")
 def test_common():
     return {"message": "Common endpoint is working"}
 
 @common_router.post("/messages_get")
-def fetch_messages(request: dict, db: Session = Depends(get_db)):
+def fetch_messages(request: dict, db: Session = Depends(get_read_db)):
     user_id = request.get("user_id")
     reservation_id = request.get("reservation_id")
 
@@ -46,7 +47,6 @@ from app.features.reserve.change_status.hooks.change_status.change_status_schema
 from app.features.reserve.change_status.hooks.change_status.change_status import change_status
 
 import importlib
-import traceback
 
 @common_router.post("/change_status/{next_status}")
 def change_status_endpoint(
@@ -66,7 +66,7 @@ def change_status_endpoint(
     このルールにより、新しいステータスを追加する際に `{next_status}_service.py` を作るだけで対応可能。
     """
     try:
-        logging.info(f"🟡 next_status={next_status}, 受信データ: {request.dict()}")
+        logger.debug("🟡 next_status=%s, 受信データ: %s", next_status, request)
 
         # 動的に `{next_status}/{next_status}_service.py` を読み込む
         service_module_name = f"app.features.reserve.change_status.{next_status}.{next_status}_service"
@@ -75,7 +75,7 @@ def change_status_endpoint(
             service_module = importlib.import_module(service_module_name)
             if hasattr(service_module, "run_action"):
                 action_result = service_module.run_action(db, request.reservation_id, request.user_id)
-                logging.info(f"{service_module_name}.run_action() を実行しました。")
+                logger.debug("%s.run_action() を実行しました。", service_module_name)
 
                 # ✅ `status` が "OK" の場合 → ステータス更新を実行
                 if action_result.get("status") == "OK":
@@ -92,10 +92,10 @@ def change_status_endpoint(
                 return action_result  
 
             else:
-                logging.info(f"{service_module_name} に run_action() が定義されていません。スルー。")
+                logger.debug("%s に run_action() が定義されていません。スルー。", service_module_name)
 
         except ModuleNotFoundError:
-            logging.info(f"{service_module_name} が見つかりません。個別処理なしで進行。")
+            logger.debug("%s が見つかりません。個別処理なしで進行。", service_module_name)
 
         # ✅ `run_action()` がない場合でも `change_status()` を実行
         return change_status(
@@ -108,6 +108,5 @@ def change_status_endpoint(
         )
 
     except Exception as e:
-        logging.error(f"🚨 エラー発生: {str(e)}")
-        logging.error(traceback.format_exc())
+        logger.exception("🚨 エラー発生: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,7 @@
 # app/features/reserve/endpoints/customer.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.features.reserve.schemas.customer.offer_schema import OfferReservationResponse
 from app.features.reserve.service.customer.offer_service import create_reservation
 from sqlalchemy.orm import Session
@@ -15,13 +15,16 @@ from app.features.reserve.service.customer.customer_course_service import get_av
 from app.features.reserve.schemas.customer.offer_schema import OfferReservationCreate, OfferReservationResponse
 from app.features.reserve.schemas.customer.customer_rsvelist_schema import CustomerRsveListResponse
 from app.features.reserve.service.customer.customer_rsvelist_service import get_customer_reservation_list
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 customer_router = APIRouter()
 
 @customer_router.post("/offer", response_model=OfferReservationResponse)
 def offer_reservation(data: OfferReservationCreate, db: Session = Depends(get_db)):
-    print("📡 受け取ったデータ:", data.model_dump())  # ✅ ここで受信データを確認
+    logger.debug("📡 受け取ったデータ: %s", data)  # ✅ ここで受信データを確認
     return create_reservation(db, data)
 
 
@@ -52,12 +55,12 @@ def get_courses(request: dict, db: Session = Depends(get_db)):
     if not courses:
         raise HTTPException(status_code=404, detail="該当するコースがありません")
 
-    print("✅ APIレスポンス:", courses)  # ✅ デバッグ用のログ追加
+    logger.debug("✅ APIレスポンス: %s", courses)  # ✅ デバッグ用のログ追加
     return courses
 
 # ✅ 予約一覧取得API（ページネーション対応）
 @customer_router.post("/rsvelist", response_model=CustomerRsveListResponse)
-def get_reservation_list(request: dict, db: Session = Depends(get_db)):
+def get_reservation_list(request: dict, db: Session = Depends(get_read_db)):
     user_id = request.get("user_id")
     page = request.get("page", 1)
     limit = request.get("limit", 10)
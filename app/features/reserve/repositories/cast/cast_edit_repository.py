@@ -9,6 +9,9 @@ from app.features.reserve.schemas.cast.cast_edit_schema import CustomOption
 
 
 from app.db.models.station import Station
+import logging
+
+logger = logging.getLogger(__name__)
 
 def update_reservation(db: Session, reservation_data: dict):
     """予約情報を更新する
@@ -55,7 +58,7 @@ def update_reservation(db: Session, reservation_data: dict):
                     reservation.latitude = station.lat
                     reservation.longitude = station.lon
             except Exception as e:
-                print(f"DEBUG - 駅情報取得エラー: {e}")
+                logger.warning("駅情報取得エラー: %s", e)
         # 2. 「緯度,経度」フォーマットの場合
         else:
             try:
@@ -65,7 +68,7 @@ def update_reservation(db: Session, reservation_data: dict):
                     reservation.latitude = float(latitude.strip())
                     reservation.longitude = float(longitude.strip())
             except (ValueError, AttributeError) as e:
-                print(f"DEBUG - 位置情報解析エラー: {e}")
+                logger.warning("位置情報解析エラー: %s", e)
                 # フォーマットが不正な場合は位置情報更新をスキップ
                 pass
         
@@ -111,22 +114,22 @@ def update_reservation_options(
 ) -> bool:
     """予約オプションを全て入れ替える"""
     
-    print(f"DEBUG - [リポジトリ層] オプション更新開始: 予約ID={reservation_id}")
-    print(f"DEBUG - [リポジトリ層] 選択オプション: {option_ids}")
-    print(f"DEBUG - [リポジトリ層] カスタムオプション数: {len(custom_options)}個")
+    logger.debug("[リポジトリ層] オプション更新開始: 予約ID=%s", reservation_id)
+    logger.debug("[リポジトリ層] 選択オプション: %s", option_ids)
+    logger.debug("[リポジトリ層] カスタムオプション数: %s個", len(custom_options))
     
     try:
         # リクエスト内容をDBログに残す（デバッグ用）
-        print(f"DEBUG - [リポジトリ層] カスタムオプション内容:")
+        logger.debug("[リポジトリ層] カスタムオプション内容:")
         for i, opt in enumerate(custom_options):
-            print(f"  #{i+1}: name={opt.name}, price={opt.price}")
+            logger.debug("  #%s: name=%s, price=%s", i + 1, opt.name, opt.price)
     
         # 既存のオプションをすべて物理削除（完全に削除して再作成する方式に変更）
         db.query(ResvReservationOption).filter(
             ResvReservationOption.reservation_id == reservation_id
         ).delete(synchronize_session=False)
         
-        print(f"DEBUG - [リポジトリ層] 既存オプションをすべて物理削除済み")
+        logger.debug("[リポジトリ層] 既存オプションをすべて物理削除済み")
         
         # マスターオプションを登録
         for option_id in option_ids:
@@ -138,12 +141,12 @@ def update_reservation_options(
             option_price = 0
             if master_option:
                 option_price = master_option.price
-                print(f"DEBUG - [リポジトリ層] マスターオプション取得: ID={option_id}, 価格={option_price}")
+                logger.debug("[リポジトリ層] マスターオプション取得: ID=%s, 価格=%s", option_id, option_price)
             else:
-                print(f"DEBUG - [リポジトリ層] マスターオプション未取得: ID={option_id}")
+                logger.debug("[リポジトリ層] マスターオプション未取得: ID=%s", option_id)
             
             # 新規オプションとして追加
-            print(f"DEBUG - [リポジトリ層] オプション追加: ID={option_id}, 価格={option_price}")
+            logger.debug("[リポジトリ層] オプション追加: ID=%s, 価格=%s", option_id, option_price)
             option = ResvReservationOption(
                 reservation_id=reservation_id,
                 option_id=option_id,
@@ -159,13 +162,13 @@ def update_reservation_options(
         for i, custom in enumerate(custom_options):
             # 同じ名前のカスタムオプションがすでに処理されていれば、重複としてスキップ
             if custom.name in custom_option_names:
-                print(f"DEBUG - [リポジトリ層] カスタムオプション重複スキップ: 名前={custom.name}")
+                logger.debug("[リポジトリ層] カスタムオプション重複スキップ: 名前=%s", custom.name)
                 continue
                 
             # 名前を追跡リストに追加
             custom_option_names.add(custom.name)
             
-            print(f"DEBUG - [リポジトリ層] カスタムオプション追加 #{i+1}: 名前={custom.name}, 価格={custom.price}")
+            logger.debug("[リポジトリ層] カスタムオプション追加 #%s: 名前=%s, 価格=%s", i + 1, custom.name, custom.price)
             option = ResvReservationOption(
                 reservation_id=reservation_id,
                 option_id=0,  # カスタムオプションの場合は0を設定
@@ -175,21 +178,22 @@ def update_reservation_options(
             )
             db.add(option)
         
-        # 最終的な状態を確認
-        all_options = db.query(ResvReservationOption).filter(
-            ResvReservationOption.reservation_id == reservation_id
-        ).all()
-        
-        print(f"DEBUG - [リポジトリ層] オプション更新後の総数: {len(all_options)}個")
-        print(f"DEBUG - [リポジトリ層] アクティブなオプション数: {len([o for o in all_options if o.status == 'active'])}個")
-        print(f"DEBUG - [リポジトリ層] カスタムオプション数: {len([o for o in all_options if o.status == 'active' and o.option_id == 0])}個")
+        # 最終的な状態を確認（確認用のSELECTはDEBUG時のみ実行）
+        if logger.isEnabledFor(logging.DEBUG):
+            all_options = db.query(ResvReservationOption).filter(
+                ResvReservationOption.reservation_id == reservation_id
+            ).all()
+
+            logger.debug("[リポジトリ層] オプション更新後の総数: %s個", len(all_options))
+            logger.debug("[リポジトリ層] アクティブなオプション数: %s個", len([o for o in all_options if o.status == 'active']))
+            logger.debug("[リポジトリ層] カスタムオプション数: %s個", len([o for o in all_options if o.status == 'active' and o.option_id == 0]))
         
         # コミット
         db.commit()
-        print(f"DEBUG - [リポジトリ層] オプション更新完了: コミット成功")
+        logger.debug("[リポジトリ層] オプション更新完了: コミット成功")
         return True
     except Exception as e:
-        print(f"ERROR - [リポジトリ層] オプション更新中にエラー発生: {str(e)}")
+        logger.error("[リポジトリ層] オプション更新中にエラー発生: %s", str(e))
         db.rollback()
         return False
 
@@ -4,12 +4,15 @@ from app.db.models.resv_reservation import ResvReservation
 from app.features.reserve.schemas.customer.offer_schema import OfferReservationCreate
 from app.db.models.point_details import PointDetailsCourse  # ✅ コースモデルをimport
 from app.db.models.cast_common_prof import CastCommonProf  # ✅ キャストモデルをimport
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ JST (UTC+9) のタイムゾーンオブジェクト
 JST = timezone(timedelta(hours=9))
 
 def save_reservation(db: Session, data: OfferReservationCreate, start_time: datetime) -> ResvReservation:
-    print("📡 save_reservation: 開始")  # ✅ デバッグログ
+    logger.debug("📡 save_reservation: 開始")  # ✅ デバッグログ
 
     # ✅ `start_time` を JST に統一
     if start_time.tzinfo is None or start_time.tzinfo.utcoffset(start_time) is None:
@@ -41,7 +44,7 @@ def save_reservation(db: Session, data: OfferReservationCreate, start_time: date
     option_points = 0  # 現状は 0 に固定
     total_points = course_points + option_points + reservation_fee
 
-    print(f"📡 予約データ準備完了: course_id={course_id}, course_points={course_points}, reservation_fee={reservation_fee}, total_points={total_points}, start_time={start_time}")  # ✅ 確認用ログ
+    logger.debug("📡 予約データ準備完了: course_id=%s, course_points=%s, reservation_fee=%s, total_points=%s, start_time=%s", course_id, course_points, reservation_fee, total_points, start_time)  # ✅ 確認用ログ
 
     # ✅ 予約データの作成
     reservation = ResvReservation(
@@ -64,12 +67,12 @@ def save_reservation(db: Session, data: OfferReservationCreate, start_time: date
         # ✅ created_at, updated_at は **削除**（DBに任せる）
     )
 
-    print("📡 予約データをDBに追加")  # ✅ DBに追加する直前
+    logger.debug("📡 予約データをDBに追加")  # ✅ DBに追加する直前
 
     # ✅ DBに保存
     db.add(reservation)
     db.commit()
     db.refresh(reservation)
 
-    print("✅ 予約データ保存完了")  # ✅ ここまで来ているか確認
+    logger.debug("✅ 予約データ保存完了")  # ✅ ここまで来ているか確認
     return reservation
@@ -7,6 +7,9 @@ from app.features.reserve.schemas.cast.cast_course_schema import (
     CourseResponse
 )
 from app.features.reserve.repositories.cast.cast_course_repository import get_cast_type
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def get_cast_courses(db: Session, cast_id: int) -> CastCourseListResponse:
@@ -39,7 +42,7 @@ def get_all_courses(db: Session) -> CastCourseListResponse:
     全てのアクティブなコース一覧を取得する
     """
     # デバッグログを追加
-    print(f"DEBUG - 全コース取得処理開始")
+    logger.debug("全コース取得処理開始")
     
     # 全てのアクティブなコースを取得、duration_minutesで並べ替え
     courses_db = db.query(PointDetailsCourse).filter(
@@ -47,7 +50,7 @@ def get_all_courses(db: Session) -> CastCourseListResponse:
     ).order_by(PointDetailsCourse.duration_minutes).all()
     
     # デバッグログ
-    print(f"DEBUG - 全アクティブコース数: {len(courses_db)}")
+    logger.debug("全アクティブコース数: %s", len(courses_db))
     
     courses = [
         CourseResponse(
@@ -62,9 +65,9 @@ def get_all_courses(db: Session) -> CastCourseListResponse:
     ]
     
     # デバッグログ
-    print(f"DEBUG - 返却コース数: {len(courses)}")
+    logger.debug("返却コース数: %s", len(courses))
     for course in courses:
-        print(f"DEBUG - コース情報: ID={course.id}, 名前={course.course_name}, タイプ={course.course_type}, 時間={course.duration_minutes}, ポイント={course.cast_reward_points}")
+        logger.debug("コース情報: ID=%s, 名前=%s, タイプ=%s, 時間=%s, ポイント=%s", course.id, course.course_name, course.course_type, course.duration_minutes, course.cast_reward_points)
     
     return CastCourseListResponse(courses=courses)
 
@@ -80,13 +83,13 @@ def get_filtered_courses(db: Session, cast_id: int = None) -> CastCourseListResp
         CastCourseListResponse: フィルタリングされたコース一覧
     """
     # デバッグログ
-    print(f"DEBUG - フィルタリングコース取得処理開始 cast_id={cast_id}")
+    logger.debug("フィルタリングコース取得処理開始 cast_id=%s", cast_id)
     
     # キャストIDが指定されている場合、キャストタイプを取得
     cast_type = None
     if cast_id:
         cast_type = get_cast_type(db, cast_id)
-        print(f"DEBUG - キャストタイプ: {cast_type}")
+        logger.debug("キャストタイプ: %s", cast_type)
     
     # 基本クエリ: アクティブなコースのみ
     query = db.query(PointDetailsCourse).filter(PointDetailsCourse.is_active == True)
@@ -108,7 +111,7 @@ def get_filtered_courses(db: Session, cast_id: int = None) -> CastCourseListResp
     courses_db = query.order_by(PointDetailsCourse.duration_minutes).all()
     
     # デバッグログ
-    print(f"DEBUG - フィルタリング後のコース数: {len(courses_db)}")
+    logger.debug("フィルタリング後のコース数: %s", len(courses_db))
     
     # レスポンス形式に変換
     courses = [
@@ -125,6 +128,6 @@ def get_filtered_courses(db: Session, cast_id: int = None) -> CastCourseListResp
     
     # デバッグログ
     for course in courses:
-        print(f"DEBUG - フィルタリング後コース情報: ID={course.id}, 名前={course.course_name}, タイプ={course.course_type}, 時間={course.duration_minutes}, ポイント={course.cast_reward_points}")
+        logger.debug("フィルタリング後コース情報: ID=%s, 名前=%s, タイプ=%s, 時間=%s, ポイント=%s", course.id, course.course_name, course.course_type, course.duration_minutes, course.cast_reward_points)
     
     return CastCourseListResponse(courses=courses)
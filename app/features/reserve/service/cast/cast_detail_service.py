@@ -11,6 +11,9 @@ from app.db.models.cast_common_prof import CastCommonProf
 from app.db.models.resv_status_detail import ResvStatusDetail # 追加: ResvStatusDetailをインポート
 from app.features.reserve.schemas.cast.cast_detail_schema import CastReservationDetailResponse, OptionDetail
 from fastapi import HTTPException
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_reservation_detail(db: Session, reservation_id: int, cast_id: int) -> CastReservationDetailResponse:
     """
@@ -131,11 +134,11 @@ def get_reservation_detail(db: Session, reservation_id: int, cast_id: int) -> Ca
                     name = f"オプション{option.option_id}"
                     price = option.option_price if option.option_price is not None else 0
             except Exception as e:
-                print(f"DEBUG - オプションマスター取得エラー: {e}")
+                logger.warning("オプションマスター取得エラー: %s", e)
                 name = f"オプション{option.option_id}"
                 price = option.option_price if option.option_price is not None else 0
         
-        print(f"DEBUG - オプション処理: option_id={option.option_id}, name={name}, price={price}, is_custom={is_custom}")
+        logger.debug("オプション処理: option_id=%s, name=%s, price=%s, is_custom=%s", option.option_id, name, price, is_custom)
         
         # オプション情報をリストに追加
         option_detail = OptionDetail(
@@ -149,15 +152,15 @@ def get_reservation_detail(db: Session, reservation_id: int, cast_id: int) -> Ca
         # 合計金額に加算
         options_fee += price
     
-    print(f"DEBUG - オプション処理完了: 合計{options_fee}円、{len(options)}件のオプション")
+    logger.debug("オプション処理完了: 合計%s円、%s件のオプション", options_fee, len(options))
     
     # 指名料とコース料金を取得
     designation_fee = reservation.get("designation_fee") or 0
     course_fee = reservation.get("course_fee") or 0
     
-    print(f"DEBUG - 料金情報:")
-    print(f"  - 指名料: {designation_fee}")
-    print(f"  - コース料金（キャスト報酬）: {course_fee}")
+    logger.debug("料金情報:")
+    logger.debug("  - 指名料: %s", designation_fee)
+    logger.debug("  - コース料金（キャスト報酬）: %s", course_fee)
     
     # レスポンスの構築
     response = CastReservationDetailResponse(
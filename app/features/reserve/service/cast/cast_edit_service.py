@@ -14,6 +14,9 @@ from app.features.reserve.repositories.cast.cast_edit_repository import (
     update_reservation_options
 )
 from app.db.models.resv_reservation import ResvReservation
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def edit_reservation(
@@ -85,13 +88,13 @@ def edit_reservation(
     )
     
     # 4. オプションの全入れ替え
-    print(f"DEBUG - [サービス層] オプション更新処理開始: 予約ID={req.reservation_id}")
-    print(f"DEBUG - [サービス層] 選択オプション: {req.option_ids}")
-    print(f"DEBUG - [サービス層] カスタムオプション数: {len(req.custom_options)}個")
+    logger.debug("[サービス層] オプション更新処理開始: 予約ID=%s", req.reservation_id)
+    logger.debug("[サービス層] 選択オプション: %s", req.option_ids)
+    logger.debug("[サービス層] カスタムオプション数: %s個", len(req.custom_options))
     
     # カスタムオプションの詳細をログ出力
     for i, opt in enumerate(req.custom_options):
-        print(f"DEBUG - [サービス層] カスタムオプション #{i+1}: 名前={opt.name}, 価格={opt.price}")
+        logger.debug("[サービス層] カスタムオプション #%s: 名前=%s, 価格=%s", i + 1, opt.name, opt.price)
     
     try:
         options_updated = update_reservation_options(
@@ -102,16 +105,16 @@ def edit_reservation(
         )
         
         if not options_updated:
-            print(f"ERROR - [サービス層] オプション更新失敗: 予約ID={req.reservation_id}")
+            logger.error("[サービス層] オプション更新失敗: 予約ID=%s", req.reservation_id)
             return CastReservationEditResponse(
                 success=False,
                 message="オプションの更新に失敗しました",
                 reservation_id=req.reservation_id
             )
         
-        print(f"DEBUG - [サービス層] オプション更新成功: 予約ID={req.reservation_id}")
+        logger.debug("[サービス層] オプション更新成功: 予約ID=%s", req.reservation_id)
     except Exception as e:
-        print(f"ERROR - [サービス層] オプション更新例外発生: {str(e)}")
+        logger.error("[サービス層] オプション更新例外発生: %s", str(e))
         return CastReservationEditResponse(
             success=False,
             message=f"オプションの更新中にエラーが発生しました: {str(e)}",
@@ -11,13 +11,16 @@ from app.db.models.cast_common_prof import CastCommonProf
 from app.db.models.cast_rank import CastRank
 from sqlalchemy.exc import IntegrityError
 from typing import Any, Dict
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("/update")
 def update_profile(request: ProfileUpdateRequest, db: Session = Depends(get_db)):
     setup_repo = SetupStatusRepository(db)
-    print("Received Request:", request.dict())
+    logger.debug("Received Request: %s", request)
 
     # ユーザーが存在するか確認
     user = db.query(User).filter(User.id == request.user_id).first()
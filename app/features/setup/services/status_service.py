@@ -6,6 +6,9 @@ from app.features.media.services.media_delete import delete_s3_file
 from app.features.media.repositories.media_repository import delete_media_records
 from app.db.models.media_files import MediaFile
 from app.db.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def delete_cast_profile(user_id: int, db: Session):
@@ -37,24 +40,24 @@ def delete_user_media_files(user_id: int, db: Session):
     media_files = db.query(MediaFile).filter(MediaFile.target_id == user_id).all()
 
     if not media_files:
-        print("[INFO] ℹ️ 削除対象のメディアなし")
+        logger.debug("ℹ️ 削除対象のメディアなし")
         return False
 
-    print(f"[INFO] 🗑️ ユーザー {user_id} のメディア {len(media_files)} 件を削除")
+    logger.debug("🗑️ ユーザー %s のメディア %s 件を削除", user_id, len(media_files))
 
     # ✅ 2. S3 から削除
     for media in media_files:
-        print(f"[INFO] 🗑️ S3 から削除するファイル: {media.file_url}")
+        logger.debug("🗑️ S3 から削除するファイル: %s", media.file_url)
         if not delete_s3_file(media.file_url):
-            print(f"[ERROR] ❌ S3 の削除に失敗: {media.file_url}")
+            logger.error("❌ S3 の削除に失敗: %s", media.file_url)
             continue  # 失敗しても次の処理を続行
 
     # ✅ 3. DB から削除
-    print("[INFO] 🗑️ DB からメディア削除を開始")
+    logger.debug("🗑️ DB からメディア削除を開始")
     for media in media_files:
         delete_media_records(db, media.target_type, media.target_id, media.order_index)
 
-    print("[INFO] ✅ 画像削除成功")
+    logger.info("✅ 画像削除成功")
     return True
 
 def update_user_setup_status(user_id: int, db: Session):
@@ -69,4 +72,4 @@ def update_user_setup_status(user_id: int, db: Session):
     if user:
         user.setup_status = "completed"
         db.commit()
-        print(f"[INFO] ✅ ユーザー {user_id} の setup_status を 'completed' に更新")
\ No newline at end of file
+        logger.info("✅ ユーザー %s の setup_status を 'completed' に更新", user_id)
\ No newline at end of file
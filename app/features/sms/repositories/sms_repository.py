@@ -6,6 +6,9 @@ from app.db.models.user import User  # ✅ ORMモデルのインポート
 from sqlalchemy import and_
 from datetime import datetime
 import pytz
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class SMSRepository:
@@ -35,10 +38,10 @@ class SMSRepository:
                 PhoneNumber=phone_number,
                 Message=message
             )
-            print(f"✅ SMS送信成功: MessageId: {response.get('MessageId')}")
+            logger.debug("✅ SMS送信成功: MessageId: %s", response.get('MessageId'))
             return True
         except Exception as e:
-            print(f"❌ SMS送信失敗: {e}")
+            logger.error("❌ SMS送信失敗: %s", e)
             return False
 
     def save_verification_code(self, user_id: int, phone: str, code: str):
@@ -50,10 +53,10 @@ class SMSRepository:
             user = self.db.query(User).filter(User.id == user_id).first()
 
             if not user:
-                print(f"❌ User ID {user_id} not found.")
+                logger.warning("❌ User ID %s not found.", user_id)
                 return False
 
-            print(f"✅ 更新前: mobile_phone={user.mobile_phone}, code={user.phone_verification_code}")
+            logger.debug("✅ 更新前: mobile_phone=%s, code=%s", user.mobile_phone, user.phone_verification_code)
 
             # ✅ JSTの現在時刻を取得
             jst = pytz.timezone('Asia/Tokyo')
@@ -69,7 +72,7 @@ class SMSRepository:
             self.db.commit()       # ✅ コミットで確定
             self.db.refresh(user)  # ✅ オブジェクトの最新化
 
-            print(f"✅ 更新後: mobile_phone={user.mobile_phone}, code={user.phone_verification_code}, updated_at={user.updated_at}")
+            logger.debug("✅ 更新後: mobile_phone=%s, code=%s, updated_at=%s", user.mobile_phone, user.phone_verification_code, user.updated_at)
 
             # 4️⃣ SMS送信
             message = f"[認証コード] {code}（5分以内に入力してください）"
@@ -77,7 +80,7 @@ class SMSRepository:
 
         except Exception as e:
             self.db.rollback()
-            print(f"❌ 認証コードの保存エラー: {e}")
+            logger.error("❌ 認証コードの保存エラー: %s", e)
             return False
         
     def verify_code(self, user_id: int, code: str) -> bool:
@@ -90,7 +93,7 @@ class SMSRepository:
         ).first()
 
         if not user:
-            print("❌ 認証コードが一致しません")
+            logger.warning("❌ 認証コードが一致しません")
             return False
 
         try:
@@ -102,9 +105,9 @@ class SMSRepository:
             self.db.commit()
             self.db.refresh(user)
 
-            print("✅ 電話番号認証が完了しました")
+            logger.debug("✅ 電話番号認証が完了しました")
             return True
         except Exception as e:
             self.db.rollback()
-            print(f"❌ 認証処理エラー: {e}")
+            logger.error("❌ 認証処理エラー: %s", e)
             return False
@@ -3,15 +3,13 @@ from app.api.v1.routers.master_router import master_router  # 直接指定
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.core.config import FRONTEND_URL  # 追加
+from app.db.read_routing import ReadYourWritesMiddleware, READ_PRIMARY_UNTIL_HEADER
+from app.db.query_stats import QueryStatsMiddleware
+from app.core.logging_config import setup_logging, RequestIdMiddleware
 
 
-logging.basicConfig(
-    level=logging.INFO,  # INFO レベルのログを出力
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()  # ターミナルに出力
-    ]
-)
+# ✅ ログ設定（LOG_LEVEL / LOG_LEVELS / LOG_FORMAT / LOG_DEBUG_SAMPLE_RATE）
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +23,15 @@ app.include_router(master_router, prefix="/api/v1")
 def root():
     return {"msg": "Hello from github!"}
 
+# ✅ 書き込み直後の読み込みをプライマリに向ける（CORSより内側で動かす）
+app.add_middleware(ReadYourWritesMiddleware)
+
+# ✅ リクエストごとのSQL件数・DB時間をヘッダーとログに出す（N+1の検出）
+app.add_middleware(QueryStatsMiddleware)
+
+# ✅ リクエストIDを発行してログに付ける（他のミドルウェアのログにも付くよう外側で動かす）
+app.add_middleware(RequestIdMiddleware)
+
 origins = [
     FRONTEND_URL,
     "http://localhost:3000",  # 必要ならローカルも追加
@@ -38,4 +45,5 @@ app.add_middleware(
     allow_credentials=True,  # `withCredentials: true` を許可
     allow_methods=["*"],  # すべてのHTTPメソッドを許可
     allow_headers=["*"],  # すべてのヘッダーを許可
+    expose_headers=[READ_PRIMARY_UNTIL_HEADER],  # ✅ 書き込み後にプライマリから読む期限をフロントで読めるようにする
 )
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+FAQ検索のベンチマーク・評価
+
+ラベル付きクエリ（query → 正解article_id）と固定のFAQストアを使い、
+retrieve_faqs の検索レイテンシ・メモリ使用量・recall@k・MRR を計測してJSONで出力する。
+
+Embedding（--embedder）
+    stub      文字n-gramをハッシュした決定的なベクトル（既定）。FAQ側も同じ方法で作り直すため、
+              OpenAI APIなしでベクトル検索の経路（類似度の閾値・加重和・FAQにない質問）まで毎回同じ結果で計測できる。
+              意味の近さは捉えないため、言い換えの recall は実際のモデルより低く出る
+    recorded  実際のモデルで記録したクエリEmbeddingと保存済みのFAQベクトル。
+              記録のないクエリがあればエラー（--record でOpenAI APIから取得して保存する）
+
+クエリの種類（kind）
+    title      FAQタイトルそのまま
+    paraphrase 言い換え（ベクトル検索で拾えるか）
+    superset   FAQタイトルを含むが別のことも聞いている質問（語彙検索だけで答えると誤答しやすい）
+    off_topic  FAQにない質問（article_ids は空、何も返さないのが正解）
+
+    python -m app.scripts.benchmark_faq --output bench.json
+    python -m app.scripts.benchmark_faq --baseline bench.json   # 劣化していれば終了コード1
+    python -m app.scripts.benchmark_faq --embedder recorded --record   # 未記録のクエリEmbeddingを取得して保存
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+from app.features.linebot.services.faq_index import FaqIndex
+from app.features.linebot.services.faq_store import FAQ_VECTORS_PATH, FAQ_META_PATH
+from app.features.linebot.services.faq_lexical import char_ngrams
+from app.features.linebot.services.faq_search import retrieve_faqs
+from app.core.config import (
+    FAQ_SIMILARITY_THRESHOLD,
+    FAQ_LEXICAL_CONFIDENCE,
+    FAQ_LEXICAL_THRESHOLD,
+    FAQ_LEXICAL_WEIGHT,
+)
+
+BENCHMARK_QUERIES_PATH = 'app/data/faq_benchmark/queries.json'
+BENCHMARK_EMBEDDINGS_PATH = 'app/data/faq_benchmark/embeddings.npz'
+
+# ベースラインと比較して劣化とみなす幅
+RECALL_TOLERANCE = 0.01
+MRR_TOLERANCE = 0.01
+PRECISION_TOLERANCE = 0.01
+LATENCY_TOLERANCE = 1.5  # p99がベースラインの何倍を超えたら劣化とみなすか
+
+# スタブEmbeddingの次元数（本番の text-embedding-ada-002 と同じにしてメモリ使用量をそろえる）
+STUB_DIMENSIONS = 1536
+STUB_NGRAM_SIZES = (1, 2, 3)
+
+
+class StubEmbedder:
+    """
+    文字n-gramをハッシュで固定次元に写す決定的なEmbedding（OpenAI APIもFAQのベクトルも使わない）
+    """
+
+    def __init__(self, dimensions: int = STUB_DIMENSIONS, ngram_sizes: tuple = STUB_NGRAM_SIZES):
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+
+    def __call__(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for n in self.ngram_sizes:
+            for gram in char_ngrams(text, n):
+                digest = hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest()
+                position = int.from_bytes(digest[:4], 'little') % self.dimensions
+                vector[position] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+
+class RecordedEmbeddings:
+    """
+    記録済みのクエリEmbedding（texts / vectors の npz）
+    """
+
+    def __init__(self, path: str, record: bool = False):
+        self.path = path
+        self.record = record
+        self.vectors = {}
+        self.dirty = False
+        if os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            self.vectors = {str(text): vector for text, vector in zip(data["texts"], data["vectors"])}
+
+    def __call__(self, text: str):
+        vector = self.vectors.get(text)
+        if vector is None:
+            if not self.record:
+                raise KeyError(f"記録済みEmbeddingがありません（--record で取得してください）: {text}")
+            from app.features.linebot.services.openai_client import get_embedding
+            vector = np.asarray(get_embedding(text), dtype=np.float32)
+            self.vectors[text] = vector
+            self.dirty = True
+        return vector
+
+    def missing(self, texts: list) -> list:
+        return [text for text in dict.fromkeys(texts) if text not in self.vectors]
+
+    def save(self):
+        if not self.dirty:
+            return
+        texts = list(self.vectors)
+        np.savez(self.path, texts=np.array(texts), vectors=np.array([self.vectors[t] for t in texts], dtype=np.float32))
+        print(f"✅ クエリEmbeddingを保存しました: {self.path} ({len(texts)}件)")
+
+
+def index_nbytes(index: FaqIndex) -> int:
+    """
+    インデックスが保持する配列の合計バイト数
+    """
+    total = index.matrix.nbytes + sum(mask.nbytes for mask in index.sex_masks.values())
+    total += index.lexical.self_scores.nbytes
+    total += sum(doc_ids.nbytes + weights.nbytes for doc_ids, weights in index.lexical.postings.values())
+    return total
+
+
+def ratio(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+def summarize(runs: list, k: int) -> dict:
+    """
+    クエリごとの結果の集計
+    """
+    positives = [run for run in runs if run["expected"]]
+    negatives = [run for run in runs if not run["expected"]]
+    return {
+        "queries": len(runs),
+        f"recall@{k}": ratio(sum(run["hit"] for run in positives), len(positives)),
+        "mrr": round(float(np.mean([run["reciprocal_rank"] for run in positives])), 4) if positives else 0.0,
+        # FAQにない質問に何か返してしまった割合
+        "off_topic_false_positive_ratio": ratio(sum(bool(run["ranked"]) for run in negatives), len(negatives)),
+        "embedding_skipped_ratio": ratio(sum(run["lexical"] for run in runs), len(runs)),
+    }
+
+
+def evaluate(index: FaqIndex, queries: list, embed, k: int, repeat: int, params: dict) -> dict:
+    # ✅ Embeddingの計算・読み出しは計測から除外するため先に解決しておく
+    vectors = {q["query"]: embed(q["query"]) for q in queries}
+
+    latencies = []
+    runs = []
+
+    for q in queries:
+        called = []
+
+        def tracked_embed(text):
+            called.append(text)
+            return vectors[text]
+
+        results = []
+        for _ in range(repeat):
+            called.clear()
+            started = time.perf_counter()
+            results = retrieve_faqs(q["query"], q.get("sex", "NULL"), faq_index=index, embed=tracked_embed, top_k=k, **params)
+            latencies.append(time.perf_counter() - started)
+
+        expected = set(q["article_ids"])
+        ranked = [faq.get("article_id") for faq, _ in results]
+        rank = next((i + 1 for i, article_id in enumerate(ranked) if article_id in expected), None)
+        runs.append({
+            "kind": q.get("kind", "title"),
+            "expected": expected,
+            "ranked": ranked,
+            "lexical": not called,  # Embeddingを呼ばずに語彙検索だけで答えたか
+            "hit": bool(expected & set(ranked[:k])),
+            "reciprocal_rank": 1 / rank if rank else 0.0,
+        })
+
+    # ✅ 語彙検索だけで答えたクエリのうち、1位が正解だった割合（FAQにない質問に答えた場合は誤答）
+    lexical_runs = [run for run in runs if run["lexical"]]
+    lexical_correct = sum(bool(run["ranked"]) and run["ranked"][0] in run["expected"] for run in lexical_runs)
+
+    latencies_us = np.array(latencies) * 1e6
+    return {
+        **summarize(runs, k),
+        "k": k,
+        "lexical_answered": len(lexical_runs),
+        "lexical_precision": ratio(lexical_correct, len(lexical_runs)),
+        "by_kind": {
+            kind: summarize([run for run in runs if run["kind"] == kind], k)
+            for kind in sorted({run["kind"] for run in runs})
+        },
+        "latency_p50_us": round(float(np.percentile(latencies_us, 50)), 2) if latencies else 0.0,
+        "latency_p99_us": round(float(np.percentile(latencies_us, 99)), 2) if latencies else 0.0,
+    }
+
+
+def find_regressions(result: dict, baseline: dict) -> list:
+    regressions = []
+    if baseline.get("embedder", "recorded") != result["embedder"]:
+        # Embeddingが違うと数値を比べられない
+        return [f"embedder: {baseline.get('embedder', 'recorded')} → {result['embedder']}（同じ --embedder で比較してください）"]
+    k = result["k"]
+    recall_key = f"recall@{k}"
+    if recall_key in baseline and result[recall_key] < baseline[recall_key] - RECALL_TOLERANCE:
+        regressions.append(f"{recall_key}: {baseline[recall_key]} → {result[recall_key]}")
+    if result["mrr"] < baseline.get("mrr", 0) - MRR_TOLERANCE:
+        regressions.append(f"mrr: {baseline['mrr']} → {result['mrr']}")
+    if result.get("lexical_precision", 1.0) < baseline.get("lexical_precision", 0) - PRECISION_TOLERANCE:
+        regressions.append(f"lexical_precision: {baseline['lexical_precision']} → {result['lexical_precision']}")
+    false_positive_key = "off_topic_false_positive_ratio"
+    if result[false_positive_key] > baseline.get(false_positive_key, 1.0) + PRECISION_TOLERANCE:
+        regressions.append(f"{false_positive_key}: {baseline[false_positive_key]} → {result[false_positive_key]}")
+    if baseline.get("latency_p99_us") and result["latency_p99_us"] > baseline["latency_p99_us"] * LATENCY_TOLERANCE:
+        regressions.append(f"latency_p99_us: {baseline['latency_p99_us']} → {result['latency_p99_us']}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FAQ検索のベンチマーク")
+    parser.add_argument("--queries", default=BENCHMARK_QUERIES_PATH, help="ラベル付きクエリ（JSON）")
+    parser.add_argument("--embedder", choices=("stub", "recorded"), default="stub", help="クエリ・FAQのEmbedding")
+    parser.add_argument("--embeddings", default=BENCHMARK_EMBEDDINGS_PATH, help="記録済みクエリEmbedding（npz、recorded のみ）")
+    parser.add_argument("--vectors", default=FAQ_VECTORS_PATH, help="FAQベクトル（.npy）")
+    parser.add_argument("--meta", default=FAQ_META_PATH, help="FAQメタデータ（JSON）")
+    parser.add_argument("--record", action="store_true", help="未記録のクエリEmbeddingをOpenAI APIで取得する（recorded のみ）")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20, help="クエリごとの計測回数")
+    parser.add_argument("--similarity-threshold", type=float, default=FAQ_SIMILARITY_THRESHOLD)
+    parser.add_argument("--lexical-confidence", type=float, default=FAQ_LEXICAL_CONFIDENCE)
+    parser.add_argument("--lexical-threshold", type=float, default=FAQ_LEXICAL_THRESHOLD)
+    parser.add_argument("--lexical-weight", type=float, default=FAQ_LEXICAL_WEIGHT)
+    parser.add_argument("--output", help="結果JSONの出力先（省略時は標準出力）")
+    parser.add_argument("--baseline", help="比較するベースラインの結果JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.queries, 'r', encoding='utf-8') as f:
+        queries = json.load(f)
+
+    if args.embedder == "recorded":
+        embed = RecordedEmbeddings(args.embeddings, record=args.record)
+        missing = embed.missing([q["query"] for q in queries])
+        if missing and not args.record:
+            print(
+                f"❌ 記録済みEmbeddingがないクエリが{len(missing)}件あります（--record で取得してください）:\n" + "\n".join(missing),
+                file=sys.stderr,
+            )
+            return 2
+    else:
+        embed = StubEmbedder()
+
+    # ✅ インデックス構築時のメモリ使用量も計測（stub ではFAQの質問文も同じスタブでベクトル化する）
+    tracemalloc.start()
+    index = FaqIndex.load(args.vectors, args.meta)
+    if args.embedder == "stub":
+        index = FaqIndex(index.faqs, np.array([embed(faq.get("question") or "") for faq in index.faqs], dtype=np.float32))
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    params = {
+        "similarity_threshold": args.similarity_threshold,
+        "lexical_confidence": args.lexical_confidence,
+        "lexical_threshold": args.lexical_threshold,
+        "lexical_weight": args.lexical_weight,
+    }
+    try:
+        result = evaluate(index, queries, embed, args.k, args.repeat, params)
+    finally:
+        if args.embedder == "recorded":
+            embed.save()
+
+    result.update({
+        "embedder": args.embedder,
+        "faqs": len(index),
+        "params": params,
+        "index_bytes": index_nbytes(index),
+        "index_build_peak_bytes": build_peak,
+    })
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(result, baseline)
+        if regressions:
+            print("❌ ベースラインから劣化しました:\n" + "\n".join(regressions))
+            return 1
+        print("✅ ベースラインからの劣化はありません。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
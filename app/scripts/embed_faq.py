@@ -1,18 +1,7 @@
 import json
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-def get_embedding(text: str) -> list:
-    """
-    OpenAI APIでテキストをEmbeddingに変換する
-    """
-    response = client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text
-    )
-    return response.data[0].embedding
+from app.features.linebot.services.openai_client import get_embedding
+from app.scripts.faq_text import prepare_answer
+from app.features.linebot.services.faq_store import save_faq_store
 
 def generate_faq_embeddings():
     """
@@ -23,6 +12,7 @@ def generate_faq_embeddings():
         faqs = json.load(f)
 
     embedded_faqs = []
+    embeddings = []
     for faq in faqs:
         question = faq.get('question')
         answer = faq.get('answer')
@@ -33,16 +23,16 @@ def generate_faq_embeddings():
             embedding = get_embedding(question)
             embedded_faqs.append({
                 "question": question,
-                "answer": answer,
+                **prepare_answer(answer),
                 "sex": sex,
                 "category": category,
-                "embedding": embedding
+                "article_id": faq.get('article_id')
             })
+            embeddings.append(embedding)
             print(f"✅ Embedding生成: {question} (性別: {sex}, カテゴリ: {category})")
 
-    # 保存先も確認
-    with open('app/data/microcms_faq_embeddings.json', 'w') as f:
-        json.dump(embedded_faqs, f, indent=4, ensure_ascii=False)
+    # 保存先も確認（.npy + メタデータJSON）
+    save_faq_store(embedded_faqs, embeddings)
 
     print("✅ FAQ Embeddingデータが正常に保存されました。")
 
@@ -0,0 +1,18 @@
+from bs4 import BeautifulSoup
+from app.features.linebot.services.text_utils import normalize_whitespace, estimate_tokens
+
+
+def clean_html(raw_html: str) -> str:
+    """
+    HTMLタグを除去してテキストのみを返す
+    """
+    soup = BeautifulSoup(raw_html, "html.parser")
+    return normalize_whitespace(soup.get_text(separator=' ', strip=True))
+
+
+def prepare_answer(raw_html: str) -> dict:
+    """
+    FAQ回答をリクエスト時に加工不要な形に整える（HTML除去・空白正規化・トークン数）
+    """
+    answer = clean_html(raw_html)
+    return {"answer": answer, "answer_tokens": estimate_tokens(answer)}
@@ -1,9 +1,12 @@
-import json
+import hashlib
+import os
 import requests
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY, MICROCMS_API_URL, MICROCMS_API_KEY
+from app.core.config import MICROCMS_API_URL, MICROCMS_API_KEY
+from app.features.linebot.services.openai_client import get_embeddings, EMBEDDING_MODEL
+from app.scripts.faq_text import prepare_answer
+from app.features.linebot.services.faq_store import save_faq_store, load_faq_store, FAQ_VECTORS_PATH, FAQ_META_PATH
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+EMBEDDING_BATCH_SIZE = 100  # 1回のAPI呼び出しで埋め込む件数
 
 # カテゴリと性別のマッピング
 CATEGORY_MAPPING = {
@@ -15,25 +18,35 @@ CATEGORY_MAPPING = {
     "cast_q": "female"
 }
 
-def get_embedding(text: str) -> list:
+def content_hash(text: str) -> str:
     """
-    OpenAI APIでテキストをEmbeddingに変換する
+    埋め込み対象テキストのハッシュ（モデル名込み）
     """
-    response = client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text
-    )
-    return response.data[0].embedding
+    return hashlib.sha256(f"{EMBEDDING_MODEL}:{text}".encode('utf-8')).hexdigest()
 
-def fetch_and_embed_faq():
+def load_existing_vectors() -> dict:
     """
-    MicroCMSからFAQデータを取得し、埋め込みを生成して保存
+    既存のFAQストアから article_id → (content_hash, vector) を取得
     """
-    headers = {
-        "X-MICROCMS-API-KEY": MICROCMS_API_KEY
+    if not (os.path.exists(FAQ_VECTORS_PATH) and os.path.exists(FAQ_META_PATH)):
+        return {}
+    try:
+        faqs, vectors = load_faq_store()
+    except Exception as e:
+        print(f"⚠️ 既存FAQストアの読み込みに失敗（全件再生成します）: {e}")
+        return {}
+
+    return {
+        faq['article_id']: (faq.get('content_hash'), vectors[i].tolist())
+        for i, faq in enumerate(faqs)
+        if faq.get('article_id')
     }
 
-    embedded_faqs = []
+def fetch_faq_contents(headers: dict) -> list:
+    """
+    MicroCMSからFAQを全件取得
+    """
+    contents = []
     limit = 1000  # 1回で取得する最大件数
     offset = 0   # 取得開始位置
 
@@ -45,52 +58,95 @@ def fetch_and_embed_faq():
         print(f"📊 ステータスコード: {response.status_code}")
 
         if response.status_code != 200:
-            print(f"❌ FAQデータの取得失敗: {response.status_code}, {response.text}")
-            break
+            raise RuntimeError(f"FAQデータの取得失敗: {response.status_code}, {response.text}")
+
+        faqs = response.json().get('contents', [])
+        print(f"📊 取得件数: {len(faqs)} (offset: {offset})")
 
-        try:
-            data = response.json()
-            faqs = data.get('contents', [])
-            print(f"📊 取得件数: {len(faqs)} (offset: {offset})")
-
-            if not faqs:
-                print("✅ すべてのデータを取得しました。")
-                break
-
-            for faq in faqs:
-                question = faq.get('title')
-                answer = faq.get('content')
-                category = faq.get('category', {}).get('id')  # category.idの取得
-                article_id = faq.get('id')  # 🔹 MicroCMSのFAQ IDを取得（記事IDとして使う）
-
-                if question and answer and category and article_id:
-                    sex = CATEGORY_MAPPING.get(category, 'NULL')  # カテゴリから性別を判定
-                    embedding = get_embedding(question)  # 質問文を埋め込み変換
-
-                    embedded_faqs.append({
-                        "question": question,
-                        "answer": answer,
-                        "sex": sex,
-                        "category": category,
-                        "article_id": article_id,  # 🔹 記事IDを保存
-                        "embedding": embedding
-                    })
-                    print(f"✅ Embedding生成: {question} (カテゴリ: {category}, 性別: {sex}, 記事ID: {article_id})")
-                else:
-                    print(f"⚠️ 無効なFAQエントリ: {faq}")
-
-            # 次のページへ
-            offset += limit
-
-        except Exception as e:
-            print(f"❌ レスポンスの解析中にエラー: {e}")
+        if not faqs:
+            print("✅ すべてのデータを取得しました。")
             break
 
-    # FAQデータを直接埋め込みJSONとして保存
-    with open('app/data/microcms_faq_embeddings.json', 'w') as f:
-        json.dump(embedded_faqs, f, indent=4, ensure_ascii=False)
+        contents.extend(faqs)
+        # 次のページへ
+        offset += limit
+
+    return contents
 
-    print("✅ FAQ Embeddingデータが正常に保存されました。")
+def fetch_and_embed_faq(progress=None):
+    """
+    MicroCMSからFAQデータを取得し、埋め込みを生成して保存
+
+    変更のない記事（質問文のハッシュが同じ）は既存のベクトルを再利用し、
+    変更・追加された記事だけをバッチでEmbedding APIに送る
+    progress: 進捗メッセージを受け取るコールバック（任意）
+    """
+    def report(message: str):
+        print(message)
+        if progress:
+            progress(message)
+
+    headers = {
+        "X-MICROCMS-API-KEY": MICROCMS_API_KEY
+    }
+
+    try:
+        contents = fetch_faq_contents(headers)
+    except Exception as e:
+        # 取得に失敗した場合は既存のストアを残す
+        report(f"❌ FAQデータの取得中にエラー: {e}")
+        return
+    report(f"📊 FAQを{len(contents)}件取得しました")
+
+    existing = load_existing_vectors()
+
+    embedded_faqs = []
+    embeddings = []
+    pending = []  # 再埋め込みが必要な (embedded_faqsの位置, 質問文)
+
+    for faq in contents:
+        question = faq.get('title')
+        answer = faq.get('content')
+        category = faq.get('category', {}).get('id')  # category.idの取得
+        article_id = faq.get('id')  # 🔹 MicroCMSのFAQ IDを取得（記事IDとして使う）
+
+        if question and answer and category and article_id:
+            sex = CATEGORY_MAPPING.get(category, 'NULL')  # カテゴリから性別を判定
+            question_hash = content_hash(question)
+
+            embedded_faqs.append({
+                "question": question,
+                **prepare_answer(answer),  # 🔹 HTML除去・トークン数計算済みの回答を保存
+                "sex": sex,
+                "category": category,
+                "article_id": article_id,  # 🔹 記事IDを保存
+                "content_hash": question_hash,
+                "updated_at": faq.get('updatedAt')
+            })
+
+            stored_hash, stored_vector = existing.get(article_id, (None, None))
+            if stored_hash == question_hash:
+                embeddings.append(stored_vector)  # ✅ 変更なし → 既存ベクトルを再利用
+            else:
+                embeddings.append(None)
+                pending.append((len(embedded_faqs) - 1, question))
+        else:
+            print(f"⚠️ 無効なFAQエントリ: {faq}")
+
+    report(f"🔁 再利用: {len(embedded_faqs) - len(pending)}件 / 再生成: {len(pending)}件")
+
+    # ✅ 変更・追加分だけをまとめてEmbedding
+    for start in range(0, len(pending), EMBEDDING_BATCH_SIZE):
+        batch = pending[start:start + EMBEDDING_BATCH_SIZE]
+        vectors = get_embeddings([question for _, question in batch])
+        for (position, _), vector in zip(batch, vectors):
+            embeddings[position] = vector
+        report(f"✅ Embedding生成: {min(start + EMBEDDING_BATCH_SIZE, len(pending))}/{len(pending)}件")
+
+    # FAQデータを .npy（ベクトル）+ JSON（メタデータ）として保存
+    save_faq_store(embedded_faqs, embeddings)
+
+    report("✅ FAQ Embeddingデータが正常に保存されました。")
 
 if __name__ == "__main__":
     fetch_and_embed_faq()
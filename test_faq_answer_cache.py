@@ -0,0 +1,68 @@
+# FAQ回答キャッシュのテスト（OpenAI API・DBなしで実行できる）
+
+import pytest
+from app.features.linebot.services import faq_search, faq_cache
+from app.features.linebot.services.conversation_store import InMemoryConversationStore
+
+FAQ = {"article_id": "a1", "question": "ブロック機能はありますか", "answer": "プロフィールページ右上から利用できます。", "answer_tokens": 20}
+
+
+@pytest.fixture
+def bot(monkeypatch, tmp_path):
+    """
+    同じFAQに当たる検索・回答キャッシュ・OpenAI呼び出しの記録を差し替えた search_faq
+    """
+    cache = faq_cache.FaqAnswerCache(faq_cache.SqliteTtlCache(str(tmp_path / "cache.sqlite3"), "faq_answers", 100, 3600), True)
+    calls = []
+
+    def fake_reply(user_message, system_prompt):
+        calls.append((user_message, system_prompt))
+        return f"回答{len(calls)}"
+
+    monkeypatch.setattr(faq_search, "get_answer_cache", lambda: cache)
+    monkeypatch.setattr(faq_search, "get_openai_reply", fake_reply)
+    monkeypatch.setattr(faq_search, "retrieve_faqs", lambda message, sex: [(FAQ, 1.0)])
+    monkeypatch.setattr(faq_search, "update_running_summary", lambda store, user_id: None)
+    monkeypatch.setattr(faq_search, "conversation_store", InMemoryConversationStore())
+
+    def ask(user_id, nickname, message):
+        sent = []
+        faq_search.search_faq(message, {"id": user_id, "nickname": nickname, "sex": "female"}, "token", send_reply=sent.append)
+        return sent[0]
+
+    return ask, calls
+
+
+def test_different_questions_on_same_faqs_do_not_share_answer(bot):
+    ask, calls = bot
+    first = ask(1, "Alice", "ブロック機能はありますか")
+    second = ask(2, "Bob", "ブロックした相手に通知はいきますか")
+
+    assert len(calls) == 2
+    assert first == "Aliceさん、回答1"
+    assert second == "Bobさん、回答2"
+    # ✅ 質問文はプロンプトに含まれる
+    assert calls[0][0] == "ブロック機能はありますか"
+    assert calls[1][0] == "ブロックした相手に通知はいきますか"
+
+
+def test_same_question_is_shared_without_user_data(bot):
+    ask, calls = bot
+    first = ask(1, "Alice", "ブロック機能はありますか？")
+    second = ask(2, "Bob", "ブロック機能はありますか?")  # 全角/半角の揺れは同じ質問
+
+    assert len(calls) == 1
+    assert first == "Aliceさん、回答1"
+    assert second == "Bobさん、回答1"
+    # ✅ キャッシュするプロンプトにニックネームは含まれない
+    assert "Alice" not in "".join(calls[0])
+
+
+def test_follow_up_question_bypasses_cache(bot):
+    ask, calls = bot
+    ask(1, "Alice", "ブロック機能はありますか")
+    ask(2, "Bob", "ブロック機能はありますか")
+    ask(2, "Bob", "ブロック機能はありますか")  # 会話の続きは履歴を使って生成する
+
+    assert len(calls) == 2
+    assert "Bob" in calls[1][1]